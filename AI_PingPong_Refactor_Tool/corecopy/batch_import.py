@@ -0,0 +1,248 @@
+"""
+Batch Import - Import headless d'un dossier de réponses IA archivées.
+Chaque fichier est parsé par ResponseParser dans un pool de threads/process ;
+les tasks sont dédupliquées par empreinte de contenu (les ids REFACTOR_{n}
+se répètent d'une réponse à l'autre) puis fusionnées en une seule écriture
+dans .ai_pingpong_tasks.json.
+"""
+
+import fnmatch
+import hashlib
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from corecopy.parsing_strategies import ResponseParser
+from corecopy.project_loader import ProjectLoader
+
+
+# Champs qui décrivent le contenu d'une task (id, status, created_at exclus)
+FINGERPRINT_FIELDS = ('source_file', 'category', 'title', 'description')
+
+_WHITESPACE = re.compile(r'\s+')
+_TITLE_ICON = re.compile(r'^\W+')  # 🔴 / ⚠️ / ⚡ / 📦 : dépend de la priorité, pas du contenu
+
+
+def task_fingerprint(task: Dict) -> str:
+    """Empreinte SHA1 du contenu normalisé (casse, espaces, icône de titre)."""
+    parts = []
+    for name in FINGERPRINT_FIELDS:
+        value = _WHITESPACE.sub(' ', str(task.get(name) or '')).strip().lower()
+        if name == 'title':
+            value = _TITLE_ICON.sub('', value)
+        parts.append(value)
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+def analyzed_file_for(path: Path, default: str) -> str:
+    """Fichier analysé déduit du nom (main.py.json → main.py), sinon default."""
+    stem = path.stem
+    return stem if stem.endswith('.py') else default
+
+
+def _parse_file(path: str, default_file: str) -> Dict:
+    """Parse un fichier réponse ; ne lève jamais (erreur dans l'entrée)."""
+    file_path = Path(path)
+    entry = {'file': file_path.name, 'analyzed_file': analyzed_file_for(file_path, default_file), 'tasks': []}
+
+    start = time.perf_counter()
+    try:
+        text = file_path.read_text(encoding='utf-8', errors='replace')
+        parser = ResponseParser()  # last_extraction : un parser par fichier
+        entry['tasks'] = parser.parse(text, {'analyzed_file': entry['analyzed_file']})
+        if parser.last_extraction and parser.last_extraction.repairs:
+            entry['repairs'] = parser.last_extraction.repairs
+    except Exception as e:
+        entry['error'] = f"{type(e).__name__}: {e}".splitlines()[0]
+    entry['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 1)
+
+    return entry
+
+
+class BatchResponseImporter:
+    """Importe un dossier de réponses IA dans les tasks d'un projet."""
+
+    def __init__(self, project_path: str, workers: Optional[int] = None, use_processes: bool = False):
+        self.loader = ProjectLoader(project_path)
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.use_processes = use_processes
+
+    @staticmethod
+    def find_responses(responses_dir: str, pattern: str = '*') -> List[Path]:
+        """Fichiers du dossier (non récursif) correspondant au glob, triés."""
+        return sorted(p for p in Path(responses_dir).iterdir()
+                      if p.is_file() and fnmatch.fnmatch(p.name, pattern))
+
+    def parse_all(self, files: List[Path], default_file: str = 'unknown.py', progress=None) -> List[Dict]:
+        """
+        Parse tous les fichiers en parallèle.
+
+        progress: callback optionnel (done, total, entry)
+
+        Returns:
+            Entrées triées par nom de fichier (ordre de fusion déterministe)
+        """
+        executor_class = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+        entries = []
+        with executor_class(max_workers=self.workers) as executor:
+            futures = [executor.submit(_parse_file, str(path), default_file) for path in files]
+            for future in as_completed(futures):
+                entries.append(future.result())
+                if progress:
+                    progress(len(entries), len(files), entries[-1])
+
+        entries.sort(key=lambda e: e['file'])
+        return entries
+
+    def merge(self, existing: List[Dict], entries: List[Dict]) -> Dict:
+        """
+        Fusionne les tasks parsées dans existing (dédup par empreinte).
+        Un id déjà pris reçoit le suffixe de l'empreinte (REFACTOR_1 → REFACTOR_1_3f9a2c1b).
+
+        Returns:
+            {'tasks': liste fusionnée, 'added', 'duplicates_existing', 'duplicates_batch', 'renamed'}
+        """
+        seen = {task_fingerprint(t): 'existing' for t in existing if isinstance(t, dict)}
+        ids = {t.get('id') for t in existing if isinstance(t, dict)}
+        merged = list(existing)
+        stats = {'added': 0, 'duplicates_existing': 0, 'duplicates_batch': 0, 'renamed': 0}
+
+        for entry in entries:
+            entry['added'] = 0
+            for task in entry['tasks']:
+                fingerprint = task_fingerprint(task)
+                origin = seen.get(fingerprint)
+                if origin == 'existing':
+                    stats['duplicates_existing'] += 1
+                    continue
+                if origin is not None:
+                    stats['duplicates_batch'] += 1
+                    continue
+                seen[fingerprint] = entry['file']
+
+                task = dict(task)
+                if task.get('id') in ids:
+                    task['id'] = f"{task['id']}_{fingerprint[:8]}"
+                    stats['renamed'] += 1
+                ids.add(task['id'])
+
+                merged.append(task)
+                entry['added'] += 1
+                stats['added'] += 1
+
+        stats['tasks'] = merged
+        return stats
+
+    def run(self, responses_dir: str, pattern: str = '*', default_file: str = 'unknown.py',
+            dry_run: bool = False, progress=None) -> Dict:
+        """
+        Parse, fusionne et sauvegarde (une seule écriture, avec backup).
+        Un fichier de tasks présent mais illisible n'est jamais réécrit :
+        le rapport porte alors 'load_error' et saved reste False.
+
+        Returns:
+            Rapport {'files', 'errors', 'parsed_tasks', 'added', 'duplicates_existing',
+                     'duplicates_batch', 'renamed', 'total_tasks', 'saved', 'load_error',
+                     'elapsed_ms', 'entries'}
+        """
+        start = time.perf_counter()
+        files = self.find_responses(responses_dir, pattern)
+        entries = self.parse_all(files, default_file, progress)
+
+        load_error = None
+        if not self.loader.load_tasks():
+            load_error = f"unreadable tasks file {self.loader.tasks_file} (no usable backup)"
+        existing = [t for t in self.loader.tasks if isinstance(t, dict)]
+        merge = self.merge(existing, entries)
+
+        saved = False
+        if not dry_run and not load_error and merge['added']:
+            saved = self.loader.save_tasks(merge['tasks'])
+
+        return {
+            'files': len(files),
+            'errors': sum(1 for e in entries if 'error' in e),
+            'parsed_tasks': sum(len(e['tasks']) for e in entries),
+            'added': merge['added'],
+            'duplicates_existing': merge['duplicates_existing'],
+            'duplicates_batch': merge['duplicates_batch'],
+            'renamed': merge['renamed'],
+            'total_tasks': len(merge['tasks']),
+            'saved': saved,
+            'load_error': load_error,
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 1),
+            'entries': [{k: v for k, v in e.items() if k != 'tasks'} | {'parsed': len(e['tasks'])}
+                        for e in entries]
+        }
+
+
+def _self_test():
+    """Un fichier de tasks tronqué sans backup n'est pas écrasé par l'import."""
+    import json
+    import tempfile
+
+    response = json.dumps({'tasks': [{'id': 'REFACTOR_1', 'category': 'refactor', 'title': 'Split run',
+                                      'description': 'Extract the merge step', 'priority': 'medium'}]})
+    with tempfile.TemporaryDirectory() as tmp:
+        project, responses = Path(tmp, 'project'), Path(tmp, 'responses')
+        project.mkdir()
+        responses.mkdir()
+        Path(responses, 'main.py.json').write_text(response, encoding='utf-8')
+
+        truncated = '{"version": "1.0", "tasks": [{"id": "REFACTOR_1", "title": "Keep me"'
+        tasks_file = Path(project, '.ai_pingpong_tasks.json')
+        tasks_file.write_text(truncated, encoding='utf-8')
+
+        report = BatchResponseImporter(str(project), workers=1).run(str(responses))
+        assert report['load_error'] and not report['saved'], report
+        assert tasks_file.read_text(encoding='utf-8') == truncated
+        assert not Path(project, '.ai_pingpong_tasks.json.backup').exists()
+        print("✅ Truncated tasks file left untouched")
+
+        tasks_file.unlink()
+        report = BatchResponseImporter(str(project), workers=1).run(str(responses))
+        assert report['saved'] and report['added'] == 1 and not report['load_error'], report
+        assert len(json.loads(tasks_file.read_text(encoding='utf-8'))['tasks']) == 1
+        print("✅ Missing tasks file created on import")
+
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+
+    if sys.argv[1:] == ['--self-test']:
+        _self_test()
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description="Batch import of saved AI responses (headless)")
+    parser.add_argument('project', help="Project directory (holds .ai_pingpong_tasks.json)")
+    parser.add_argument('responses', help="Directory of saved AI responses")
+    parser.add_argument('-p', '--pattern', default='*', help="Glob on response file names")
+    parser.add_argument('-f', '--analyzed-file', default='unknown.py',
+                        help="source_file when not encoded in the name (main.py.json → main.py)")
+    parser.add_argument('-j', '--workers', type=int, default=None)
+    parser.add_argument('--processes', action='store_true', help="Process pool instead of threads")
+    parser.add_argument('-n', '--dry-run', action='store_true', help="Report only, do not write")
+    args = parser.parse_args()
+
+    importer = BatchResponseImporter(args.project, workers=args.workers, use_processes=args.processes)
+    report = importer.run(args.responses, args.pattern, args.analyzed_file, args.dry_run)
+
+    for e in report['entries']:
+        if 'error' in e:
+            print(f"  ❌ {e['file']} → {e['error']}")
+        else:
+            repaired = f" 🩹 {', '.join(e['repairs'])}" if 'repairs' in e else ""
+            print(f"  ✅ {e['file']} ({e['analyzed_file']}): {e['parsed']} parsed, {e['added']} new{repaired}")
+
+    print(f"📥 {report['files']} file(s), {report['errors']} error(s), {report['parsed_tasks']} tasks parsed")
+    print(f"   +{report['added']} new, {report['duplicates_existing']} already in project, "
+          f"{report['duplicates_batch']} duplicated across responses, {report['renamed']} id(s) renamed")
+    if report['load_error']:
+        print(f"❌ {report['load_error']}: nothing written, fix or restore it first")
+        sys.exit(1)
+    status = "dry run, nothing written" if args.dry_run else ("saved" if report['saved'] else "nothing to save")
+    print(f"✅ {report['total_tasks']} tasks total ({status}) in {report['elapsed_ms']:.0f} ms")
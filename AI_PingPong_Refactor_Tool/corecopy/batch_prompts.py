@@ -0,0 +1,233 @@
+"""
+Batch Prompts - Génération de prompts en masse, sans GUI (aucun import Qt).
+Un prompt par fichier (ou par classe) rendu dans un pool de threads/process,
+écrit dans un dossier de sortie avec un manifest (tailles, tokens, erreurs).
+"""
+
+import fnmatch
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from corecopy.prompt_composer import PromptComposer
+from corecopy.prompt_generator import PromptGenerator
+from corecopy.task_manager import Task
+
+
+MANIFEST_FILENAME = 'manifest.json'
+
+# État par process worker (pool de process : composer/analyse créés une fois)
+_WORKER: Dict = {}
+
+
+def _init_worker(analysis: Dict, templates_dir: str):
+    _WORKER['generator'] = PromptGenerator(PromptComposer(templates_dir), analysis)
+
+
+def _render_unit(unit: Dict, output_dir: str, description: str, token_budget: Optional[int],
+                 minify: Optional[List[str]], generator: Optional[PromptGenerator] = None) -> Dict:
+    """Rend une unité (fichier ou classe) vers output_dir ; ne lève jamais."""
+    generator = generator or _WORKER['generator']
+    output_path = Path(output_dir) / unit['output_name']
+    entry = {
+        'unit': unit['name'],
+        'template': unit['template'],
+        'num_methods': len(unit['methods']),
+        'path': str(output_path)
+    }
+
+    start = time.perf_counter()
+    try:
+        if unit['template'] == 'refactor_file':
+            tasks = [Task.from_dict(m) for m in unit['methods']]
+            stats = generator.stream_refactor_file(unit['name'], tasks, output_path, preview_chars=0)
+        else:
+            stats = generator.stream_normal(
+                unit['template'], unit['methods'], description, True,
+                output_path, token_budget=token_budget, minify=minify, preview_chars=0
+            )
+            if stats['minify_report']:
+                entry['tokens_saved'] = stats['minify_report']['tokens_saved']
+        entry.update(size_bytes=stats['size_bytes'], chars=stats['chars'], tokens=stats['tokens'])
+    except Exception as e:
+        entry['error'] = f"{type(e).__name__}: {e}"
+    entry['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 1)
+
+    return entry
+
+
+class BatchPromptGenerator:
+    """Génère un prompt par fichier/classe du projet, en parallèle."""
+
+    def __init__(self, analysis: Dict, output_dir: str, templates_dir: str = 'templates',
+                 workers: Optional[int] = None, use_processes: bool = False):
+        self.analysis = analysis
+        self.output_dir = Path(output_dir)
+        self.templates_dir = templates_dir
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.use_processes = use_processes
+
+    # === Sélection des unités ===
+
+    def build_units(self, template: str = 'refactor_file', group_by: str = 'file',
+                    file_pattern: str = '*', class_pattern: str = '*') -> List[Dict]:
+        """
+        Regroupe les méthodes de l'analyse en unités de rendu.
+
+        refactor_file impose group_by='file' (le template résume un fichier).
+        Les autres templates reçoivent les méthodes comme selected_tasks.
+        """
+        if template == 'refactor_file' and group_by != 'file':
+            raise ValueError("refactor_file requires group_by='file'")
+
+        units: 'OrderedDict[str, Dict]' = OrderedDict()
+        for class_info in self.analysis.get('classes', {}).values():
+            file = class_info['file']
+            class_name = class_info['name']
+            if not fnmatch.fnmatch(file.replace('\\', '/'), file_pattern):
+                continue
+            if not fnmatch.fnmatch(class_name, class_pattern):
+                continue
+
+            name = file if group_by == 'file' else f"{file}:{class_name}"
+            unit = units.setdefault(name, {
+                'name': name,
+                'template': template,
+                'output_name': self._output_name(name, template),
+                'methods': []
+            })
+            for method in class_info.get('methods', []):
+                unit['methods'].append(self._method_entry(template, file, class_info, method))
+
+        return [u for u in units.values() if u['methods']]
+
+    @staticmethod
+    def _output_name(name: str, template: str) -> str:
+        safe = name.replace('\\', '_').replace('/', '_').replace(':', '__')
+        return f"{safe}.{template}.md"
+
+    @staticmethod
+    def _method_entry(template: str, file: str, class_info: Dict, method: Dict) -> Dict:
+        """Task (refactor_file) ou dict selected_tasks (mêmes champs que le GUI)."""
+        if template == 'refactor_file':
+            return Task(
+                task_id=f"{file}:{class_info['name']}.{method['name']}",
+                file=file,
+                class_name=class_info['name'],
+                method_name=method['name'],
+                lineno=method['lineno'],
+                code=method.get('code', ''),
+                docstring=method.get('docstring', ''),
+                signature=method.get('signature', f"{method['name']}(...)")
+            ).to_dict()
+
+        return {
+            'file': file,
+            'class_name': class_info['name'],
+            'method_name': method['name'],
+            'lineno': method['lineno'],
+            'signature': method.get('signature', f"{method['name']}(...)"),
+            'code': method.get('code', ''),
+            'docstring': method.get('docstring', ''),
+            'local_vars': method.get('local_vars', {})
+        }
+
+    # === Rendu ===
+
+    def run(self, units: List[Dict], description: str = '', token_budget: Optional[int] = None,
+            minify: Optional[List[str]] = None, progress=None) -> Dict:
+        """
+        Rend toutes les unités et écrit le manifest.
+
+        progress: callback optionnel (done, total, entry)
+
+        Returns:
+            Manifest {'project_name', 'generated_at', 'workers', 'mode', 'elapsed_ms',
+                      'total_tokens', 'total_bytes', 'errors', 'prompts': [...]}
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        output_dir = str(self.output_dir)
+        start = time.perf_counter()
+
+        entries = []
+        if self.use_processes:
+            executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker,
+                initargs=(self.analysis, self.templates_dir)
+            )
+            submit = lambda u: executor.submit(_render_unit, u, output_dir, description, token_budget, minify)
+        else:
+            # Threads : un seul generator (Environment Jinja et caches partagés) ;
+            # les rapports par unité reviennent dans les stats, pas sur l'instance
+            generator = PromptGenerator(PromptComposer(self.templates_dir), self.analysis)
+            executor = ThreadPoolExecutor(max_workers=self.workers)
+            submit = lambda u: executor.submit(_render_unit, u, output_dir, description, token_budget,
+                                               minify, generator)
+
+        with executor:
+            futures = [submit(unit) for unit in units]
+            for future in as_completed(futures):
+                entries.append(future.result())
+                if progress:
+                    progress(len(entries), len(units), entries[-1])
+
+        entries.sort(key=lambda e: e['unit'])
+        manifest = {
+            'project_name': self.analysis.get('project_name'),
+            'generated_at': datetime.now().isoformat(),
+            'workers': self.workers,
+            'mode': 'processes' if self.use_processes else 'threads',
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 1),
+            'total_tokens': sum(e.get('tokens', 0) for e in entries),
+            'total_bytes': sum(e.get('size_bytes', 0) for e in entries),
+            'errors': sum(1 for e in entries if 'error' in e),
+            'prompts': entries
+        }
+
+        with open(self.output_dir / MANIFEST_FILENAME, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+        return manifest
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from corecopy.project_analyzer import ProjectAnalyzer
+    from utils.code_minifier import DEFAULT_MODES
+
+    parser = argparse.ArgumentParser(description="Batch prompt generation (headless)")
+    parser.add_argument('project', help="Project directory to analyze")
+    parser.add_argument('-o', '--output', default='data/batch_prompts', help="Output directory")
+    parser.add_argument('-t', '--template', default='refactor_file')
+    parser.add_argument('--by', choices=['file', 'class'], default='file', dest='group_by')
+    parser.add_argument('--files', default='*', help="Glob on relative file path")
+    parser.add_argument('--classes', default='*', help="Glob on class name")
+    parser.add_argument('-d', '--description', default='')
+    parser.add_argument('--budget', type=int, default=None, help="Token budget (normal templates)")
+    parser.add_argument('--minify', nargs='*', default=None,
+                        help="Minify modes (normal templates); no value = default modes")
+    parser.add_argument('-j', '--workers', type=int, default=None)
+    parser.add_argument('--processes', action='store_true', help="Process pool instead of threads")
+    args = parser.parse_args()
+    if args.minify == []:
+        args.minify = list(DEFAULT_MODES)
+
+    analysis = ProjectAnalyzer(args.project).analyze()
+    batch = BatchPromptGenerator(analysis, args.output, workers=args.workers,
+                                 use_processes=args.processes)
+    units = batch.build_units(args.template, args.group_by, args.files, args.classes)
+    print(f"📦 {len(units)} prompt(s) to render with {batch.workers} worker(s)")
+
+    manifest = batch.run(units, args.description, args.budget, args.minify,
+                         progress=lambda done, total, e: print(
+                             f"[{done}/{total}] {'❌' if 'error' in e else '✅'} {e['unit']}"
+                             + (f" → {e['error']}" if 'error' in e else f" ({e['tokens']} tokens)")))
+
+    print(f"✅ {len(manifest['prompts'])} prompts, {manifest['total_tokens']} tokens, "
+          f"{manifest['errors']} error(s) in {manifest['elapsed_ms']:.0f} ms → {args.output}")
@@ -0,0 +1,97 @@
+"""
+Context Slicer - Contexte de prompt réduit aux dépendances réelles d'une méthode.
+Utilise le def-use collecté par ProjectAnalyzer (method['def_use']) au lieu
+de recopier toutes les variables d'instance de la classe.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class DependencySlicer:
+    """Construit la tranche de dépendances (variables, helpers, imports) d'une méthode."""
+
+    def __init__(self, analysis: Dict):
+        self.analysis = analysis
+        self._methods_cache: Dict[str, Dict[str, Dict]] = {}
+        self._definers_cache: Dict[str, Dict[str, List[str]]] = {}
+
+    @staticmethod
+    def class_key(task: Dict) -> str:
+        """Clé analyse d'une task (même convention que ProjectAnalyzer)."""
+        return f"{Path(task.get('file', '')).stem}.{task.get('class_name', '')}"
+
+    def methods(self, class_key: str) -> Dict[str, Dict]:
+        """Méthodes analysées d'une classe, par nom (mémoïsé)."""
+        if class_key not in self._methods_cache:
+            class_data = self.analysis.get('classes', {}).get(class_key, {})
+            self._methods_cache[class_key] = {m['name']: m for m in class_data.get('methods', [])}
+        return self._methods_cache[class_key]
+
+    def _definers(self, class_key: str) -> Dict[str, List[str]]:
+        """Variable d'instance → méthodes qui l'assignent."""
+        if class_key not in self._definers_cache:
+            definers: Dict[str, List[str]] = {}
+            class_data = self.analysis.get('classes', {}).get(class_key, {})
+            for method, variables in class_data.get('instance_variables_by_method', {}).items():
+                for var in variables:
+                    definers.setdefault(var, []).append(method)
+            self._definers_cache[class_key] = definers
+        return self._definers_cache[class_key]
+
+    def slice_task(self, task: Dict) -> Optional[Dict]:
+        """
+        Tranche de dépendances d'une task.
+
+        Returns:
+            {'instance_vars': [{'name', 'access', 'defined_in'}],
+             'helpers': [{'name', 'signature'}], 'imports': [...]}
+            ou None si l'analyse n'a pas de def-use pour cette méthode.
+        """
+        class_key = self.class_key(task)
+        methods = self.methods(class_key)
+        method = methods.get(task.get('method_name'))
+        if not method or 'def_use' not in method:
+            return None
+
+        def_use = method['def_use']
+        definers = self._definers(class_key)
+
+        # self.xxx lu mais qui est une méthode (callback passé à connect) → helper
+        helper_names = (list(def_use['calls']) + def_use.get('deferred_calls', [])
+                        + [n for n in def_use['reads'] if n in methods])
+        reads = [n for n in def_use['reads'] if n not in methods]
+        writes = def_use['writes']
+
+        instance_vars = []
+        for name in dict.fromkeys(reads + writes):
+            access = 'read/write' if name in reads and name in writes else ('write' if name in writes else 'read')
+            instance_vars.append({
+                'name': name,
+                'access': access,
+                'defined_in': [m for m in definers.get(name, []) if m != method['name']]
+            })
+
+        helpers = []
+        for name in dict.fromkeys(helper_names):
+            if name == method['name']:
+                continue
+            helper = methods.get(name)
+            helpers.append({
+                'name': name,
+                'signature': helper['signature'] if helper else f"{name}(...)  # hérité/externe"
+            })
+
+        return {
+            'instance_vars': instance_vars,
+            'helpers': helpers,
+            'imports': list(def_use['imports'])
+        }
+
+    def slice_tasks(self, tasks: List[Dict]) -> List[Dict]:
+        """Copies des tasks avec la clé 'dependency_slice' (si def-use disponible)."""
+        sliced = []
+        for task in tasks:
+            dependency_slice = self.slice_task(task)
+            sliced.append({**task, 'dependency_slice': dependency_slice} if dependency_slice else task)
+        return sliced
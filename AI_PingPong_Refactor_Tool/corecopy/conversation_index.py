@@ -0,0 +1,167 @@
+"""
+Conversation Index - Index inversé plein texte sur l'historique ping-pong.
+Postings stockés en SQLite, ranking BM25, mise à jour incrémentale par cycle.
+"""
+
+import json
+import math
+import re
+import sqlite3
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+
+
+TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Découpe en tokens minuscules (identifiants Python gardés entiers)."""
+    return [t for t in TOKEN_RE.findall(text.lower()) if len(t) > 1]
+
+
+class ConversationIndex:
+    """Index BM25 des prompts et réponses de toutes les conversations."""
+
+    K1 = 1.5
+    B = 0.75
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS docs (
+            doc_id INTEGER PRIMARY KEY,
+            conversation_id TEXT NOT NULL,
+            cycle_number INTEGER NOT NULL,
+            length INTEGER NOT NULL,
+            text BLOB NOT NULL,
+            UNIQUE (conversation_id, cycle_number)
+        );
+        CREATE TABLE IF NOT EXISTS postings (
+            term TEXT NOT NULL,
+            doc_id INTEGER NOT NULL,
+            tf INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_postings_term ON postings (term);
+        CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings (doc_id);
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db = sqlite3.connect(str(self.db_path))
+        self.db.executescript(self.SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    @staticmethod
+    def cycle_text(prompt: str, response: Dict) -> str:
+        """Texte indexé d'un cycle : prompt + réponse JSON."""
+        return prompt + "\n" + json.dumps(response, ensure_ascii=False, indent=1)
+
+    def add_cycle(self, conversation_id: str, cycle_number: int, prompt: str, response: Dict):
+        """Indexe (ou ré-indexe) un cycle."""
+        text = self.cycle_text(prompt, response)
+        terms = Counter(tokenize(text))
+
+        with self.db:
+            self._remove(conversation_id, cycle_number)
+            cursor = self.db.execute(
+                "INSERT INTO docs (conversation_id, cycle_number, length, text) VALUES (?, ?, ?, ?)",
+                (conversation_id, cycle_number, sum(terms.values()), zlib.compress(text.encode('utf-8')))
+            )
+            doc_id = cursor.lastrowid
+            self.db.executemany(
+                "INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)",
+                ((term, doc_id, tf) for term, tf in terms.items())
+            )
+
+    def _remove(self, conversation_id: str, cycle_number: int):
+        row = self.db.execute(
+            "SELECT doc_id FROM docs WHERE conversation_id = ? AND cycle_number = ?",
+            (conversation_id, cycle_number)
+        ).fetchone()
+        if row:
+            self.db.execute("DELETE FROM postings WHERE doc_id = ?", row)
+            self.db.execute("DELETE FROM docs WHERE doc_id = ?", row)
+
+    def clear(self):
+        with self.db:
+            self.db.execute("DELETE FROM postings")
+            self.db.execute("DELETE FROM docs")
+
+    def search(self, query: str, limit: int = 20, snippet_chars: int = 160) -> List[Dict]:
+        """
+        Recherche BM25.
+
+        Returns:
+            [{'conversation_id', 'cycle_number', 'score', 'snippet'}, ...]
+        """
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        if not query_terms:
+            return []
+
+        num_docs, total_length = self.db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM docs"
+        ).fetchone()
+        if not num_docs:
+            return []
+        avg_length = total_length / num_docs
+
+        scores: Dict[int, float] = {}
+        for term in query_terms:
+            rows = self.db.execute(
+                "SELECT p.doc_id, p.tf, d.length FROM postings p "
+                "JOIN docs d ON d.doc_id = p.doc_id WHERE p.term = ?",
+                (term,)
+            ).fetchall()
+            if not rows:
+                continue
+
+            df = len(rows)
+            idf = math.log(1 + (num_docs - df + 0.5) / (df + 0.5))
+            for doc_id, tf, length in rows:
+                norm = tf + self.K1 * (1 - self.B + self.B * length / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.K1 + 1) / norm
+
+        best = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:limit]
+
+        results = []
+        for doc_id, score in best:
+            conversation_id, cycle_number, blob = self.db.execute(
+                "SELECT conversation_id, cycle_number, text FROM docs WHERE doc_id = ?",
+                (doc_id,)
+            ).fetchone()
+            text = zlib.decompress(blob).decode('utf-8')
+            results.append({
+                'conversation_id': conversation_id,
+                'cycle_number': cycle_number,
+                'score': round(score, 3),
+                'snippet': self._snippet(text, query_terms, snippet_chars)
+            })
+
+        return results
+
+    @staticmethod
+    def _snippet(text: str, terms: List[str], width: int) -> str:
+        """Extrait autour de la première occurrence d'un terme de la requête."""
+        lowered = text.lower()
+        positions = [
+            m.start() for m in (
+                re.search(r'(?<!\w)' + re.escape(t) + r'(?!\w)', lowered) for t in terms
+            ) if m
+        ]
+        start = max(0, min(positions) - width // 3) if positions else 0
+        snippet = ' '.join(text[start:start + width].split())
+        prefix = '…' if start > 0 else ''
+        suffix = '…' if start + width < len(text) else ''
+        return prefix + snippet + suffix
+
+    def conversation_ids(self) -> set:
+        return {row[0] for row in self.db.execute("SELECT DISTINCT conversation_id FROM docs")}
+
+    def stats(self) -> Dict:
+        num_docs, num_conversations = self.db.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT conversation_id) FROM docs"
+        ).fetchone()
+        num_terms = self.db.execute("SELECT COUNT(DISTINCT term) FROM postings").fetchone()[0]
+        return {'cycles': num_docs, 'conversations': num_conversations, 'terms': num_terms}
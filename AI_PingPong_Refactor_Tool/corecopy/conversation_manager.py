@@ -3,10 +3,15 @@ Conversation Manager - Gestion historique ping-pong
 """
 
 import json
+from collections import OrderedDict
+from collections.abc import Sequence
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
+
+from corecopy.prompt_delta import encode_prompt, decode_prompt
+from corecopy.conversation_index import ConversationIndex
 
 
 @dataclass
@@ -18,6 +23,7 @@ class Cycle:
     timestamp: str
     needs_detected: List[str]
     is_converged: bool = False
+    context_methods: Dict[str, str] = field(default_factory=dict)  # method_id → code envoyé (nouveau/modifié)
     
     def to_dict(self) -> Dict:
         return asdict(self)
@@ -27,16 +33,133 @@ class Cycle:
         return cls(**data)
 
 
+class LazyCycleList(Sequence):
+    """
+    Séquence de cycles chargés à la demande depuis un log JSONL.
+    Garde un index d'offsets par ligne + petit cache LRU de Cycle.
+    """
+    
+    def __init__(self, filepath: Path, offsets: List[int], cache_size: int = 8):
+        self.filepath = filepath
+        self._offsets = offsets
+        self._cache: 'OrderedDict[int, Cycle]' = OrderedDict()
+        self._cache_size = cache_size
+        self._tail: List[Cycle] = []  # Cycles ajoutés après chargement
+    
+    @classmethod
+    def open(cls, filepath: Path) -> tuple:
+        """Indexe le log (offsets, sans parser le JSON) → (header, LazyCycleList)."""
+        offsets = []
+        with open(filepath, 'rb') as f:
+            header = json.loads(f.readline())
+            if header.get('type') != 'header':
+                raise ValueError(f"Missing header in {filepath.name}")
+            
+            offset = f.tell()
+            for line in f:
+                if line.strip():
+                    offsets.append(offset)
+                offset += len(line)
+        
+        lazy = cls(filepath, offsets)
+        
+        # Dernière ligne tronquée (crash pendant l'écriture) → ignorée
+        if offsets:
+            try:
+                lazy._read_record(len(offsets) - 1)
+            except json.JSONDecodeError:
+                offsets.pop()
+        
+        return header, lazy
+    
+    def __len__(self) -> int:
+        return len(self._offsets) + len(self._tail)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("cycle index out of range")
+        
+        if index >= len(self._offsets):
+            return self._tail[index - len(self._offsets)]
+        
+        return self._load(index)
+    
+    def append(self, cycle: Cycle):
+        self._tail.append(cycle)
+    
+    def copy(self) -> List[Cycle]:
+        return list(self)
+    
+    def peek(self, index: int, key: str):
+        """Lit un champ d'un cycle sans reconstruire son prompt."""
+        if index < 0:
+            index += len(self)
+        if index >= len(self._offsets):
+            return getattr(self._tail[index - len(self._offsets)], key)
+        if index in self._cache:
+            return getattr(self._cache[index], key)
+        return self._read_record(index).get(key)
+    
+    def _read_record(self, index: int) -> Dict:
+        with open(self.filepath, 'rb') as f:
+            f.seek(self._offsets[index])
+            record = json.loads(f.readline())
+        record.pop('type', None)
+        return record
+    
+    def _load(self, index: int) -> Cycle:
+        """Charge un cycle : remonte jusqu'au keyframe (ou cycle en cache) le plus proche."""
+        if index in self._cache:
+            self._cache.move_to_end(index)
+            return self._cache[index]
+        
+        chain = []
+        base_prompt = None
+        i = index
+        while i >= 0:
+            if i != index and i in self._cache:
+                base_prompt = self._cache[i].prompt
+                break
+            record = self._read_record(i)
+            chain.append(record)
+            if 'prompt_delta' not in record:
+                break
+            i -= 1
+        
+        for record in reversed(chain):
+            record['prompt'] = base_prompt = decode_prompt(record, base_prompt)
+        
+        cycle = Cycle.from_dict(chain[0])
+        self._cache[index] = cycle
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        
+        return cycle
+
+
 class ConversationManager:
     """Gère conversations ping-pong."""
     
+    LOG_SUFFIX = '.jsonl'
+    LEGACY_SUFFIX = '.json'
+    CATALOG_FILENAME = '_catalog.json'
+    SEARCH_INDEX_FILENAME = '_search.sqlite3'
+    
     def __init__(self):
         self.conversations_dir = Path('data/conversations')
         self.conversations_dir.mkdir(parents=True, exist_ok=True)
         
         self.current_conversation_id: Optional[str] = None
-        self.cycles: List[Cycle] = []
+        self.cycles: Sequence = []  # List[Cycle] ou LazyCycleList après chargement
         self.project_name: str = ""
+        self._search_index: Optional[ConversationIndex] = None
+        self._logged_cycles = 0  # Cycles déjà présents dans le log JSONL courant
+        self._seen: Optional[Dict[str, Dict]] = None  # seen_methods() replié, construit à la demande
     
     def start_conversation(self, project_name: str) -> str:
         """Démarre nouvelle conversation."""
@@ -44,14 +167,20 @@ class ConversationManager:
         self.current_conversation_id = f"{project_name}_{timestamp}"
         self.project_name = project_name
         self.cycles = []
+        self._logged_cycles = 0
+        self._seen = {}
         
         return self.current_conversation_id
     
     def add_cycle(self, 
                   prompt: str,
                   response: Dict,
-                  needs_detected: List[str] = None) -> int:
-        """Ajoute un cycle à la conversation."""
+                  needs_detected: List[str] = None,
+                  context_methods: Optional[Dict[str, str]] = None) -> int:
+        """
+        Ajoute un cycle à la conversation.
+        context_methods: code des méthodes envoyé dans ce prompt (cf. seen_methods).
+        """
         
         cycle_number = len(self.cycles) + 1
         
@@ -63,10 +192,13 @@ class ConversationManager:
             response=response,
             timestamp=datetime.now().isoformat(),
             needs_detected=needs_detected or [],
-            is_converged=is_converged
+            is_converged=is_converged,
+            context_methods=context_methods or {}
         )
         
         self.cycles.append(cycle)
+        if self._seen is not None:
+            self._fold_seen(self._seen, cycle_number, cycle.context_methods)
         self._auto_save()
         
         return cycle_number
@@ -89,12 +221,39 @@ class ConversationManager:
     
     def is_converged(self) -> bool:
         """Vérifie si conversation a convergé."""
-        last_cycle = self.get_last_cycle()
-        return last_cycle.is_converged if last_cycle else False
+        if not self.cycles:
+            return False
+        if isinstance(self.cycles, LazyCycleList):
+            return bool(self.cycles.peek(-1, 'is_converged'))
+        return self.cycles[-1].is_converged
+    
+    def seen_methods(self) -> Dict[str, Dict]:
+        """
+        Dernière version de chaque méthode déjà envoyée à l'IA dans cette conversation.
+        
+        Returns:
+            {method_id: {'cycle': n, 'code': ...}}
+        """
+        # Historique relu une seule fois par conversation chargée, puis tenu à jour par add_cycle
+        if self._seen is None:
+            seen = {}
+            for index in range(len(self.cycles)):
+                if isinstance(self.cycles, LazyCycleList):
+                    methods = self.cycles.peek(index, 'context_methods')
+                else:
+                    methods = self.cycles[index].context_methods
+                self._fold_seen(seen, index + 1, methods)
+            self._seen = seen
+        return dict(self._seen)
+    
+    @staticmethod
+    def _fold_seen(seen: Dict[str, Dict], cycle_number: int, methods: Optional[Dict[str, str]]):
+        for method_id, code in (methods or {}).items():
+            seen[method_id] = {'cycle': cycle_number, 'code': code}
     
     def get_all_cycles(self) -> List[Cycle]:
         """Retourne tous les cycles."""
-        return self.cycles.copy()
+        return list(self.cycles)
     
     def export_history(self, format: str = 'json') -> str:
         """Exporte historique."""
@@ -143,19 +302,234 @@ class ConversationManager:
         return "\n".join(lines)
 
     
+    def export_json_file(self, filepath: Optional[Path] = None) -> str:
+        """Écrit la conversation au format JSON historique (à la demande)."""
+        if filepath is None:
+            filepath = self.conversations_dir / f"{self.current_conversation_id}{self.LEGACY_SUFFIX}"
+        
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(self._export_json())
+        
+        return str(filepath)
+    
+    def _log_path(self, conversation_id: str) -> Path:
+        return self.conversations_dir / f"{conversation_id}{self.LOG_SUFFIX}"
+    
     def _auto_save(self):
-        """Sauvegarde auto après chaque cycle."""
+        """
+        Ajoute les cycles pas encore journalisés au log JSONL (append-only, pas de réécriture).
+        Conversation chargée depuis un ancien JSON : le premier ajout migre
+        tout l'historique dans le log (header + cycles existants), et l'index de recherche
+        reçoit chaque cycle écrit.
+        """
         if not self.current_conversation_id:
             return
         
-        filepath = self.conversations_dir / f"{self.current_conversation_id}.json"
+        filepath = self._log_path(self.current_conversation_id)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(self._export_json())
+        with open(filepath, 'a', encoding='utf-8') as f:
+            logged = self._logged_cycles
+            if f.tell() == 0:
+                header = {
+                    'type': 'header',
+                    'conversation_id': self.current_conversation_id,
+                    'project_name': self.project_name
+                }
+                f.write(json.dumps(header) + '\n')
+                logged = 0
+            
+            written = []
+            for index in range(logged, len(self.cycles)):
+                pending = self.cycles[index]
+                # Delta du cycle précédent seulement s'il est dans ce log (sinon keyframe)
+                previous = self.cycles[index - 1].prompt if 0 < index <= logged else None
+                record = {'type': 'cycle', **pending.to_dict()}
+                del record['prompt']
+                record.update(encode_prompt(pending.prompt, previous, pending.cycle_number))
+                
+                f.write(json.dumps(record) + '\n')
+                written.append(pending)
+                logged = index + 1
+            self._logged_cycles = logged
+        
+        self._update_catalog({
+            'id': self.current_conversation_id,
+            'project': self.project_name,
+            'cycles': len(self.cycles),
+            'converged': self.is_converged(),
+            'file': filepath.name
+        })
+        
+        try:
+            for pending in written:
+                self.search_index.add_cycle(
+                    self.current_conversation_id, pending.cycle_number, pending.prompt, pending.response
+                )
+        except Exception as e:
+            print(f"⚠️ Search index update failed: {e}")
+    
+    # === SEARCH INDEX ===
+    
+    @property
+    def search_index(self) -> ConversationIndex:
+        """Index plein texte (ouvert à la demande)."""
+        if self._search_index is None:
+            self._search_index = ConversationIndex(self.conversations_dir / self.SEARCH_INDEX_FILENAME)
+        return self._search_index
+    
+    def search_history(self, query: str, limit: int = 20) -> List[Dict]:
+        """Recherche dans prompts/réponses de toutes les conversations."""
+        return self.search_index.search(query, limit=limit)
+    
+    def rebuild_search_index(self) -> Dict:
+        """Ré-indexe toutes les conversations depuis les fichiers."""
+        index = self.search_index
+        index.clear()
+        
+        for filepath in self.conversations_dir.glob(f'*{self.LOG_SUFFIX}'):
+            try:
+                records = self._read_log(filepath)
+                header = next(records)
+                for record in records:
+                    index.add_cycle(header['conversation_id'], record['cycle_number'],
+                                    record['prompt'], record['response'])
+            except Exception as e:
+                print(f"⚠️ Could not index {filepath.name}: {e}")
+        
+        indexed = index.conversation_ids()
+        
+        for filepath in self.conversations_dir.glob(f'*{self.LEGACY_SUFFIX}'):
+            if filepath.name == self.CATALOG_FILENAME:
+                continue
+            try:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data['conversation_id'] in indexed:
+                    continue
+                for c in data['cycles']:
+                    index.add_cycle(data['conversation_id'], c['cycle_number'], c['prompt'], c['response'])
+            except Exception as e:
+                print(f"⚠️ Could not index {filepath.name}: {e}")
+        
+        return index.stats()
+    
+    # === CATALOG ===
+    
+    @property
+    def catalog_path(self) -> Path:
+        return self.conversations_dir / self.CATALOG_FILENAME
+    
+    def _read_catalog(self) -> Optional[Dict[str, Dict]]:
+        """Lit le catalog (None si absent ou corrompu)."""
+        if not self.catalog_path.exists():
+            return None
+        
+        try:
+            with open(self.catalog_path, 'r', encoding='utf-8') as f:
+                return json.load(f)['conversations']
+        except Exception as e:
+            print(f"⚠️ Conversation catalog unreadable: {e}")
+            return None
+    
+    def _write_catalog(self, entries: Dict[str, Dict]):
+        """Écrit le catalog de façon atomique (tmp + replace)."""
+        tmp_path = self.catalog_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'conversations': entries}, f, indent=2)
+        tmp_path.replace(self.catalog_path)
+    
+    def _update_catalog(self, entry: Dict):
+        """Met à jour l'entrée d'une conversation dans le catalog."""
+        entries = self._read_catalog()
+        if entries is None:
+            entries = self._scan_conversations()
+        
+        entries[entry['id']] = entry
+        self._write_catalog(entries)
+    
+    def _read_log(self, filepath: Path):
+        """Lit un log JSONL ligne par ligne → (header, itérateur cycles).
+        Les prompts delta sont reconstruits au fil de la lecture."""
+        with open(filepath, 'r', encoding='utf-8') as f:
+            header = json.loads(f.readline())
+            if header.get('type') != 'header':
+                raise ValueError(f"Missing header in {filepath.name}")
+            
+            yield header
+            previous_prompt = None
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Dernière ligne tronquée (crash pendant l'écriture)
+                    break
+                record.pop('type', None)
+                record['prompt'] = previous_prompt = decode_prompt(record, previous_prompt)
+                yield record
+    
+    def get_storage_stats(self) -> Dict:
+        """Ratio de stockage des prompts (delta vs texte complet) sur tous les logs."""
+        raw_bytes = 0
+        stored_bytes = 0
+        keyframes = 0
+        deltas = 0
+        
+        for filepath in self.conversations_dir.glob(f'*{self.LOG_SUFFIX}'):
+            with open(filepath, 'r', encoding='utf-8') as f:
+                f.readline()  # header
+                previous_prompt = None
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    
+                    if 'prompt_delta' in record:
+                        deltas += 1
+                        stored_bytes += len(json.dumps(record['prompt_delta']))
+                    else:
+                        keyframes += 1
+                        stored_bytes += len(json.dumps(record['prompt']))
+                    
+                    previous_prompt = decode_prompt(record, previous_prompt)
+                    raw_bytes += len(json.dumps(previous_prompt))
+        
+        return {
+            'keyframes': keyframes,
+            'deltas': deltas,
+            'raw_prompt_bytes': raw_bytes,
+            'stored_prompt_bytes': stored_bytes,
+            'ratio': round(raw_bytes / stored_bytes, 2) if stored_bytes else 0
+        }
     
     def load_conversation(self, conversation_id: str) -> bool:
-        """Charge une conversation."""
-        filepath = self.conversations_dir / f"{conversation_id}.json"
+        """Charge une conversation (log JSONL paginé, ou ancien fichier JSON).
+        Les cycles JSONL sont lus à la demande (LazyCycleList)."""
+        filepath = self._log_path(conversation_id)
+        
+        if not filepath.exists():
+            return self._load_legacy_conversation(conversation_id)
+        
+        try:
+            header, cycles = LazyCycleList.open(filepath)
+            
+            self.current_conversation_id = header['conversation_id']
+            self.project_name = header['project_name']
+            self.cycles = cycles
+            self._logged_cycles = len(cycles)
+            self._seen = None
+            
+            return True
+        except Exception as e:
+            print(f"Error loading conversation: {e}")
+            return False
+    
+    def _load_legacy_conversation(self, conversation_id: str) -> bool:
+        """Charge un ancien fichier JSON complet."""
+        filepath = self.conversations_dir / f"{conversation_id}{self.LEGACY_SUFFIX}"
         
         if not filepath.exists():
             return False
@@ -167,6 +541,8 @@ class ConversationManager:
             self.current_conversation_id = data['conversation_id']
             self.project_name = data['project_name']
             self.cycles = [Cycle.from_dict(c) for c in data['cycles']]
+            self._logged_cycles = 0  # Migrés vers le JSONL au prochain add_cycle
+            self._seen = None
             
             return True
         except Exception as e:
@@ -174,25 +550,66 @@ class ConversationManager:
             return False
     
     def list_conversations(self) -> List[Dict]:
-        """Liste conversations sauvegardées."""
-        conversations = []
+        """Liste conversations sauvegardées (lecture du catalog uniquement)."""
+        entries = self._read_catalog()
+        if entries is None:
+            entries = self.rebuild_catalog()
+        
+        return sorted(entries.values(), key=lambda x: x['id'], reverse=True)
+    
+    def rebuild_catalog(self) -> Dict[str, Dict]:
+        """Reconstruit le catalog depuis les fichiers (si désynchronisé)."""
+        entries = self._scan_conversations()
+        self._write_catalog(entries)
+        return entries
+    
+    def _scan_conversations(self) -> Dict[str, Dict]:
+        """Scanne tous les fichiers de conversation → résumés par id."""
+        conversations = {}
+        
+        for filepath in self.conversations_dir.glob(f'*{self.LOG_SUFFIX}'):
+            try:
+                header = None
+                num_cycles = 0
+                last_cycle = None
+                for record in self._read_log(filepath):
+                    if header is None:
+                        header = record
+                        continue
+                    num_cycles += 1
+                    last_cycle = record
+                
+                conversations[header['conversation_id']] = {
+                    'id': header['conversation_id'],
+                    'project': header['project_name'],
+                    'cycles': num_cycles,
+                    'converged': bool(last_cycle and last_cycle.get('is_converged')),
+                    'file': filepath.name
+                }
+            except:
+                pass
         
-        for filepath in self.conversations_dir.glob('*.json'):
+        for filepath in self.conversations_dir.glob(f'*{self.LEGACY_SUFFIX}'):
+            if filepath.name == self.CATALOG_FILENAME:
+                continue
             try:
                 with open(filepath, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                 
-                conversations.append({
+                if data['conversation_id'] in conversations:
+                    continue  # Export JSON d'une conversation JSONL
+                
+                conversations[data['conversation_id']] = {
                     'id': data['conversation_id'],
                     'project': data['project_name'],
                     'cycles': data['num_cycles'],
                     'converged': data['is_converged'],
                     'file': filepath.name
-                })
+                }
             except:
                 pass
         
-        return sorted(conversations, key=lambda x: x['id'], reverse=True)
+        return conversations
     
     def get_stats(self) -> Dict:
         """Stats conversation."""
@@ -202,3 +619,69 @@ class ConversationManager:
             'current_cycle': self.get_current_cycle(),
             'project_name': self.project_name
         }
+
+
+def _self_test():
+    """Ancien JSON chargé → add_cycle → rechargement : historique complet."""
+    import os
+    import tempfile
+    
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            manager = ConversationManager()
+            legacy = {
+                'conversation_id': 'legacy_1', 'project_name': 'legacy', 'num_cycles': 2, 'is_converged': False,
+                'cycles': [Cycle(n, f"prompt {n}\n" * 50, {'cycle': n}, '2025-01-01T00:00:00', []).to_dict()
+                           for n in (1, 2)]
+            }
+            with open(manager.conversations_dir / 'legacy_1.json', 'w', encoding='utf-8') as f:
+                json.dump(legacy, f)
+            
+            assert manager.load_conversation('legacy_1') and len(manager.cycles) == 2
+            manager.add_cycle("prompt 2\n" * 49 + "prompt 3\n", {'cycle': 3})
+            with open(manager.conversations_dir / 'legacy_1.jsonl', 'r', encoding='utf-8') as f:
+                records = [json.loads(line) for line in f][1:]
+            assert 'prompt' in records[0] and 'prompt_delta' in records[2]  # Keyframe puis delta
+            assert sorted(hit['cycle_number'] for hit in manager.search_history('prompt')) == [1, 2, 3]
+            
+            reloaded = ConversationManager()
+            assert reloaded.load_conversation('legacy_1')
+            assert [c.cycle_number for c in reloaded.cycles] == [1, 2, 3]
+            assert reloaded.get_cycle(1).prompt == "prompt 1\n" * 50
+            assert reloaded.get_last_cycle().prompt == "prompt 2\n" * 49 + "prompt 3\n"
+            assert reloaded.list_conversations()[0]['cycles'] == 3
+            
+            assert reloaded.seen_methods() == {}
+            reloaded.add_cycle("prompt 4\n", {'cycle': 4}, context_methods={'a.py:A.f': 'def f(): pass'})
+            assert reloaded.seen_methods() == {'a.py:A.f': {'cycle': 4, 'code': 'def f(): pass'}}
+            again = ConversationManager()
+            assert again.load_conversation('legacy_1') and len(again.cycles) == 4
+            assert again.seen_methods() == reloaded.seen_methods()
+        finally:
+            os.chdir(cwd)
+    print("✅ Legacy conversation continued into JSONL log")
+
+
+if __name__ == '__main__':
+    import sys
+    
+    if sys.argv[1:] == ['self-test']:
+        _self_test()
+    elif sys.argv[1:] == ['rebuild-catalog']:
+        entries = ConversationManager().rebuild_catalog()
+        print(f"✅ Catalog rebuilt: {len(entries)} conversation(s)")
+    elif sys.argv[1:] == ['rebuild-index']:
+        stats = ConversationManager().rebuild_search_index()
+        print(f"✅ Search index rebuilt: {stats['cycles']} cycles, {stats['terms']} terms")
+    elif sys.argv[1:2] == ['search'] and len(sys.argv) > 2:
+        for hit in ConversationManager().search_history(' '.join(sys.argv[2:])):
+            print(f"[{hit['score']:.2f}] {hit['conversation_id']} #{hit['cycle_number']}: {hit['snippet']}")
+    elif sys.argv[1:] == ['storage-report']:
+        stats = ConversationManager().get_storage_stats()
+        print(f"Prompts: {stats['keyframes']} keyframes, {stats['deltas']} deltas")
+        print(f"Raw: {stats['raw_prompt_bytes']} bytes → stored: {stats['stored_prompt_bytes']} bytes")
+        print(f"Storage ratio: {stats['ratio']}x")
+    else:
+        print("Usage: python -m corecopy.conversation_manager [self-test|rebuild-catalog|rebuild-index|search <query>|storage-report]")
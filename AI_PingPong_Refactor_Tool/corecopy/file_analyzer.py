@@ -7,6 +7,8 @@ import json
 from datetime import datetime
 from typing import Dict, List
 
+from utils.code_helpers import CodeHelpers
+
 
 class FileAnalyzer:
     """
@@ -39,11 +41,9 @@ class FileAnalyzer:
             for method in methods:
                 total_methods += 1
                 
-                # Extract params
-                params = FileAnalyzer._extract_params_from_signature(method.get('signature', ''))
-                
-                # Detect signals
-                signals = FileAnalyzer._detect_signals_in_code(method.get('code', ''))
+                # Params / signaux : relevés par ProjectAnalyzer pendant le parcours AST
+                params = CodeHelpers.method_params(method)
+                signals = CodeHelpers.method_signals(method)
                 
                 # Clean docstring
                 docstring = method.get('docstring', '').strip() if method.get('docstring') else "No docstring"
@@ -137,84 +137,6 @@ class FileAnalyzer:
             }
         }
 
-    @staticmethod
-    def _extract_params_from_signature(signature: str) -> List[str]:
-        """Extract parameter names (COPIÉ de extract_params_from_signature)."""
-        import re
-        match = re.search(r'\((.*?)\)', signature)
-        if not match:
-            return []
-        
-        params_str = match.group(1).strip()
-        if not params_str:
-            return []
-        
-        params = []
-        current_param = ''
-        bracket_depth = 0
-        paren_depth = 0
-        
-        for char in params_str + ',':
-            if char == '[':
-                bracket_depth += 1
-                current_param += char
-            elif char == ']':
-                bracket_depth -= 1
-                current_param += char
-            elif char == '(':
-                paren_depth += 1
-                current_param += char
-            elif char == ')':
-                paren_depth -= 1
-                current_param += char
-            elif char == ',' and bracket_depth == 0 and paren_depth == 0:
-                param = current_param.strip()
-                if param:
-                    cleaned = FileAnalyzer._clean_param(param)
-                    if cleaned:
-                        params.append(cleaned)
-                current_param = ''
-            else:
-                current_param += char
-        
-        return params
-    
-    @staticmethod
-    def _clean_param(param: str) -> str:
-        """Clean parameter name (COPIÉ de clean_param)."""
-        param = param.strip()
-        if not param:
-            return None
-        
-        # Keep *args and **kwargs as-is
-        if param.startswith('*') or param.startswith('**'):
-            if ':' in param:
-                param = param.split(':')[0].strip()
-            if '=' in param:
-                param = param.split('=')[0].strip()
-            return param
-        
-        # Remove type hints
-        if ':' in param:
-            param = param.split(':')[0].strip()
-        
-        # Remove defaults
-        if '=' in param:
-            param = param.split('=')[0].strip()
-        
-        return param
-    
-    @staticmethod
-    def _detect_signals_in_code(code: str) -> List[str]:
-        """Detect Qt signals (COPIÉ de detect_signals_in_code)."""
-        import re
-        if not code:
-            return []
-        
-        pattern = r'self\.(\w+)\.emit'
-        matches = re.findall(pattern, code)
-        return sorted(set(matches))
-    
     @staticmethod
     def _method_metrics(method_name: str, metrics: Dict) -> Dict:
         """Extract method metrics."""
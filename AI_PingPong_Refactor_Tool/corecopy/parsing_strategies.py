@@ -4,24 +4,43 @@ Extrait de main.py lignes 1701-2800.
 """
 
 import json
-import re
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Union
 from datetime import datetime
 
+from utils.json_extractor import JsonCandidate, extract_json_candidates
+
 
 class ParsingStrategy(ABC):
-    """Interface base pour strategies de parsing."""
+    """
+    Interface base pour strategies de parsing.
+    Les strategies reçoivent l'objet JSON déjà décodé (une seule fois, par ResponseParser).
+    """
     
-    @abstractmethod
-    def can_handle(self, response_text: str) -> bool:
-        """Détecte si cette stratégie peut parser la réponse."""
-        pass
+    # Clés de premier niveau qui signalent ce format (registre de ResponseParser)
+    KEYS: Tuple[str, ...] = ()
+    
+    @staticmethod
+    def _load(data: Union[str, Any]) -> Any:
+        """Texte JSON (appel direct d'une strategy) → objet ; objet → inchangé."""
+        return json.loads(data) if isinstance(data, str) else data
+    
+    def can_handle(self, data: Any) -> bool:
+        """Détecte si cette stratégie peut parser la réponse décodée."""
+        data = self._load(data)
+        return isinstance(data, dict) and any(key in data for key in self.KEYS)
     
     @abstractmethod
-    def parse(self, response_text: str, context: Optional[Dict] = None) -> List[Dict]:
-        """Parse la réponse en liste de tasks."""
+    def parse(self, data: Any, context: Optional[Dict] = None) -> List[Dict]:
+        """Parse la réponse décodée en liste de tasks."""
         pass
+    
+    def parse_item(self, section: str, item: Any, counter: int, context: Optional[Dict] = None) -> List[Dict]:
+        """
+        Normalise un seul élément d'une section (ingestion streaming).
+        counter = rang de l'élément dans la réponse (ids identiques à parse()).
+        """
+        return self.parse({section: [item]}, context)
 
 
 class SimpleTaskParsingStrategy(ParsingStrategy):
@@ -30,17 +49,16 @@ class SimpleTaskParsingStrategy(ParsingStrategy):
     Ancien format pour bugs/features.
     """
     
-    def can_handle(self, response_text: str) -> bool:
+    KEYS = ('tasks',)
+    
+    def can_handle(self, data: Any) -> bool:
         """Détecte format simple tasks."""
-        try:
-            data = json.loads(response_text)
-            return 'tasks' in data and isinstance(data['tasks'], list)
-        except (json.JSONDecodeError, KeyError):
-            return False
+        data = self._load(data)
+        return isinstance(data, dict) and isinstance(data.get('tasks'), list)
     
-    def parse(self, response_text: str, context: Optional[Dict] = None) -> List[Dict]:
+    def parse(self, data: Any, context: Optional[Dict] = None) -> List[Dict]:
         """Parse tasks simples."""
-        data = json.loads(response_text)
+        data = self._load(data)
         ai_tasks = data.get('tasks', [])
         
         tasks = []
@@ -70,45 +88,45 @@ class RefactoringParsingStrategy(ParsingStrategy):
     Keys: critical_issues_prioritized, immediate_quick_wins, targeted_refactoring_plan
     """
     
-    def can_handle(self, response_text: str) -> bool:
-        """Détecte format refactoring."""
-        try:
-            data = json.loads(response_text)
-            return any(key in data for key in [
-                'critical_issues_prioritized',
-                'immediate_quick_wins',
-                'targeted_refactoring_plan'
-            ])
-        except (json.JSONDecodeError, KeyError):
-            return False
+    KEYS = (
+        'critical_issues_prioritized',
+        'immediate_quick_wins',
+        'targeted_refactoring_plan'
+    )
     
-    def parse(self, response_text: str, context: Optional[Dict] = None) -> List[Dict]:
+    def parse(self, data: Any, context: Optional[Dict] = None) -> List[Dict]:
         """Parse analyse refactoring complète."""
-        data = json.loads(response_text)
-        source_file = context.get('analyzed_file', 'unknown.py') if context else 'unknown.py'
+        data = self._load(data)
         
         tasks = []
         task_counter = 0
         
-        # === 1. CRITICAL ISSUES ===
-        if 'critical_issues_prioritized' in data:
-            for issue in data['critical_issues_prioritized']:
+        # === 1. CRITICAL ISSUES / 2. QUICK WINS ===
+        for section in ('critical_issues_prioritized', 'immediate_quick_wins'):
+            for item in data.get(section, []):
                 task_counter += 1
-                tasks.append(self._build_critical_issue_task(issue, task_counter, source_file))
-        
-        # === 2. QUICK WINS ===
-        if 'immediate_quick_wins' in data:
-            for action in data['immediate_quick_wins']:
-                task_counter += 1
-                tasks.append(self._build_quick_win_task(action, task_counter, source_file))
+                tasks.extend(self.parse_item(section, item, task_counter, context))
         
         # === 3. PHASED PLAN (EPICS) ===
         if 'targeted_refactoring_plan' in data:
-            epic_tasks = self._build_epic_tasks(data['targeted_refactoring_plan'], source_file)
-            tasks.extend(epic_tasks)
+            for phase in data['targeted_refactoring_plan'].items():
+                tasks.extend(self.parse_item('targeted_refactoring_plan', phase, 0, context))
         
         return tasks
     
+    def parse_item(self, section: str, item: Any, counter: int, context: Optional[Dict] = None) -> List[Dict]:
+        """Un élément : issue, quick win, ou phase (clé, données) du plan."""
+        source_file = context.get('analyzed_file', 'unknown.py') if context else 'unknown.py'
+        
+        if section == 'critical_issues_prioritized':
+            return [self._build_critical_issue_task(item, counter, source_file)]
+        if section == 'immediate_quick_wins':
+            return [self._build_quick_win_task(item, counter, source_file)]
+        if section == 'targeted_refactoring_plan':
+            phase_key, phase_data = item
+            return self._build_epic_tasks({phase_key: phase_data}, source_file)
+        return []
+    
     def _build_critical_issue_task(self, issue: Dict, counter: int, source_file: str) -> Dict:
         """Build task depuis critical issue."""
         priority_str = issue.get('priority', 'P1')
@@ -216,17 +234,38 @@ class ResponseParser:
     """
     
     def __init__(self):
-        self.strategies: List[ParsingStrategy] = [
-            SimpleTaskParsingStrategy(),
-            RefactoringParsingStrategy(),
-        ]
+        self.strategies: List[ParsingStrategy] = []
+        self._registry: Dict[str, List[ParsingStrategy]] = {}  # clé JSON → strategies (priorité)
+        self._fallbacks: List[ParsingStrategy] = []  # Strategies sans KEYS : essayées une à une
+        self._rank: Dict[int, int] = {}  # id(strategy) → priorité (plus petit = prioritaire)
+        self.last_extraction: Optional[JsonCandidate] = None  # Position, réparations, troncature
+        
+        for strategy in (SimpleTaskParsingStrategy(), RefactoringParsingStrategy()):
+            self._register(strategy, first=False)
+    
+    def _register(self, strategy: ParsingStrategy, first: bool):
+        """Indexe la strategy sous chacune de ses clés (first = prioritaire)."""
+        ranks = self._rank.values()
+        self._rank[id(strategy)] = (min(ranks, default=0) - 1) if first else (max(ranks, default=-1) + 1)
+        
+        def insert(items: List[ParsingStrategy]):
+            if first:
+                items.insert(0, strategy)
+            else:
+                items.append(strategy)
+        
+        insert(self.strategies)
+        if not strategy.KEYS:
+            insert(self._fallbacks)
+        for key in strategy.KEYS:
+            insert(self._registry.setdefault(key, []))
     
-    def parse(self, response_text: str, context: Optional[Dict] = None) -> List[Dict]:
+    def parse(self, response: Union[str, Any], context: Optional[Dict] = None) -> List[Dict]:
         """
         Parse réponse AI automatiquement.
         
         Args:
-            response_text: JSON brut (peut contenir ``````)
+            response: JSON brut (peut contenir ``````) ou objet déjà décodé
             context: {'analyzed_file': 'main.py', ...}
         
         Returns:
@@ -235,13 +274,15 @@ class ResponseParser:
         Raises:
             ValueError: Si aucune stratégie compatible
         """
-        # Extract JSON from markdown
-        clean_json = self._extract_json(response_text)
+        # Extraction propre à cette réponse (objet déjà décodé : aucune)
+        self.last_extraction = None
         
-        # Try strategies
-        for strategy in self.strategies:
-            if strategy.can_handle(clean_json):
-                return strategy.parse(clean_json, context)
+        # Un seul décodage ; les strategies reçoivent l'objet
+        data = self._extract_json(response) if isinstance(response, str) else response
+        
+        strategy = self.find_strategy(data)
+        if strategy:
+            return strategy.parse(data, context)
         
         # No strategy found
         raise ValueError(
@@ -251,23 +292,43 @@ class ResponseParser:
             "• {'critical_issues_prioritized': [...], ...}"
         )
     
-    def _extract_json(self, text: str) -> str:
-        """Extract JSON from markdown code block or raw text."""
-        # Try markdown block
-        match = re.search(r'``````', text, re.DOTALL)
-        if match:
-            return match.group(1).strip()
+    def find_strategy(self, data: Any) -> Optional[ParsingStrategy]:
+        """
+        Dispatch sur les clés de l'objet décodé via le registre
+        (coût fonction du nombre de clés, pas du nombre de strategies).
+        """
+        candidates: List[ParsingStrategy] = []
+        if isinstance(data, dict):
+            for key in data:
+                for strategy in self._registry.get(key, ()):
+                    if strategy not in candidates:
+                        candidates.append(strategy)
         
-        # Try raw JSON
-        text = text.strip()
-        if text.startswith('{') or text.startswith('['):
-            return text
+        # Priorité = ordre d'enregistrement (add_strategy passe devant)
+        candidates.sort(key=lambda strategy: self._rank[id(strategy)])
+        for strategy in candidates + self._fallbacks:
+            if strategy.can_handle(data):
+                return strategy
+        return None
+    
+    def _extract_json(self, text: str) -> Any:
+        """
+        Décode le JSON de la réponse (prose, blocs ```, réparations, troncature).
+        Premier candidat reconnu par une strategy, sinon le plus grand.
+        """
+        candidates = extract_json_candidates(text)
+        if not candidates:
+            raise ValueError("No JSON found in response")
         
-        raise ValueError("No JSON found in response")
+        chosen = next((c for c in candidates if self.find_strategy(c.value)), None)
+        chosen = chosen or max(candidates, key=lambda c: c.end - c.start)
+        
+        self.last_extraction = chosen  # Réparations / troncature : à l'appelant de les signaler
+        return chosen.value
     
     def add_strategy(self, strategy: ParsingStrategy):
-        """Add custom strategy (extensibility)."""
-        self.strategies.insert(0, strategy)
+        """Add custom strategy (extensibility), prioritaire sur les existantes."""
+        self._register(strategy, first=True)
 
 
 # === TESTS ===
@@ -316,3 +377,18 @@ if __name__ == '__main__':
     assert tasks[0]['priority'] == 'critical'
     assert '🔴' in tasks[0]['title']
     print("✅ Refactoring parsing OK")
+    
+    # Test objet déjà décodé + dispatch par clés
+    assert parser.parse(json.loads(simple_json))[0]['title'] == "Fix crash"
+    assert isinstance(parser.find_strategy({'immediate_quick_wins': []}), RefactoringParsingStrategy)
+    assert parser.find_strategy({'unrelated': 1}) is None
+    print("✅ Key dispatch OK")
+    
+    # Test prose + bloc markdown + réponse tronquée
+    truncated = 'Analyse :\n```json\n{"tasks": [{"title": "A"}, {"title": "B"}, {"title": "C'
+    tasks = parser.parse(truncated)
+    assert [t['title'] for t in tasks] == ['A', 'B']
+    assert parser.last_extraction.truncated
+    parser.parse(json.loads(simple_json))
+    assert parser.last_extraction is None  # Pas de réparations héritées de la réponse précédente
+    print("✅ Tolerant extraction OK")
@@ -10,6 +10,12 @@ from typing import Dict, List, Any
 from datetime import datetime
 from collections import defaultdict
 
+from corecopy.summary_cache import file_content_hash
+
+
+# Constructeurs de signaux Qt reconnus (PySide6 / PyQt)
+QT_SIGNAL_FACTORIES = ('Signal', 'pyqtSignal')
+
 
 class ProjectAnalyzer:
     """Analyse projet Python avec AST - Architecture optimisée."""
@@ -65,6 +71,7 @@ class ProjectAnalyzer:
                     rel_path = str(file_path.relative_to(self.project_path))
                     self._temp_files_data[rel_path] = {
                         'lines': lines,
+                        'content_hash': file_content_hash(source),  # Clé du cache des sommaires
                         'class_keys': []
                     }
                     
@@ -76,6 +83,7 @@ class ProjectAnalyzer:
                         elif isinstance(node, ast.ImportFrom):
                             if node.module:
                                 self._temp_imports.add(node.module.split('.')[0])
+                    file_imports = self._file_import_map(tree)
                     
                     # Fonctions globales
                     for node in tree.body:
@@ -85,12 +93,28 @@ class ProjectAnalyzer:
                     # Classes
                     for node in ast.walk(tree):
                         if isinstance(node, ast.ClassDef):
-                            self._collect_class_data(node, file_path, source, rel_path)
+                            self._collect_class_data(node, file_path, source, rel_path, file_imports)
                             
             except Exception as e:
                 print(f"Error parsing {file_path}: {e}")
     
-    def _collect_class_data(self, class_node: ast.ClassDef, file_path: Path, source: str, rel_path: str):
+    def _file_import_map(self, tree: ast.AST) -> Dict[str, str]:
+        """Nom local importé → instruction d'import (`from x import y as z`)."""
+        imports = {}
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    local = alias.asname or alias.name.split('.')[0]
+                    imports[local] = f"import {alias.name}" + (f" as {alias.asname}" if alias.asname else "")
+            elif isinstance(node, ast.ImportFrom):
+                module = '.' * node.level + (node.module or '')
+                for alias in node.names:
+                    local = alias.asname or alias.name
+                    imports[local] = f"from {module} import {alias.name}" + (f" as {alias.asname}" if alias.asname else "")
+        return imports
+    
+    def _collect_class_data(self, class_node: ast.ClassDef, file_path: Path, source: str, rel_path: str,
+                            file_imports: Dict[str, str]):
         """Collecte données d'une classe."""
         class_name = class_node.name
         class_key = f"{file_path.stem}.{class_name}"
@@ -99,7 +123,9 @@ class ProjectAnalyzer:
         self._temp_classes[class_key] = {
             'node': class_node,
             'file': rel_path,
-            'source': source
+            'source': source,
+            'qt_signals': self._find_declared_signals(class_node),
+            'instance_types': self._find_instance_types(class_node)
         }
         
         self._temp_files_data[rel_path]['class_keys'].append(class_key)
@@ -110,9 +136,10 @@ class ProjectAnalyzer:
         
         for method_node in class_node.body:
             if isinstance(method_node, ast.FunctionDef):
-                self._collect_method_data(class_key, method_node, source_lines)
+                self._collect_method_data(class_key, method_node, source_lines, file_imports)
     
-    def _collect_method_data(self, class_key: str, method_node: ast.FunctionDef, source_lines: List[str]):
+    def _collect_method_data(self, class_key: str, method_node: ast.FunctionDef, source_lines: List[str],
+                             file_imports: Dict[str, str]):
         """Collecte données d'une méthode."""
         method_name = method_node.name
         
@@ -140,7 +167,10 @@ class ProjectAnalyzer:
             'signature': signature,
             'lineno': method_node.lineno,
             'docstring': ast.get_docstring(method_node) or "",
-            'code': method_code
+            'code': method_code,
+            'def_use': self._find_def_use(method_node, file_imports),
+            'params': self._find_params(method_node),
+            'qt_signals': self._find_signal_usage(method_node, self._temp_classes[class_key]['instance_types'])
         })
         
         self.stats['total_methods'] += 1
@@ -162,6 +192,164 @@ class ProjectAnalyzer:
         
         return instance_vars
     
+    def _find_def_use(self, method_node: ast.FunctionDef, file_imports: Dict[str, str]) -> Dict[str, List[str]]:
+        """
+        Def-use de la méthode : attributs self lus/écrits, self.xxx() appelés,
+        imports du fichier référencés.
+        'calls' : appels directs ; 'deferred_calls' : appels dans le corps d'un lambda
+        ou d'une fonction imbriquée (exécutés plus tard, ex. slot passé à connect).
+        """
+        reads, writes, calls, deferred_calls, imports = [], [], [], [], []
+        
+        deferred = set()
+        for node in ast.walk(method_node):
+            if node is not method_node and isinstance(node, (ast.Lambda, ast.FunctionDef, ast.AsyncFunctionDef)):
+                for child in ([node.body] if isinstance(node, ast.Lambda) else node.body):
+                    deferred.update(id(n) for n in ast.walk(child) if isinstance(n, ast.Call))
+        
+        for node in ast.walk(method_node):
+            if isinstance(node, ast.Call):
+                func = node.func
+                if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == 'self':
+                    (deferred_calls if id(node) in deferred else calls).append(func.attr)
+            elif isinstance(node, ast.Attribute):
+                if isinstance(node.value, ast.Name) and node.value.id == 'self':
+                    (writes if isinstance(node.ctx, (ast.Store, ast.Del)) else reads).append(node.attr)
+            elif isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+                if node.id in file_imports:
+                    imports.append(file_imports[node.id])
+        
+        # self.xxx() compte aussi comme lecture de l'attribut : on ne le garde qu'en appel
+        call_set = set(calls) | set(deferred_calls)
+        reads = [name for name in reads if name not in call_set]
+        
+        return {
+            'reads': list(dict.fromkeys(reads)),
+            'writes': list(dict.fromkeys(writes)),
+            'calls': list(dict.fromkeys(calls)),
+            'deferred_calls': list(dict.fromkeys(deferred_calls)),
+            'imports': list(dict.fromkeys(imports))
+        }
+    
+    def _find_params(self, method_node: ast.FunctionDef) -> List[Dict[str, Any]]:
+        """Paramètres structurés : [{'name', 'annotation', 'default', 'kind'}] (ordre de la signature)."""
+        args = method_node.args
+        params = []
+        
+        def add(arg: ast.arg, kind: str, default: ast.AST = None):
+            params.append({
+                'name': arg.arg,
+                'annotation': ast.unparse(arg.annotation) if arg.annotation else None,
+                'default': ast.unparse(default) if default is not None else None,
+                'kind': kind
+            })
+        
+        # Les defaults s'appliquent aux derniers positionnels (posonly + args)
+        positional = [(a, 'positional_only') for a in args.posonlyargs] + [(a, 'positional') for a in args.args]
+        defaults = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+        for (arg, kind), default in zip(positional, defaults):
+            add(arg, kind, default)
+        
+        if args.vararg:
+            add(args.vararg, 'var_positional')
+        for arg, default in zip(args.kwonlyargs, args.kw_defaults):
+            add(arg, 'keyword_only', default)
+        if args.kwarg:
+            add(args.kwarg, 'var_keyword')
+        
+        return params
+    
+    @staticmethod
+    def _constructor_name(node: ast.AST) -> str:
+        """Classe instanciée par `X(...)` / `mod.X(...)`, sinon None."""
+        if isinstance(node, ast.Call):
+            if isinstance(node.func, ast.Name):
+                return node.func.id
+            if isinstance(node.func, ast.Attribute):
+                return node.func.attr
+        return None
+    
+    def _find_instance_types(self, class_node: ast.ClassDef) -> Dict[str, str]:
+        """self.xxx = Classe(...) dans les méthodes de la classe → {'xxx': 'Classe'}."""
+        types = {}
+        for node in ast.walk(class_node):
+            if isinstance(node, ast.Assign):
+                constructor = self._constructor_name(node.value)
+                for target in node.targets:
+                    if (constructor and isinstance(target, ast.Attribute)
+                            and isinstance(target.value, ast.Name) and target.value.id == 'self'):
+                        types.setdefault(target.attr, constructor)
+        return types
+    
+    @staticmethod
+    def _self_attribute_path(node: ast.AST) -> str:
+        """self.a.b → 'a.b' ; autre expression → forme source (ast.unparse)."""
+        text = ast.unparse(node)
+        return text[len('self.'):] if text.startswith('self.') else text
+    
+    def _find_declared_signals(self, class_node: ast.ClassDef) -> List[Dict[str, Any]]:
+        """Attributs de classe `name = Signal(...)` : [{'name', 'args', 'lineno'}]."""
+        declared = []
+        for node in class_node.body:
+            if not (isinstance(node, ast.Assign) and isinstance(node.value, ast.Call)):
+                continue
+            func = node.value.func
+            factory = func.id if isinstance(func, ast.Name) else getattr(func, 'attr', None)
+            if factory not in QT_SIGNAL_FACTORIES:
+                continue
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    declared.append({
+                        'name': target.id,
+                        'args': [ast.unparse(a) for a in node.value.args],
+                        'lineno': node.lineno
+                    })
+        return declared
+    
+    def _find_signal_usage(self, method_node: ast.FunctionDef, instance_types: Dict[str, str]) -> Dict[str, List]:
+        """
+        Signaux Qt utilisés par la méthode :
+        'emitted' (self.sig.emit(...), ou self.sig.emit passé comme slot)
+        et 'connected' (x.sig.connect(slot), avec la classe de x si connue).
+        """
+        emitted, connected = [], []
+        
+        # Variables locales `x = Classe(...)` (ex. card = TaskCard(task))
+        local_types = {}
+        for node in ast.walk(method_node):
+            if isinstance(node, ast.Assign) and self._constructor_name(node.value):
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        local_types.setdefault(target.id, self._constructor_name(node.value))
+        
+        def sender_type(signal: ast.Attribute) -> str:
+            owner = signal.value
+            if isinstance(owner, ast.Name):
+                return local_types.get(owner.id)
+            if isinstance(owner, ast.Attribute) and isinstance(owner.value, ast.Name) and owner.value.id == 'self':
+                return instance_types.get(owner.attr)
+            return None
+        
+        for node in ast.walk(method_node):
+            if isinstance(node, ast.Attribute) and node.attr == 'emit' and isinstance(node.value, ast.Attribute):
+                emitted.append(self._self_attribute_path(node.value))
+                continue
+            if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)):
+                continue
+            signal = node.func.value
+            if node.func.attr == 'connect' and isinstance(signal, ast.Attribute) and node.args:
+                connected.append({
+                    'signal': self._self_attribute_path(signal),
+                    'sender_type': sender_type(signal),
+                    'slot': self._self_attribute_path(node.args[0]),
+                    'lineno': node.lineno
+                })
+        
+        return {
+            'emitted': list(dict.fromkeys(emitted)),
+            'connected': connected
+        }
+    
     def _find_local_variables(self, method_node: ast.FunctionDef) -> Dict[str, List[str]]:
         """Trouve variables locales."""
         local_vars = {
@@ -253,13 +441,16 @@ class ProjectAnalyzer:
                 'docstring': ast.get_docstring(class_node) or "No description",
                 'methods': methods,
                 'num_methods': len(methods),
-                'instance_variables_by_method': self._temp_instance_vars.get(class_key, {})
+                'instance_variables_by_method': self._temp_instance_vars.get(class_key, {}),
+                'qt_signals': class_data['qt_signals'],
+                'instance_types': class_data['instance_types']
             }
         
         # Construire files_data
         for rel_path, data in self._temp_files_data.items():
             final_files_data[rel_path] = {
                 'lines': data['lines'],
+                'content_hash': data['content_hash'],
                 'classes': [final_classes[k] for k in data['class_keys'] if k in final_classes]
             }
         
@@ -65,6 +65,23 @@ class ProjectLoader:
         return self.tasks, needs_analysis
     
     
+    def load_tasks(self) -> bool:
+        """
+        Charge les tasks sans autre effet (fichier absent = aucune task).
+
+        Returns:
+            False si le fichier existe mais reste illisible (backup compris) :
+            ne pas le réécrire dans ce cas, il serait écrasé.
+        """
+        self.tasks = []
+        if not self.tasks_file.exists():
+            return True
+        if self._load_tasks():
+            return True
+        self.tasks = []
+        return False
+    
+    
     def _load_tasks(self) -> bool:
         """
         Charge les tasks depuis .ai_pingpong_tasks.json
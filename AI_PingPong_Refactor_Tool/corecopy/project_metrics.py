@@ -0,0 +1,223 @@
+"""
+Project Metrics - Métriques de toutes les méthodes du projet en colonnes NumPy.
+Percentiles, histogrammes, agrégats par fichier/classe et outliers vectorisés.
+NumPy est optionnel : sans lui, ProjectMetrics.available() retourne False.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # Dépendance optionnelle (pip install numpy)
+    np = None
+
+
+# Mêmes seuils que FileAnalyzer.build_summary : low ≤ 20 < medium ≤ 50 < high ≤ 100 < critical
+COMPLEXITY_LEVELS = ('low', 'medium', 'high', 'critical')
+COMPLEXITY_THRESHOLDS = (20, 50, 100)
+
+
+def count_code_lines(code: str) -> int:
+    """Lignes non vides hors commentaires (même règle que PromptGenerator._group_methods_by_class)."""
+    return sum(1 for line in code.split('\n') if line.strip() and not line.strip().startswith('#'))
+
+
+class ProjectMetrics:
+    """Colonnes NumPy des métriques par méthode, pour tout le projet."""
+
+    @staticmethod
+    def available() -> bool:
+        return np is not None
+
+    def __init__(self, analysis: Dict):
+        if np is None:
+            raise ImportError("ProjectMetrics requires numpy (pip install numpy)")
+
+        self.files: List[str] = []
+        self.classes: List[str] = []  # "file:Classe"
+        self.method_names: List[str] = []
+
+        file_index: Dict[str, int] = {}
+        file_idx, class_idx = [], []
+        code_lines, total_lines, num_params, lineno, has_doc = [], [], [], [], []
+
+        for class_info in analysis.get('classes', {}).values():
+            file = class_info['file']
+            if file not in file_index:
+                file_index[file] = len(self.files)
+                self.files.append(file)
+            current_class = len(self.classes)
+            self.classes.append(f"{file}:{class_info['name']}")
+
+            for method in class_info.get('methods', []):
+                code = method.get('code') or ''
+                params = method.get('local_vars', {}).get('parameters')
+                if params is None:
+                    params = [p for p in method.get('signature', '').partition('(')[2].rstrip(')').split(',') if p.strip()]
+
+                self.method_names.append(method['name'])
+                file_idx.append(file_index[file])
+                class_idx.append(current_class)
+                code_lines.append(count_code_lines(code))
+                total_lines.append(code.count('\n') + 1 if code else 0)
+                num_params.append(sum(1 for p in params if p.strip() not in ('self', 'cls')))
+                lineno.append(method.get('lineno', 0))
+                has_doc.append(bool(method.get('docstring')))
+
+        self.file_idx = np.asarray(file_idx, dtype=np.int32)
+        self.class_idx = np.asarray(class_idx, dtype=np.int32)
+        self.columns = {
+            'code_lines': np.asarray(code_lines, dtype=np.int32),
+            'total_lines': np.asarray(total_lines, dtype=np.int32),
+            'num_params': np.asarray(num_params, dtype=np.int32),
+            'lineno': np.asarray(lineno, dtype=np.int32),
+        }
+        self.has_docstring = np.asarray(has_doc, dtype=bool)
+        self.complexity = np.digitize(self.columns['code_lines'], COMPLEXITY_THRESHOLDS, right=True)
+
+    def __len__(self) -> int:
+        return len(self.method_names)
+
+    # === Distributions ===
+
+    def percentiles(self, column: str = 'code_lines', q: Sequence[float] = (50, 75, 90, 95, 99),
+                    mask=None) -> Dict[str, float]:
+        values = self.columns[column] if mask is None else self.columns[column][mask]
+        if not values.size:
+            return {f"p{int(p)}": 0.0 for p in q}
+        return {f"p{int(p)}": round(float(v), 1) for p, v in zip(q, np.percentile(values, q))}
+
+    def histogram(self, column: str = 'code_lines', bins=(0, 5, 10, 20, 50, 100, 200)) -> Dict:
+        """Histogramme ; le dernier bin est ouvert (≥ dernière borne)."""
+        values = self.columns[column]
+        edges = np.append(np.asarray(bins), max(int(values.max(initial=0)) + 1, bins[-1] + 1))
+        counts, _ = np.histogram(values, bins=edges)
+        return {'edges': edges.tolist(), 'counts': counts.tolist()}
+
+    def complexity_distribution(self, mask=None) -> Dict[str, int]:
+        levels = self.complexity if mask is None else self.complexity[mask]
+        counts = np.bincount(levels, minlength=len(COMPLEXITY_LEVELS))
+        return dict(zip(COMPLEXITY_LEVELS, counts.tolist()))
+
+    # === Agrégats ===
+
+    def aggregate(self, by: str = 'file') -> List[Dict]:
+        """Agrégats par fichier ou classe (bincount + médiane par tri groupé)."""
+        groups, names = (self.file_idx, self.files) if by == 'file' else (self.class_idx, self.classes)
+        n = len(names)
+        lines = self.columns['code_lines']
+
+        count = np.bincount(groups, minlength=n)
+        total = np.bincount(groups, weights=lines, minlength=n)
+        undocumented = np.bincount(groups, weights=~self.has_docstring, minlength=n)
+        long_methods = np.bincount(groups, weights=lines > COMPLEXITY_THRESHOLDS[1], minlength=n)
+        maximum = np.zeros(n, dtype=np.int64)
+        np.maximum.at(maximum, groups, lines)
+
+        # Médiane par groupe : tri (groupe, valeur) puis élément du milieu de chaque segment
+        order = np.lexsort((lines, groups))
+        starts = np.concatenate(([0], np.cumsum(count)[:-1]))
+        median = np.zeros(n)
+        nonempty = count > 0
+        sorted_lines = lines[order]
+        lo = starts[nonempty] + (count[nonempty] - 1) // 2
+        hi = starts[nonempty] + count[nonempty] // 2
+        median[nonempty] = (sorted_lines[lo] + sorted_lines[hi]) / 2
+
+        mean = np.divide(total, count, out=np.zeros(n), where=nonempty)
+
+        return [
+            {
+                'name': names[i],
+                'methods': int(count[i]),
+                'code_lines': int(total[i]),
+                'mean_method_length': round(float(mean[i]), 1),
+                'median_method_length': float(median[i]),
+                'max_method_length': int(maximum[i]),
+                'undocumented': int(undocumented[i]),
+                'long_methods': int(long_methods[i])
+            }
+            for i in np.flatnonzero(nonempty)
+        ]
+
+    def top_outliers(self, column: str = 'code_lines', k: int = 10) -> List[Dict]:
+        """Top-K méthodes (argpartition) avec leur z-score."""
+        values = self.columns[column]
+        if not values.size:
+            return []
+        k = min(k, values.size)
+        top = np.argpartition(values, -k)[-k:]
+        top = top[np.argsort(values[top])[::-1]]
+        std = values.std() or 1.0
+        z = (values[top] - values.mean()) / std
+        return [
+            {
+                'method': self.method_names[i],
+                'class': self.classes[self.class_idx[i]],
+                'file': self.files[self.file_idx[i]],
+                column: int(values[i]),
+                'zscore': round(float(score), 2)
+            }
+            for i, score in zip(top, z)
+        ]
+
+    # === Vues pour GUI / prompts ===
+
+    def summary(self) -> Dict:
+        """Vue projet (dashboard)."""
+        lines = self.columns['code_lines']
+        return {
+            'files': len(self.files),
+            'classes': len(self.classes),
+            'methods': len(self),
+            'code_lines': int(lines.sum()),
+            'percentiles': self.percentiles('code_lines'),
+            'complexity_distribution': self.complexity_distribution(),
+            'undocumented_percentage': round(float((~self.has_docstring).mean() * 100), 1) if len(self) else 0.0,
+            'top_outliers': self.top_outliers('code_lines', 5)
+        }
+
+    def file_position(self, file: str) -> Optional[Dict]:
+        """Position d'un fichier dans le projet (section projet du prompt refactor_file)."""
+        if file not in self.files:
+            return None
+
+        per_file = self.aggregate('file')
+        means = np.asarray([f['mean_method_length'] for f in per_file])
+        sizes = np.asarray([f['code_lines'] for f in per_file])
+        current = next(f for f in per_file if f['name'] == file)
+
+        return {
+            'project_files': len(per_file),
+            'project_methods': len(self),
+            'project_percentiles': self.percentiles('code_lines', (50, 90)),
+            'file_mean_method_length': current['mean_method_length'],
+            'mean_length_percentile': round(float((means < current['mean_method_length']).mean() * 100), 1),
+            'size_rank': int((sizes > current['code_lines']).sum()) + 1
+        }
+
+
+if __name__ == '__main__':
+    import sys
+
+    from corecopy.project_analyzer import ProjectAnalyzer
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m corecopy.project_metrics <project_dir>")
+        sys.exit(1)
+    if not ProjectMetrics.available():
+        print("⚠️ numpy not installed (pip install numpy)")
+        sys.exit(1)
+
+    metrics = ProjectMetrics(ProjectAnalyzer(sys.argv[1]).analyze())
+    summary = metrics.summary()
+    print(f"📊 {summary['files']} files, {summary['classes']} classes, {summary['methods']} methods, "
+          f"{summary['code_lines']} code lines")
+    print(f"Method length: {summary['percentiles']}")
+    print(f"Complexity: {summary['complexity_distribution']}")
+    print(f"Histogram: {metrics.histogram()}")
+    for outlier in summary['top_outliers']:
+        print(f"  🔴 {outlier['class']}.{outlier['method']}: {outlier['code_lines']} lines (z={outlier['zscore']})")
+    for entry in sorted(metrics.aggregate('file'), key=lambda f: f['code_lines'], reverse=True)[:5]:
+        print(f"  📄 {entry['name']}: {entry['methods']} methods, mean {entry['mean_method_length']}, "
+              f"median {entry['median_method_length']}, max {entry['max_method_length']}")
@@ -2,16 +2,54 @@
 Prompt Composer - Génération prompts via Jinja2
 """
 
-from jinja2 import Environment, FileSystemLoader, TemplateNotFound
+from jinja2 import (
+    Environment, FileSystemLoader, TemplateNotFound,
+    FileSystemBytecodeCache, ModuleLoader, ChoiceLoader, meta, nodes
+)
 from pathlib import Path
-from typing import Dict, List, Any
-import re
+from typing import Dict, List, Any, Optional
+import hashlib
+import json
+
+
+# Environments partagés par process : templates parsés/compilés une seule fois
+_ENVIRONMENTS: Dict[tuple, Environment] = {}
+
+
+class _PrecompiledLoader(ModuleLoader):
+    """
+    ModuleLoader vérifié à chaque chargement : un module plus ancien que sa source
+    (mtime ≠ manifest) est ignoré → repli sur le FileSystemLoader suivant (ChoiceLoader).
+    """
+    
+    def __init__(self, path: str, templates_dir: Path, compiled_mtimes: Dict[str, float]):
+        super().__init__(path)
+        self.templates_dir = templates_dir
+        self.compiled_mtimes = compiled_mtimes
+    
+    def _is_fresh(self, name: str) -> bool:
+        try:
+            return (self.templates_dir / name).stat().st_mtime == self.compiled_mtimes.get(name)
+        except OSError:
+            return False
+    
+    def load(self, environment, name, globals=None):
+        if not self._is_fresh(name):
+            raise TemplateNotFound(name)
+        template = super().load(environment, name, globals)
+        # auto_reload : source modifiée après démarrage → rechargée depuis les sources
+        template._uptodate = lambda: self._is_fresh(name)
+        return template
 
 
 class PromptComposer:
     """Compose prompts depuis templates Jinja2."""
     
-    def __init__(self, templates_dir: str = 'templates'):
+    BYTECODE_CACHE_DIR = Path('data/jinja_cache')
+    PRECOMPILED_DIR = Path('data/jinja_compiled')
+    PRECOMPILED_MANIFEST = 'manifest.json'
+    
+    def __init__(self, templates_dir: str = 'templates', use_precompiled: bool = False):
         # PATH HACK ABSOLU: toujours depuis ce fichier
         base_dir = Path(__file__).parent.parent.resolve()  # core/ -> racine projet
         self.templates_dir = base_dir / templates_dir
@@ -21,11 +59,73 @@ class PromptComposer:
         (self.templates_dir / 'prompts').mkdir(exist_ok=True)
         (self.templates_dir / 'sections').mkdir(exist_ok=True)
         
-        self.env = Environment(
-            loader=FileSystemLoader(str(self.templates_dir)),
+        self._fingerprints: Dict[str, tuple] = {}  # template → (stamp, digest)
+        self._meta_cache: Dict[str, tuple] = {}  # template → (stamp, méta AST)
+        
+        key = (str(self.templates_dir), use_precompiled)
+        if key not in _ENVIRONMENTS:
+            _ENVIRONMENTS[key] = self._create_environment(use_precompiled)
+        self.env = _ENVIRONMENTS[key]
+    
+    def _create_environment(self, use_precompiled: bool) -> Environment:
+        """Environment avec cache bytecode disque (auto_reload : staleness par mtime)."""
+        self.BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        
+        loader = FileSystemLoader(str(self.templates_dir))
+        if use_precompiled:
+            compiled_mtimes = self._read_precompiled_manifest()
+            if compiled_mtimes is None:
+                print("⚠️ Precompiled templates missing, using sources")
+            else:
+                if compiled_mtimes != self._template_mtimes():
+                    print("⚠️ Some precompiled templates are stale, using their sources")
+                precompiled = _PrecompiledLoader(str(self.PRECOMPILED_DIR), self.templates_dir, compiled_mtimes)
+                loader = ChoiceLoader([precompiled, loader])
+        
+        return Environment(
+            loader=loader,
+            bytecode_cache=FileSystemBytecodeCache(str(self.BYTECODE_CACHE_DIR)),
+            auto_reload=True,
             trim_blocks=True,
             lstrip_blocks=True
         )
+    
+    def _template_mtimes(self) -> Dict[str, float]:
+        """mtime de chaque template source (prompts/ et sections/)."""
+        return {
+            path.relative_to(self.templates_dir).as_posix(): path.stat().st_mtime
+            for path in self.templates_dir.glob('*/*.jinja2')
+        }
+    
+    def _read_precompiled_manifest(self) -> Optional[Dict[str, float]]:
+        """mtimes des sources au moment de la précompilation (None si absent)."""
+        manifest_path = self.PRECOMPILED_DIR / self.PRECOMPILED_MANIFEST
+        if not manifest_path.exists():
+            return None
+        
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def _precompiled_is_fresh(self) -> bool:
+        """Vérifie que les modules précompilés sont à jour des sources."""
+        return self._read_precompiled_manifest() == self._template_mtimes()
+    
+    def precompile_templates(self) -> int:
+        """Compile tous les templates en modules Python (data/jinja_compiled)."""
+        self.PRECOMPILED_DIR.mkdir(parents=True, exist_ok=True)
+        
+        mtimes = self._template_mtimes()
+        self.env.compile_templates(
+            str(self.PRECOMPILED_DIR),
+            filter_func=lambda name: name in mtimes,
+            zip=None,
+            ignore_errors=False
+        )
+        
+        with open(self.PRECOMPILED_DIR / self.PRECOMPILED_MANIFEST, 'w', encoding='utf-8') as f:
+            json.dump(mtimes, f, indent=2)
+        
+        return len(mtimes)
 
     
     def render(self, template_name: str, **kwargs) -> str:
@@ -38,6 +138,66 @@ class PromptComposer:
         except Exception as e:
             return f"ERROR rendering template: {e}"
     
+    def template_fingerprint(self, template_name: str) -> str:
+        """
+        Hash du template + sections incluses.
+        Recalculé seulement si un mtime/taille change.
+        """
+        paths = [self.templates_dir / template_name] + sorted((self.templates_dir / 'sections').glob('*.jinja2'))
+        stamp = tuple(
+            (str(p), p.stat().st_mtime_ns, p.stat().st_size) if p.exists() else (str(p), 0, 0)
+            for p in paths
+        )
+        
+        cached = self._fingerprints.get(template_name)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        
+        h = hashlib.sha1()
+        for p in paths:
+            if p.exists():
+                h.update(p.read_bytes())
+            h.update(b'\0')
+        digest = h.hexdigest()
+        
+        self._fingerprints[template_name] = (stamp, digest)
+        return digest
+    
+    def render_to_file(self, template_name: str, output_path: Path,
+                       preview_chars: int = 16384, **kwargs) -> Dict[str, Any]:
+        """
+        Rend un template en streaming (template.generate) directement dans un fichier.
+        Le prompt complet n'est jamais assemblé en mémoire.
+        
+        Returns:
+            {'path', 'size_bytes', 'chars', 'tokens', 'preview', 'truncated'}
+        """
+        from utils.tokens import CHARS_PER_TOKEN
+        
+        template = self.env.get_template(template_name)
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        chars = 0
+        preview_parts = []
+        preview_len = 0
+        with open(output_path, 'w', encoding='utf-8') as f:
+            for chunk in template.generate(**kwargs):
+                f.write(chunk)
+                chars += len(chunk)
+                if preview_len < preview_chars:
+                    preview_parts.append(chunk[:preview_chars - preview_len])
+                    preview_len += len(preview_parts[-1])
+        
+        return {
+            'path': str(output_path),
+            'size_bytes': output_path.stat().st_size,
+            'chars': chars,
+            'tokens': (chars + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN,
+            'preview': ''.join(preview_parts),
+            'truncated': chars > preview_chars
+        }
+    
     def list_templates(self, category: str = 'prompts') -> List[str]:
         """Liste templates disponibles dans catégorie."""
         template_dir = self.templates_dir / category
@@ -46,31 +206,90 @@ class PromptComposer:
         
         return [f.stem for f in template_dir.glob('*.jinja2')]
     
+    def _template_meta(self, template_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Méta d'un fichier template via l'AST Jinja, recalculée seulement si mtime/taille change.
+        
+        Returns:
+            {'free', 'optional', 'stored', 'includes', 'size', 'lines'} ou None si absent
+        """
+        path = self.templates_dir / template_name
+        if not path.exists():
+            return None
+        
+        stat = path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._meta_cache.get(template_name)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        
+        source = path.read_text(encoding='utf-8')
+        tree = self.env.parse(source)
+        
+        info = {
+            'free': meta.find_undeclared_variables(tree),
+            'optional': self._optional_names(tree),
+            'stored': {n.name for n in tree.find_all(nodes.Name) if n.ctx in ('store', 'param')},
+            'includes': [name for name in meta.find_referenced_templates(tree) if name],
+            'size': len(source),
+            'lines': source.count('\n') + 1
+        }
+        self._meta_cache[template_name] = (stamp, info)
+        return info
+    
+    @staticmethod
+    def _optional_names(tree) -> set:
+        """Variables dont le template teste la présence ({% if x %}, x if x else, x|default, x is defined)."""
+        def truthiness(node) -> set:
+            if isinstance(node, nodes.Name):
+                return {node.name}
+            if isinstance(node, nodes.Not):
+                return truthiness(node.node)
+            if isinstance(node, (nodes.And, nodes.Or)):
+                return truthiness(node.left) | truthiness(node.right)
+            return set()
+        
+        names = set()
+        for node in tree.find_all((nodes.If, nodes.CondExpr)):
+            names |= truthiness(node.test)
+        for node in tree.find_all(nodes.Filter):
+            if node.name in ('default', 'd') and isinstance(node.node, nodes.Name):
+                names.add(node.node.name)
+        for node in tree.find_all(nodes.Test):
+            if node.name in ('defined', 'undefined') and isinstance(node.node, nodes.Name):
+                names.add(node.node.name)
+        return names
+    
+    def get_template_requirements(self, template_name: str, _stack: tuple = ()) -> Dict[str, List[str]]:
+        """
+        Variables de contexte attendues par un template, includes compris.
+        Une variable d'un include fournie par le parent ({% for task in ... %}) n'est pas comptée.
+        
+        Returns:
+            {'required': [...], 'optional': [...]}
+        """
+        info = self._template_meta(template_name)
+        if info is None or template_name in _stack:
+            return {'required': [], 'optional': []}
+        
+        optional = info['free'] & info['optional']
+        required = info['free'] - optional
+        for include in info['includes']:
+            sub = self.get_template_requirements(include, _stack + (template_name,))
+            required |= set(sub['required']) - info['stored']
+            optional |= set(sub['optional']) - info['stored']
+        
+        return {'required': sorted(required - optional), 'optional': sorted(optional)}
+    
     def get_template_variables(self, template_name: str) -> List[str]:
-        """Extrait variables d'un template."""
-        try:
-            template_path = self.templates_dir / template_name
-            if not template_path.exists():
-                return []
-            
-            with open(template_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Simple regex pour {{ var }} et {% for var in %}
-            variables = set()
-            
-            # {{ variable }}
-            for match in re.finditer(r'\{\{\s*(\w+)', content):
-                variables.add(match.group(1))
-            
-            # {% for var in ... %}
-            for match in re.finditer(r'\{%\s*for\s+(\w+)\s+in', content):
-                variables.add(match.group(1))
-            
-            return sorted(list(variables))
-        except Exception as e:
-            print(f"Error extracting variables: {e}")
-            return []
+        """Extrait variables d'un template (AST Jinja, includes suivis)."""
+        requirements = self.get_template_requirements(template_name)
+        return sorted(requirements['required'] + requirements['optional'])
+    
+    def find_missing_variables(self, template_name: str, context: Dict[str, Any]) -> List[str]:
+        """Variables requises absentes du contexte (à vérifier avant render)."""
+        return [name for name in self.get_template_requirements(template_name)['required']
+                if name not in context]
     
     def render_prompt(self, 
                      template_type: str,
@@ -103,20 +322,54 @@ class PromptComposer:
     
     def get_template_info(self, template_name: str) -> Dict[str, Any]:
         """Info sur un template."""
-        template_path = self.templates_dir / template_name
-        
-        if not template_path.exists():
+        info = self._template_meta(template_name)
+        if info is None:
             return {'exists': False}
         
-        variables = self.get_template_variables(template_name)
-        
-        with open(template_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        requirements = self.get_template_requirements(template_name)
         
         return {
             'exists': True,
-            'path': str(template_path),
-            'variables': variables,
-            'size': len(content),
-            'lines': content.count('\n') + 1
+            'path': str(self.templates_dir / template_name),
+            'variables': sorted(requirements['required'] + requirements['optional']),
+            'required': requirements['required'],
+            'optional': requirements['optional'],
+            'includes': info['includes'],
+            'size': info['size'],
+            'lines': info['lines']
         }
+
+
+def _measure_first_render(mode: str) -> float:
+    """Latence (ms) création composer + premier rendu, dans un process neuf (imports exclus)."""
+    import os
+    import subprocess
+    import sys
+    
+    code = (
+        "import time; from corecopy.prompt_composer import PromptComposer;"
+        "t = time.perf_counter();"
+        f"c = PromptComposer(use_precompiled={mode == 'precompiled'});"
+        + ("c.env.bytecode_cache = None;" if mode == 'no_cache' else "")
+        + "c.render('prompts/refactor_code.jinja2', project_name='bench', selected_tasks=[], num_tasks=0);"
+        "print((time.perf_counter() - t) * 1000)"
+    )
+    root = Path(__file__).parent.parent.resolve()
+    out = subprocess.run([sys.executable, '-c', code], cwd=str(Path.cwd()), capture_output=True,
+                         text=True, env={**os.environ, 'PYTHONPATH': str(root)})
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+if __name__ == '__main__':
+    import sys
+    
+    if sys.argv[1:] == ['precompile']:
+        count = PromptComposer().precompile_templates()
+        print(f"✅ {count} templates precompiled to {PromptComposer.PRECOMPILED_DIR}")
+    elif sys.argv[1:] == ['bench']:
+        PromptComposer().precompile_templates()
+        for mode in ('no_cache', 'bytecode_cache', 'precompiled'):
+            runs = sorted(_measure_first_render(mode) for _ in range(5))
+            print(f"{mode:15s} first render: {runs[len(runs) // 2]:.1f} ms (median of 5)")
+    else:
+        print("Usage: python -m corecopy.prompt_composer [precompile|bench]")
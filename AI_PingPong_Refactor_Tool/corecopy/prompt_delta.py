@@ -0,0 +1,77 @@
+"""
+Prompt Delta - Compression des prompts entre cycles ping-pong.
+Un prompt est stocké comme delta ligne à ligne du prompt précédent (difflib).
+"""
+
+import difflib
+import json
+from typing import List, Optional
+
+
+# Un prompt complet (keyframe) tous les N cycles : borne la reconstruction
+KEYFRAME_INTERVAL = 10
+
+
+def make_delta(base: str, target: str) -> List:
+    """
+    Calcule le delta base → target.
+
+    Format: liste d'opérations
+        [i1, i2]      : copie lignes base[i1:i2]
+        ["ligne", ...] : insère ces lignes
+    """
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+
+    matcher = difflib.SequenceMatcher(None, base_lines, target_lines, autojunk=False)
+
+    ops = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append([i1, i2])
+        elif tag in ('replace', 'insert'):
+            ops.append(target_lines[j1:j2])
+        # 'delete' : rien à copier
+
+    return ops
+
+
+def apply_delta(base: str, ops: List) -> str:
+    """Reconstruit le prompt depuis base + delta."""
+    base_lines = base.splitlines(keepends=True)
+
+    parts = []
+    for op in ops:
+        if op and isinstance(op[0], int):
+            parts.extend(base_lines[op[0]:op[1]])
+        else:
+            parts.extend(op)
+
+    return ''.join(parts)
+
+
+def encode_prompt(prompt: str, previous: Optional[str], cycle_number: int) -> dict:
+    """
+    Encode un prompt pour le log : {'prompt': ...} ou {'prompt_delta': ...}.
+    Keyframe si pas de précédent, tous les KEYFRAME_INTERVAL cycles,
+    ou si le delta n'est pas plus petit que le texte.
+    previous doit être le prompt du cycle précédent dans le même log (None sinon).
+    """
+    is_keyframe = previous is None or (cycle_number - 1) % KEYFRAME_INTERVAL == 0
+    if is_keyframe:
+        return {'prompt': prompt}
+
+    ops = make_delta(previous, prompt)
+    if len(json.dumps(ops)) >= len(json.dumps(prompt)):
+        return {'prompt': prompt}
+
+    return {'prompt_delta': ops}
+
+
+def decode_prompt(record: dict, previous: Optional[str]) -> str:
+    """Décode le prompt d'un enregistrement de cycle (retire la clé delta)."""
+    if 'prompt_delta' in record:
+        if previous is None:
+            raise ValueError(f"Cycle {record.get('cycle_number')}: delta without base prompt")
+        return apply_delta(previous, record.pop('prompt_delta'))
+    return record['prompt']
@@ -3,9 +3,26 @@ Prompt Generator - Generate prompts from templates.
 Extrait de main.py generate_prompt() (L963-1169).
 """
 
+import difflib
+import hashlib
 from typing import List, Dict, Optional
 from pathlib import Path
 
+from corecopy.context_slicer import DependencySlicer
+from corecopy.project_metrics import ProjectMetrics
+from corecopy.prompt_packer import PromptPacker, LEVEL_FULL
+from corecopy.summary_cache import SummaryCache
+from utils.code_minifier import minify_code, minify_tasks
+from utils.cache import LRUCache, content_digest
+from utils.context_view import wrap
+
+
+# Caches partagés entre instances (un PromptGenerator est créé par clic "Generate")
+_PROMPT_CACHE = LRUCache(maxsize=32)
+_SUMMARY_CACHE = SummaryCache()  # Mémoire + disque, clé (fichier, hash contenu, version)
+_METRICS_CACHE = LRUCache(maxsize=4)
+
+
 class PromptGenerator:
     """
     Génère prompts depuis templates Jinja2.
@@ -15,41 +32,58 @@ class PromptGenerator:
     def __init__(self, composer, analysis):
         self.composer = composer
         self.analysis = analysis
+        self.last_packing_report: Optional[Dict] = None
+        self.last_minify_report: Optional[Dict] = None
+        self.slicer = DependencySlicer(analysis)
+        self.last_sent_methods: Dict[str, str] = {}  # À enregistrer dans le cycle (ConversationManager)
     
-    def _to_dict(self, obj):
-        """Convertit récursivement objet en dict pur."""
-        if isinstance(obj, dict):
-            return {k: self._to_dict(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._to_dict(item) for item in obj]
-        elif hasattr(obj, '__dict__'):
-            return self._to_dict(obj.__dict__)
-        else:
-            return obj
+    @staticmethod
+    def _methods_digest(file_methods: List) -> str:
+        """Empreinte incrémentale du contenu analysé des méthodes (sans gros buffer)."""
+        h = hashlib.sha1()
+        for m in file_methods:
+            for value in (m.class_name, m.method_name, m.signature, m.lineno, m.docstring, m.code):
+                h.update(str(value).encode('utf-8'))
+                h.update(b'\0')
+        return h.hexdigest()
+    
+    @staticmethod
+    def method_id(task: Dict) -> str:
+        """Identifiant stable d'une méthode (même format que Task.task_id)."""
+        return f"{task.get('file')}:{task.get('class_name')}.{task.get('method_name')}"
+    
+    @staticmethod
+    def sent_code(task: Dict, minify: Optional[List[str]] = None) -> str:
+        """Code de la méthode tel que l'IA le reçoit (minifié si demandé)."""
+        code = task.get('code') or ''
+        return minify_code(code, minify) if minify else code
+    
+    @classmethod
+    def _sent_methods(cls, sent_tasks: List[Dict]) -> Dict[str, str]:
+        """Méthodes envoyées en entier (packing 'full') → code effectivement envoyé."""
+        return {
+            cls.method_id(t): t.get('code') or ''
+            for t in sent_tasks if t.get('packing', LEVEL_FULL) == LEVEL_FULL
+        }
     
     def generate_refactor_file(self, target_file: str, file_methods: List) -> str:
         """
         Génère prompt refactor_file.
         COPIÉ de generate_prompt() mode refactor_file.
         """
-        from corecopy.file_analyzer import FileAnalyzer
+        summary_key, prompt_key = self._refactor_file_key(target_file, file_methods)
         
-        # Build file summary
-        file_summary_obj = FileAnalyzer.build_summary(target_file, {'classes': self._group_methods_by_class(file_methods)})
+        cached = _PROMPT_CACHE.get(prompt_key)
+        if cached is not None:
+            return cached
+        
+        file_summary_data = self._get_file_summary(target_file, file_methods, summary_key)
         
-        # Convertir en dict pur pour Jinja2
-        file_summary_data = self._to_dict(file_summary_obj)
-        print(f"\n=== DEBUG FILE_SUMMARY ===")
-        print(f"Type: {type(file_summary_data)}")
-        print(f"Keys: {file_summary_data.keys() if isinstance(file_summary_data, dict) else 'NOT A DICT'}")
-        if isinstance(file_summary_data, dict) and 'metrics' in file_summary_data:
-            print(f"Type metrics: {type(file_summary_data['metrics'])}")
-            print(f"Metrics: {file_summary_data['metrics']}")
-        print("=========================\n")
         # Build context
         context = {
             'project_name': self.analysis['project_name'],
-            'file_summary': file_summary_data
+            'file_summary': file_summary_data,
+            'project_position': self._project_position(target_file)
         }
         
         # Render template
@@ -58,20 +92,259 @@ class PromptGenerator:
             **context
         )
         
+        if not prompt.startswith('ERROR'):
+            _PROMPT_CACHE.put(prompt_key, prompt)
+        
         return prompt
     
+    def stream_refactor_file(self, target_file: str, file_methods: List,
+                             output_path: Path, preview_chars: int = 16384) -> Dict:
+        """
+        Variante streaming de generate_refactor_file : écrit le prompt dans
+        output_path chunk par chunk (mémoire bornée pour les gros fichiers).
+        Même clé que generate_refactor_file : si elle correspond et que le fichier
+        écrit n'a pas changé sur disque, il est réutilisé sans nouveau rendu.
+        """
+        summary_key, prompt_key = self._refactor_file_key(target_file, file_methods)
+        stream_key = ('stream',) + prompt_key + (str(output_path), preview_chars)
+        
+        cached = _PROMPT_CACHE.get(stream_key)
+        if cached is not None:
+            stats, file_stamp = cached
+            try:
+                st = Path(output_path).stat()
+                if (st.st_size, st.st_mtime_ns) == file_stamp:
+                    return dict(stats)
+            except OSError:
+                pass
+        
+        stats = self.composer.render_to_file(
+            'prompts/refactor_file.jinja2',
+            output_path,
+            preview_chars=preview_chars,
+            project_name=self.analysis['project_name'],
+            file_summary=self._get_file_summary(target_file, file_methods, summary_key),
+            project_position=self._project_position(target_file)
+        )
+        st = Path(stats['path']).stat()
+        _PROMPT_CACHE.put(stream_key, (dict(stats), (st.st_size, st.st_mtime_ns)))
+        
+        return stats
+    
+    def _refactor_file_key(self, target_file: str, file_methods: List) -> tuple:
+        """(summary_key, prompt_key) : fichier + hash de son contenu (invalide si le fichier change)."""
+        summary_key = self._summary_key(target_file, file_methods)
+        prompt_key = (
+            'refactor_file',
+            self.composer.template_fingerprint('prompts/refactor_file.jinja2'),
+            self.analysis['project_name'],
+            self.analysis.get('analyzed_at'),  # Position projet (percentiles) dépend de toute l'analyse
+            summary_key
+        )
+        return summary_key, prompt_key
+    
+    def project_metrics(self) -> Optional[ProjectMetrics]:
+        """Métriques NumPy de toute l'analyse (None sans numpy), partagées entre instances."""
+        if not ProjectMetrics.available():
+            return None
+        
+        key = (self.analysis.get('project_path'), self.analysis.get('analyzed_at'))
+        metrics = _METRICS_CACHE.get(key)
+        if metrics is None:
+            metrics = ProjectMetrics(self.analysis)
+            _METRICS_CACHE.put(key, metrics)
+        return metrics
+    
+    def _project_position(self, target_file: str) -> Optional[Dict]:
+        """Position du fichier dans le projet (percentiles, rang) pour refactor_file."""
+        metrics = self.project_metrics()
+        return metrics.file_position(target_file) if metrics else None
+    
+    def _summary_key(self, target_file: str, file_methods: List) -> tuple:
+        """
+        (fichier, hash du contenu) enregistré par ProjectAnalyzer.
+        Sous-ensemble de méthodes ou analyse sans hash : empreinte des méthodes.
+        """
+        file_data = self.analysis.get('files_data', {}).get(target_file, {})
+        content_hash = file_data.get('content_hash')
+        file_method_count = sum(len(c.get('methods', [])) for c in file_data.get('classes', []))
+        
+        if content_hash and len(file_methods) == file_method_count:
+            return (target_file, content_hash)
+        return (target_file, self._methods_digest(file_methods))
+    
+    def _get_file_summary(self, target_file: str, file_methods: List, summary_key: tuple) -> Dict:
+        """FileAnalyzer.build_summary mis en cache (mémoire + disque) par contenu du fichier."""
+        from corecopy.file_analyzer import FileAnalyzer
+        
+        cached = _SUMMARY_CACHE.get(*summary_key)
+        if cached is not None:
+            return wrap(cached)
+        
+        # Build file summary
+        file_summary_obj = FileAnalyzer.build_summary(target_file, {'classes': self._group_methods_by_class(file_methods)})
+        _SUMMARY_CACHE.put(*summary_key, file_summary_obj)
+        
+        # Vue lecture seule pour Jinja2 (pas de recopie récursive)
+        return wrap(file_summary_obj)
+    
     def generate_normal(self, template: str, selected_tasks: List[Dict], 
-                       description: str, code_mode: bool) -> str:
+                       description: str, code_mode: bool,
+                       token_budget: Optional[int] = None,
+                       minify: Optional[List[str]] = None) -> str:
         """
         Génère prompt normal (debug_bug, feature_new, refactor_code).
         COPIÉ de generate_prompt() mode normal.
+        
+        token_budget: si fourni, le code des méthodes est packé dans ce budget
+        (rapport dans self.last_packing_report).
+        minify: modes de utils.code_minifier appliqués au code avant packing
+        (économie dans self.last_minify_report).
+        """
+        prompt_key = (
+            template,
+            self.composer.template_fingerprint(f'prompts/{template}.jinja2'),
+            self.analysis['project_name'],
+            self.analysis.get('analyzed_at'),  # Slice / instance_variables_by_method lus dans l'analyse
+            content_digest(selected_tasks),
+            description,
+            code_mode,
+            token_budget,
+            tuple(minify or ())
+        )
+        
+        cached = _PROMPT_CACHE.get(prompt_key)
+        if cached is not None:
+            prompt, self.last_packing_report, self.last_minify_report, self.last_sent_methods = cached
+            return prompt
+        
+        context = self._normal_context(template, selected_tasks, description, code_mode,
+                                       token_budget, minify)
+        self.last_packing_report = context['packing_report']
+        self.last_minify_report = context['minify_report']
+        # Code réellement vu par l'IA : minifié, et pas les méthodes réduites par le packing
+        self.last_sent_methods = self._sent_methods(context['selected_tasks'])
+        
+        # Contexte incomplet : erreur explicite avant rendu (au lieu d'un Undefined en plein template)
+        missing = self.composer.find_missing_variables(f'prompts/{template}.jinja2', context)
+        if missing:
+            return f"ERROR: missing template variables for '{template}': {', '.join(missing)}"
+        
+        # Render
+        prompt = self.composer.render(
+            f'prompts/{template}.jinja2',
+            **context
+        )
+        
+        if not prompt.startswith('ERROR'):
+            _PROMPT_CACHE.put(prompt_key, (prompt, self.last_packing_report, self.last_minify_report,
+                                           self.last_sent_methods))
+        
+        return prompt
+    
+    def generate_followup(self, template: str, selected_tasks: List[Dict], description: str,
+                          code_mode: bool, seen_methods: Dict[str, Dict],
+                          token_budget: Optional[int] = None,
+                          minify: Optional[List[str]] = None) -> str:
+        """
+        Prompt de suivi d'un cycle ping-pong : les méthodes déjà vues par l'IA
+        (ConversationManager.seen_methods) sont référencées par id si inchangées,
+        envoyées en diff unifié si modifiées ; seules les nouvelles sont complètes.
+        """
+        tasks = self.followup_tasks(selected_tasks, seen_methods, minify)
+        prompt = self.generate_normal(template, tasks, description, code_mode, token_budget, minify)
+        
+        # Le cycle n'enregistre que ce qui a changé et a été envoyé en entier (le reste est
+        # déjà dans l'historique) ; un diff envoyé vaut la version courante
+        sent = self.last_sent_methods
+        self.last_sent_methods = {
+            self.method_id(t): self.sent_code(original, minify)
+            for t, original in zip(tasks, selected_tasks)
+            if t['followup'] != 'unchanged' and self.method_id(t) in sent
+        }
+        return prompt
+    
+    def followup_tasks(self, selected_tasks: List[Dict], seen_methods: Dict[str, Dict],
+                       minify: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Copies des tasks marquées followup = unchanged | changed (code = diff) | new.
+        Comparaison avec le code tel qu'il serait envoyé (minifié si demandé).
+        """
+        tasks = []
+        for task in selected_tasks:
+            method_id = self.method_id(task)
+            code = self.sent_code(task, minify)
+            seen = seen_methods.get(method_id)
+            
+            if seen is None:
+                tasks.append({**task, 'followup': 'new'})
+            elif seen['code'] == code:
+                tasks.append({**task, 'followup': 'unchanged', 'method_id': method_id,
+                              'seen_cycle': seen['cycle'], 'code': ''})
+            else:
+                diff = '\n'.join(difflib.unified_diff(
+                    seen['code'].splitlines(), code.splitlines(),
+                    fromfile=f"{method_id} (cycle {seen['cycle']})", tofile=f"{method_id} (actuel)",
+                    lineterm='', n=2
+                ))
+                if len(diff) < len(code):
+                    tasks.append({**task, 'followup': 'changed', 'method_id': method_id,
+                                  'seen_cycle': seen['cycle'], 'code': diff})
+                else:
+                    # Réécriture quasi complète : le code entier est plus court que le diff
+                    tasks.append({**task, 'followup': 'new'})
+        return tasks
+    
+    def stream_normal(self, template: str, selected_tasks: List[Dict], description: str,
+                      code_mode: bool, output_path: Path, token_budget: Optional[int] = None,
+                      minify: Optional[List[str]] = None, preview_chars: int = 16384) -> Dict:
         """
+        Variante streaming de generate_normal (écrit dans output_path, sans cache).
+        Rapports dans les stats retournées ('packing_report', 'minify_report') et non
+        sur l'instance : un même generator peut servir plusieurs threads (batch).
+        """
+        context = self._normal_context(template, selected_tasks, description, code_mode,
+                                       token_budget, minify)
+        
+        stats = self.composer.render_to_file(
+            f'prompts/{template}.jinja2',
+            output_path,
+            preview_chars=preview_chars,
+            **context
+        )
+        stats['packing_report'] = context['packing_report']
+        stats['minify_report'] = context['minify_report']
+        return stats
+    
+    def _normal_context(self, template: str, selected_tasks: List[Dict], description: str,
+                        code_mode: bool, token_budget: Optional[int],
+                        minify: Optional[List[str]] = None) -> Dict:
+        """
+        Contexte Jinja des templates normaux (minification et packing inclus).
+        Rapports dans context['minify_report'] / context['packing_report'] (instance non modifiée).
+        """
+        if template == 'refactor_code':
+            # Variables d'instance / helpers / imports réellement utilisés par chaque méthode
+            selected_tasks = self.slicer.slice_tasks(selected_tasks)
+        
+        minify_report = None
+        if minify:
+            selected_tasks, minify_report = minify_tasks(selected_tasks, minify)
+        
+        packing_report = None
+        if token_budget:
+            selected_tasks, packing_report = PromptPacker(token_budget).pack(selected_tasks)
+        
         # Build context
         context = {
             'project_name': self.analysis['project_name'],
             'selected_tasks': selected_tasks,
             'num_tasks': len(selected_tasks),
-            'code_mode': code_mode
+            'code_mode': code_mode,
+            'packing_report': packing_report,
+            'minify_report': minify_report,
+            'class_groups': self._group_tasks_by_class(selected_tasks),
+            'followup': self._followup_summary(selected_tasks)
         }
         
         # Add template-specific variables
@@ -83,19 +356,48 @@ class PromptGenerator:
         elif template == 'refactor_code':
             context['refactor_goal'] = description or "⚠️ Describe refactor goal"
         
-        # Render
-        prompt = self.composer.render(
-            f'prompts/{template}.jinja2',
-            **context
-        )
-        
-        return prompt
+        return context
+    
+    @staticmethod
+    def _followup_summary(selected_tasks: List[Dict]) -> Optional[Dict]:
+        """Compte unchanged/changed/new (None si prompt complet)."""
+        if not any('followup' in t for t in selected_tasks):
+            return None
+        summary = {'unchanged': 0, 'changed': 0, 'new': 0}
+        for task in selected_tasks:
+            summary[task.get('followup', 'new')] += 1
+        return summary
+    
+    def _group_tasks_by_class(self, selected_tasks: List[Dict]) -> List[Dict]:
+        """
+        Contexte groupé par classe, construit une fois : données partagées de la
+        classe (variables d'instance) + tasks de la classe (références, pas de copie).
+        """
+        groups: Dict[tuple, Dict] = {}
+        for task in selected_tasks:
+            key = (task.get('file'), task.get('class_name'))
+            group = groups.get(key)
+            if group is None:
+                class_data = self.analysis.get('classes', {}).get(DependencySlicer.class_key(task), {})
+                group = groups[key] = {
+                    'class_name': task.get('class_name'),
+                    'file': task.get('file'),
+                    'instance_variables_by_method': (class_data.get('instance_variables_by_method')
+                                                     or task.get('instance_variables_by_method') or {}),
+                    'sliced': 'dependency_slice' in task,
+                    'tasks': []
+                }
+            group['tasks'].append(task)
+        return list(groups.values())
     
     def _group_methods_by_class(self, methods: List) -> Dict:
         """Group methods par classe."""
         classes = {}
         for method in methods:
             class_name = method.class_name  # ← AJOUTE ICI
+            analyzed = self.slicer.methods(
+                DependencySlicer.class_key({'file': method.file, 'class_name': class_name})
+            ).get(method.method_name, {})
             
             if class_name not in classes:
                 classes[class_name] = {
@@ -114,9 +416,63 @@ class PromptGenerator:
                 'docstring': method.docstring,
                 'lineno': method.lineno,
                 'code': method.code,
+                **{k: analyzed[k] for k in ('params', 'qt_signals') if k in analyzed},  # Relevés AST
                 'metrics': {
                     'code_lines': code_lines,
                     'total_lines': total_lines
                 }
             })
         return classes
+
+
+def _bench_file_summary(num_methods: int = 1000, repeat: int = 20) -> Dict[str, float]:
+    """Compare recopie récursive (ancien _to_dict) et vue lecture seule pour un résumé de N méthodes."""
+    import time
+    from corecopy.file_analyzer import FileAnalyzer
+    from corecopy.prompt_composer import PromptComposer
+    from corecopy.task_manager import Task
+    
+    def legacy_to_dict(obj):
+        if isinstance(obj, dict):
+            return {k: legacy_to_dict(v) for k, v in obj.items()}
+        elif isinstance(obj, list):
+            return [legacy_to_dict(item) for item in obj]
+        elif hasattr(obj, '__dict__'):
+            return legacy_to_dict(obj.__dict__)
+        return obj
+    
+    body = "\n".join(f"        value_{i} = self.compute({i})" for i in range(30))
+    methods = [
+        Task(task_id=f"big.py:Big{i % 10}.method_{i}", file='big.py', class_name=f"Big{i % 10}",
+             method_name=f"method_{i}", lineno=i * 40, code=f"    def method_{i}(self, a, b):\n{body}",
+             docstring=f"Method {i}", signature=f"method_{i}(self, a, b)")
+        for i in range(num_methods)
+    ]
+    generator = PromptGenerator(PromptComposer(), {'project_name': 'bench', 'classes': {}})
+    summary = FileAnalyzer.build_summary('big.py', {'classes': generator._group_methods_by_class(methods)})
+    template = generator.composer.env.get_template('prompts/refactor_file.jinja2')
+    
+    results = {}
+    for name, convert in (('recursive_copy', legacy_to_dict), ('mapping_view', wrap)):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            data = convert(summary)
+        results[f"{name}_convert_ms"] = (time.perf_counter() - start) / repeat * 1000
+        
+        start = time.perf_counter()
+        for _ in range(repeat):
+            template.render(project_name='bench', file_summary=convert(summary))
+        results[f"{name}_convert_render_ms"] = (time.perf_counter() - start) / repeat * 1000
+    
+    return results
+
+
+if __name__ == '__main__':
+    import sys
+    
+    if sys.argv[1:2] == ['bench']:
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+        for key, value in _bench_file_summary(count).items():
+            print(f"{key:32s} {value:8.2f} ms")
+    else:
+        print("Usage: python -m corecopy.prompt_generator bench [num_methods]")
@@ -0,0 +1,129 @@
+"""
+Prompt Packer - Fait tenir les méthodes sélectionnées dans un budget de tokens.
+Dégradation progressive : code complet → signature + docstring → nom seul.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from utils.cache import LRUCache, content_digest
+from utils.tokens import estimate_tokens
+
+
+# Estimations par (id méthode, empreinte du code, niveau), partagées entre prompts
+_ESTIMATE_CACHE = LRUCache(maxsize=4096)
+
+PRIORITY_ORDER = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
+
+LEVEL_FULL = 'full'
+LEVEL_SIGNATURE = 'signature'
+LEVEL_NAME = 'name'
+
+
+class PromptPacker:
+    """Pack les tasks d'un prompt dans un budget de tokens."""
+
+    # Coût fixe d'une section code_snippet.jinja2 (titre, fichier, signature)
+    SECTION_OVERHEAD = 40
+
+    def __init__(self, token_budget: int):
+        self.token_budget = token_budget
+
+    @staticmethod
+    def _signature_code(task: Dict) -> str:
+        """Version réduite : signature + docstring."""
+        docstring = (task.get('docstring') or '').strip()
+        code = f"def {task.get('signature', task.get('method_name', '?') + '(...)')}:\n"
+        if docstring:
+            code += f'    """{docstring}"""\n'
+        code += "    ...  # Corps omis (budget tokens)"
+        return code
+
+    @staticmethod
+    def _name_code(task: Dict) -> str:
+        """Version minimale : nom seul."""
+        return f"# {task.get('class_name', '?')}.{task.get('method_name', '?')}() - code omis (budget tokens)"
+
+    def _variants(self, task: Dict) -> List[Tuple[str, str, int]]:
+        """(niveau, code, tokens) du plus riche au plus pauvre."""
+        variants = []
+        for level, code in (
+            (LEVEL_FULL, task.get('code') or ''),
+            (LEVEL_SIGNATURE, self._signature_code(task)),
+            (LEVEL_NAME, self._name_code(task)),
+        ):
+            variants.append((level, code, self._estimate(task, level, code) + self.SECTION_OVERHEAD))
+        return variants
+
+    @staticmethod
+    def _estimate(task: Dict, level: str, code: str) -> int:
+        """Tokens d'une variante, mis en cache par (id méthode, empreinte du code, niveau)."""
+        key = (
+            f"{task.get('file')}:{task.get('class_name')}.{task.get('method_name')}",
+            content_digest(code),
+            level
+        )
+        tokens = _ESTIMATE_CACHE.get(key)
+        if tokens is None:
+            tokens = estimate_tokens(code)
+            _ESTIMATE_CACHE.put(key, tokens)
+        return tokens
+
+    def _order(self, tasks: List[Dict], variants: List[List[Tuple[str, str, int]]]) -> List[int]:
+        """Indices triés : priorité puis taille croissante (plus de méthodes complètes)."""
+        return sorted(
+            range(len(tasks)),
+            key=lambda i: (
+                PRIORITY_ORDER.get(tasks[i].get('priority'), len(PRIORITY_ORDER)),
+                variants[i][0][2]
+            )
+        )
+
+    def pack(self, tasks: List[Dict]) -> Tuple[List[Dict], Dict]:
+        """
+        Pack les tasks dans le budget.
+
+        Returns:
+            (tasks packées dans l'ordre d'origine, rapport)
+        """
+        variants = [self._variants(task) for task in tasks]
+
+        # Réserve le minimum (nom seul) pour chaque task, puis améliore par priorité
+        levels = [len(v) - 1 for v in variants]
+        used = sum(v[-1][2] for v in variants)
+
+        for i in self._order(tasks, variants):
+            for level_idx, (_, _, cost) in enumerate(variants[i]):
+                extra = cost - variants[i][levels[i]][2]
+                if used + extra <= self.token_budget:
+                    used += extra
+                    levels[i] = level_idx
+                    break
+
+        packed = []
+        degraded = []
+        for task, task_variants, level_idx in zip(tasks, variants, levels):
+            level, code, cost = task_variants[level_idx]
+            packed_task = dict(task)
+            packed_task['code'] = code
+            packed_task['packing'] = level
+            packed.append(packed_task)
+
+            if level != LEVEL_FULL:
+                degraded.append({
+                    'method': f"{task.get('class_name', '?')}.{task.get('method_name', '?')}",
+                    'level': level,
+                    'full_tokens': task_variants[0][2],
+                    'packed_tokens': cost
+                })
+
+        report = {
+            'token_budget': self.token_budget,
+            'estimated_tokens': used,
+            'full_tokens': sum(v[0][2] for v in variants),
+            'num_full': sum(1 for t in packed if t['packing'] == LEVEL_FULL),
+            'num_signature': sum(1 for t in packed if t['packing'] == LEVEL_SIGNATURE),
+            'num_name': sum(1 for t in packed if t['packing'] == LEVEL_NAME),
+            'degraded': degraded,
+            'over_budget': used > self.token_budget
+        }
+        return packed, report
@@ -0,0 +1,144 @@
+"""
+Selection Set - Sélection de tasks en bitmap compact.
+Les tasks sont identifiées par index dense (ordre de TaskManager.tasks).
+"""
+
+import base64
+import hashlib
+import zlib
+from typing import Iterable, Iterator, List
+
+
+class SelectionSet:
+    """
+    Bitmap de sélection sur indices denses.
+    Un int Python sert de bitset : bit i = task i sélectionnée.
+    """
+
+    __slots__ = ('_bits', 'size')
+
+    def __init__(self, size: int = 0, bits: int = 0):
+        self.size = size
+        self._bits = bits & self._mask(size)
+
+    @staticmethod
+    def _mask(size: int) -> int:
+        return (1 << size) - 1
+
+    @classmethod
+    def from_indices(cls, size: int, indices: Iterable[int]) -> 'SelectionSet':
+        """Construit une sélection depuis une liste d'indices."""
+        bits = 0
+        for idx in indices:
+            if 0 <= idx < size:
+                bits |= 1 << idx
+        return cls(size, bits)
+
+    # === Modification ===
+
+    def add(self, idx: int):
+        """Sélectionne l'index idx."""
+        if 0 <= idx < self.size:
+            self._bits |= 1 << idx
+
+    def discard(self, idx: int):
+        """Désélectionne l'index idx (hors univers : sans effet, comme set.discard)."""
+        if 0 <= idx < self.size:
+            self._bits &= ~(1 << idx)
+
+    def set(self, idx: int, selected: bool = True):
+        """Sélectionne/désélectionne idx."""
+        if selected:
+            self.add(idx)
+        else:
+            self.discard(idx)
+
+    def fill(self):
+        """Sélectionne tout."""
+        self._bits = self._mask(self.size)
+
+    def clear(self):
+        """Vide la sélection."""
+        self._bits = 0
+
+    def resize(self, size: int):
+        """Change la taille de l'univers (bits hors univers supprimés)."""
+        self.size = size
+        self._bits &= self._mask(size)
+
+    # === Lecture ===
+
+    def __contains__(self, idx: int) -> bool:
+        return idx >= 0 and bool(self._bits >> idx & 1)
+
+    def __len__(self) -> int:
+        return bin(self._bits).count('1')
+
+    def __bool__(self) -> bool:
+        return self._bits != 0
+
+    def __iter__(self) -> Iterator[int]:
+        """Itère les indices sélectionnés en O(popcount)."""
+        bits = self._bits
+        while bits:
+            low = bits & -bits
+            yield low.bit_length() - 1
+            bits ^= low
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SelectionSet):
+            return NotImplemented
+        return self.size == other.size and self._bits == other._bits
+
+    def __repr__(self) -> str:
+        return f"SelectionSet(size={self.size}, selected={len(self)})"
+
+    def indices(self) -> List[int]:
+        """Liste des indices sélectionnés."""
+        return list(self)
+
+    def copy(self) -> 'SelectionSet':
+        return SelectionSet(self.size, self._bits)
+
+    # === Opérations ensemblistes ===
+
+    def union(self, other: 'SelectionSet') -> 'SelectionSet':
+        size = max(self.size, other.size)
+        return SelectionSet(size, self._bits | other._bits)
+
+    def intersect(self, other: 'SelectionSet') -> 'SelectionSet':
+        size = max(self.size, other.size)
+        return SelectionSet(size, self._bits & other._bits)
+
+    def difference(self, other: 'SelectionSet') -> 'SelectionSet':
+        return SelectionSet(self.size, self._bits & ~other._bits)
+
+    def invert(self) -> 'SelectionSet':
+        return SelectionSet(self.size, ~self._bits & self._mask(self.size))
+
+    __or__ = union
+    __and__ = intersect
+    __sub__ = difference
+    __invert__ = invert
+
+    # === Sérialisation ===
+
+    def to_compressed(self) -> str:
+        """Encode le bitmap en zlib + base64 (pour JSON)."""
+        raw = self._bits.to_bytes((self.size + 7) // 8, 'little')
+        return base64.b64encode(zlib.compress(raw)).decode('ascii')
+
+    @classmethod
+    def from_compressed(cls, size: int, data: str) -> 'SelectionSet':
+        """Décode un bitmap produit par to_compressed()."""
+        raw = zlib.decompress(base64.b64decode(data))
+        return cls(size, int.from_bytes(raw, 'little'))
+
+    @staticmethod
+    def universe_digest(keys: Iterable[str]) -> str:
+        """Empreinte de l'ordre des tasks (valide un bitmap sauvegardé)."""
+        h = hashlib.sha1()
+        for key in keys:
+            h.update(key.encode('utf-8'))
+            h.update(b'\0')
+        return h.hexdigest()
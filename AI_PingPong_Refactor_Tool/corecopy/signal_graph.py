@@ -0,0 +1,357 @@
+"""
+Signal Graph - Graphe statique signaux/slots Qt du projet.
+Construit depuis l'analyse (qt_signals déclarés, .connect(), .emit(), appels self.xxx())
+pour repérer cascades de refresh, fan-out et cycles sans lancer l'application.
+"""
+
+import ast
+import re
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Set, Tuple
+
+
+# Handlers coûteux typiques des "refresh storms"
+REFRESH_PATTERN = re.compile(r'(^|_)(refresh|update|reload|repaint|populate|rebuild|redraw)')
+
+SIGNAL = 'signal'
+METHOD = 'method'
+
+
+class SignalGraph:
+    """
+    Graphe orienté : méthode → signal (emit), signal → méthode/signal (connect),
+    méthode → méthode (appel direct self.xxx(), hors lambda / fonction imbriquée).
+
+    Nœuds : 'Classe.methode' et 'Classe.signal' (signal déclaré) ;
+    signal non déclaré (widget Qt, ex. btn.clicked) : 'Classe:btn.clicked'.
+    """
+
+    def __init__(self, analysis: Dict):
+        self.analysis = analysis
+        self.kinds: Dict[str, str] = {}
+        self.edges: Dict[str, List[str]] = defaultdict(list)
+        self.edge_kinds: Dict[Tuple[str, str], str] = {}
+        self.connect_sites: List[Dict] = []
+        self.emit_sites: List[Dict] = []
+
+        self._class_names: Dict[str, str] = {}  # class_key → nom affiché
+        self._by_name: Dict[str, List[str]] = defaultdict(list)  # nom de classe → class_keys
+        self._instance_types: Dict[str, Dict[str, str]] = {}  # class_key → {attr: classe}
+        self._methods: Dict[str, Set[str]] = {}  # class_key → noms de méthodes
+        self._declarers: Dict[str, List[str]] = defaultdict(list)  # nom signal → class_keys
+        self._method_owners: Dict[str, List[str]] = defaultdict(list)  # nom méthode → class_keys
+
+        self._index()
+        self._build()
+
+    # === Construction ===
+
+    def _index(self):
+        for class_key, class_info in self.analysis.get('classes', {}).items():
+            self._class_names[class_key] = class_info['name']
+            self._by_name[class_info['name']].append(class_key)
+            self._instance_types[class_key] = class_info.get('instance_types', {})
+            self._methods[class_key] = {m['name'] for m in class_info.get('methods', [])}
+            for name in self._methods[class_key]:
+                self._method_owners[name].append(class_key)
+            for signal in class_info.get('qt_signals', []):
+                self._declarers[signal['name']].append(class_key)
+
+    def _node(self, class_key: str, name: str, kind: str) -> str:
+        node = f"{self._class_names[class_key]}.{name}"
+        self.kinds.setdefault(node, kind)
+        return node
+
+    def _add_edge(self, source: str, target: str, kind: str):
+        if (source, target) not in self.edge_kinds:
+            self.edges[source].append(target)
+            self.edge_kinds[(source, target)] = kind
+
+    def _receiver_classes(self, class_key: str, path: str, sender_type: Optional[str] = None) -> List[str]:
+        """Classes du projet possédant `path` : self ('sig'), self.panel (type relevé) ou sender_type."""
+        parts = path.split('.')
+        if len(parts) == 1:
+            return [class_key]
+        if len(parts) == 2:
+            owner_type = sender_type or self._instance_types[class_key].get(parts[0])
+            return self._by_name.get(owner_type, [])
+        return []
+
+    def _resolve_signal(self, class_key: str, path: str, sender_type: Optional[str] = None) -> List[str]:
+        """
+        Signal déclaré par la classe émettrice/réceptrice si son type est connu ;
+        sinon signal externe local à la classe ('Classe:btn.clicked').
+        """
+        name = path.rsplit('.', 1)[-1]
+        owners = [k for k in self._receiver_classes(class_key, path, sender_type) if k in self._declarers.get(name, [])]
+        if not owners and '.' not in path and len(self._declarers.get(name, [])) == 1:
+            owners = self._declarers[name]  # Signal hérité d'une classe du projet
+        if owners:
+            return [self._node(owner, name, SIGNAL) for owner in owners]
+
+        node = f"{self._class_names[class_key]}:{path}"
+        self.kinds.setdefault(node, SIGNAL)
+        return [node]
+
+    def _resolve_method(self, class_key: str, path: str) -> List[str]:
+        """'m' → méthode de la classe ; 'obj.m' → méthode de la classe de obj (ou seule classe définissant m)."""
+        name = path.rsplit('.', 1)[-1]
+        owners = [k for k in self._receiver_classes(class_key, path) if name in self._methods[k]]
+        if not owners and '.' in path and len(self._method_owners.get(name, [])) == 1:
+            owners = self._method_owners[name]
+        return [self._node(owner, name, METHOD) for owner in owners]
+
+    def _slot_targets(self, class_key: str, slot: str) -> List[str]:
+        """Cibles d'un slot : méthode, signal.emit (relais) ou corps d'un lambda."""
+        try:
+            expr = ast.parse(slot, mode='eval').body
+        except SyntaxError:
+            return []
+
+        if isinstance(expr, ast.Lambda):
+            targets = []
+            for node in ast.walk(expr.body):
+                if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+                    path = _strip_self(ast.unparse(node.func))
+                    if node.func.attr == 'emit' and isinstance(node.func.value, ast.Attribute):
+                        targets.extend(self._resolve_signal(class_key, path.rsplit('.', 1)[0]))
+                    elif ast.unparse(node.func).startswith('self.'):
+                        targets.extend(self._resolve_method(class_key, path))
+            return targets
+
+        path = _strip_self(slot)
+        if path.endswith('.emit'):
+            return self._resolve_signal(class_key, path[:-len('.emit')])
+        return self._resolve_method(class_key, path)
+
+    def _build(self):
+        for class_key, class_info in self.analysis.get('classes', {}).items():
+            for method in class_info.get('methods', []):
+                source = self._node(class_key, method['name'], METHOD)
+                usage = method.get('qt_signals', {})
+
+                for path in usage.get('emitted', []):
+                    for signal in self._resolve_signal(class_key, path):
+                        self._add_edge(source, signal, 'emit')
+                        self.emit_sites.append({'method': source, 'signal': signal})
+
+                for connection in usage.get('connected', []):
+                    targets = self._slot_targets(class_key, connection['slot'])
+                    signals = self._resolve_signal(class_key, connection['signal'], connection.get('sender_type'))
+                    for signal in signals:
+                        for target in targets:
+                            self._add_edge(signal, target, 'connect')
+                        self.connect_sites.append({
+                            'signal': signal,
+                            'slot': connection['slot'],
+                            'targets': targets,
+                            'in': source,
+                            'lineno': connection.get('lineno')
+                        })
+
+                # Appels directs seulement : un lambda passé à connect est un slot (arête connect)
+                for name in method.get('def_use', {}).get('calls', []):
+                    if name in self._methods[class_key]:
+                        self._add_edge(source, self._node(class_key, name, METHOD), 'call')
+
+    # === Requêtes ===
+
+    def reachable(self, start: str) -> Dict[str, Optional[str]]:
+        """BFS depuis start : nœud → prédécesseur (pour reconstruire un chemin)."""
+        parents: Dict[str, Optional[str]] = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for target in self.edges.get(node, ()):
+                if target not in parents:
+                    parents[target] = node
+                    queue.append(target)
+        return parents
+
+    @staticmethod
+    def _path(parents: Dict[str, Optional[str]], node: str) -> List[str]:
+        path = []
+        while node is not None:
+            path.append(node)
+            node = parents[node]
+        return path[::-1]
+
+    def cascade(self, start: str) -> Dict:
+        """
+        Ce que déclenche start (méthode ou signal) : handlers atteints,
+        appels vers des méthodes refresh-like et chemin le plus profond.
+        """
+        parents = self.reachable(start)
+        handlers = [n for n in parents if n != start and self.kinds.get(n) == METHOD]
+        refresh_hits = sum(
+            1 for (source, target) in self.edge_kinds
+            if source in parents and REFRESH_PATTERN.search(target.rsplit('.', 1)[-1])
+        )
+        deepest = list(parents)[-1]  # Dernier nœud découvert par le BFS = le plus éloigné
+        return {
+            'start': start,
+            'handlers': len(handlers),
+            'signals': sum(1 for n in parents if n != start and self.kinds.get(n) == SIGNAL),
+            'refresh_hits': refresh_hits,
+            'deepest_path': self._path(parents, deepest)
+        }
+
+    def fan_out(self, minimum: int = 2) -> List[Dict]:
+        """Signaux connectés à au moins `minimum` cibles directes."""
+        result = [
+            {'signal': node, 'targets': list(self.edges.get(node, ()))}
+            for node, kind in self.kinds.items()
+            if kind == SIGNAL and len(self.edges.get(node, ())) >= minimum
+        ]
+        return sorted(result, key=lambda r: len(r['targets']), reverse=True)
+
+    def cycles(self, with_signal_only: bool = True) -> List[List[str]]:
+        """Composantes fortement connexes (Tarjan itératif) formant un cycle."""
+        index: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        components = []
+        counter = 0
+
+        for root in list(self.kinds):
+            if root in index:
+                continue
+            work = [(root, iter(self.edges.get(root, ())))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if child not in index:
+                        index[child] = low[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self.edges.get(child, ()))))
+                        break
+                    if child in on_stack:
+                        low[node] = min(low[node], index[child])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1 or node in self.edges.get(node, ()):
+                            components.append(component[::-1])
+
+        if with_signal_only:
+            components = [c for c in components if any(self.kinds.get(n) == SIGNAL for n in c)]
+        return components
+
+    def report(self, top: int = 10) -> Dict:
+        """Rapport : cascades d'emit les plus larges, fan-out, cycles."""
+        emitted = {}
+        for site in self.emit_sites:
+            emitted.setdefault(site['signal'], []).append(site['method'])
+
+        cascades = []
+        for signal, emitters in emitted.items():
+            entry = self.cascade(signal)
+            entry['emitted_by'] = emitters
+            cascades.append(entry)
+        cascades.sort(key=lambda c: (c['refresh_hits'], c['handlers']), reverse=True)
+
+        return {
+            'signals': sum(1 for kind in self.kinds.values() if kind == SIGNAL),
+            'connections': len(self.connect_sites),
+            'emit_sites': len(self.emit_sites),
+            'emit_cascades': cascades[:top],
+            'fan_out': self.fan_out()[:top],
+            'cycles': self.cycles()
+        }
+
+
+def _strip_self(path: str) -> str:
+    return path[len('self.'):] if path.startswith('self.') else path
+
+
+def _self_test():
+    """Un lambda passé à connect est un slot, pas un appel direct de la méthode qui connecte."""
+    import tempfile
+    from pathlib import Path
+
+    from corecopy.project_analyzer import ProjectAnalyzer
+
+    source = '''
+class Panel(QWidget):
+    edited = Signal()
+
+    def build(self):
+        btn = QPushButton()
+        btn.clicked.connect(lambda: self._edit(1))
+        self._layout()
+
+    def _layout(self):
+        pass
+
+    def _edit(self, index):
+        self.edited.emit()
+'''
+    with tempfile.TemporaryDirectory() as tmp:
+        Path(tmp, 'panel.py').write_text(source, encoding='utf-8')
+        graph = SignalGraph(ProjectAnalyzer(tmp).analyze())
+
+    assert graph.edge_kinds.get(('Panel.build', 'Panel._layout')) == 'call'
+    assert ('Panel.build', 'Panel._edit') not in graph.edge_kinds
+    assert graph.edge_kinds.get(('Panel:btn.clicked', 'Panel._edit')) == 'connect'
+    assert 'Panel._edit' not in graph.reachable('Panel.build')
+    assert 'Panel.edited' in graph.reachable('Panel:btn.clicked')
+    print("✅ Lambda slot modelled as a connect edge")
+
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+
+    from corecopy.project_analyzer import ProjectAnalyzer
+
+    if sys.argv[1:] == ['--self-test']:
+        _self_test()
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description="Static Qt signal/slot graph report")
+    parser.add_argument('project', help="Project directory to analyze")
+    parser.add_argument('--from', dest='start', default=None,
+                        help="Show the cascade of one node (e.g. BacklogTab.set_tasks)")
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    graph = SignalGraph(ProjectAnalyzer(args.project).analyze())
+
+    if args.start:
+        cascade = graph.cascade(args.start)
+        print(f"🔗 {args.start}: {cascade['handlers']} handlers, {cascade['signals']} signals, "
+              f"{cascade['refresh_hits']} refresh-like calls")
+        print("   " + " → ".join(cascade['deepest_path']))
+    else:
+        report = graph.report(args.top)
+        print(f"📡 {report['signals']} signals, {report['connections']} connect sites, "
+              f"{report['emit_sites']} emit sites")
+        print("\n🔥 Emit cascades:")
+        for c in report['emit_cascades']:
+            print(f"  {c['start']} (emitted by {', '.join(c['emitted_by'])}): "
+                  f"{c['handlers']} handlers, {c['refresh_hits']} refresh-like calls")
+            print("    " + " → ".join(c['deepest_path']))
+        print("\n🌿 Fan-out:")
+        for f in report['fan_out']:
+            print(f"  {f['signal']} → {', '.join(f['targets'])}")
+        print(f"\n🔁 Cycles: {len(report['cycles'])}")
+        for cycle in report['cycles']:
+            print("  " + " → ".join(cycle))
@@ -0,0 +1,389 @@
+"""
+Stream Ingest - Tasks extraites d'une réponse IA au fil de l'eau.
+Chaque objet de tasks / critical_issues_prioritized / immediate_quick_wins
+(ou phase de targeted_refactoring_plan) est normalisé dès son accolade fermante.
+Inclut un client HTTP chunked (urllib) et un serveur local de substitution pour les essais.
+"""
+
+import codecs
+import re
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from corecopy.parsing_strategies import ResponseParser
+from utils.json_extractor import decode_fragment
+
+
+# Sections dont chaque élément de tableau est une task
+ITEM_SECTIONS = ('tasks', 'critical_issues_prioritized', 'immediate_quick_wins')
+# Sections dont chaque valeur (objet) est une phase → epic
+PHASE_SECTIONS = ('targeted_refactoring_plan',)
+
+_SPECIAL = re.compile(r'["\\{}\[\]:]')
+_ROOT_START = re.compile(r'\{\s*')
+
+
+class _Frame:
+    """Conteneur ouvert : type, clé dans le parent, offset de début."""
+
+    __slots__ = ('kind', 'key', 'start')
+
+    def __init__(self, kind: str, key: Optional[str], start: int):
+        self.kind = kind
+        self.key = key
+        self.start = start
+
+
+class IncrementalTaskParser:
+    """
+    Consomme une réponse par morceaux (feed) et émet les tasks normalisées
+    par les strategies de ResponseParser dès que chaque objet est complet.
+
+    Chaque morceau est scanné une seule fois, sur place ; seul le texte encore
+    utile (élément de section en cours, clé en attente) est conservé.
+    """
+
+    def __init__(self, parser: Optional[ResponseParser] = None, context: Optional[Dict] = None,
+                 on_tasks: Optional[Callable[[List[Dict]], None]] = None):
+        self.parser = parser or ResponseParser()
+        self.context = context
+        self.on_tasks = on_tasks  # ex. SimplePingPongGUI._add_selected_tasks
+
+        self.tasks: List[Dict] = []
+        self.finished = False  # Objet racine refermé
+
+        # Texte conservé : morceaux (offset absolu, texte) à partir de _parts[0]
+        self._parts: List[Tuple[int, str]] = []
+        self._end = 0
+        # Texte complet pour le repli de close(), abandonné dès la première task émise
+        self._raw: Optional[List[str]] = []
+
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._skip_until = -1
+        self._string_start = 0
+        self._last_string: Optional[Tuple[int, int]] = None  # [début, fin) de la dernière chaîne
+        self._pending_key: Optional[str] = None
+        self._counter = 0
+
+    # === API ===
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """Ajoute un morceau ; retourne les tasks devenues complètes."""
+        if self._raw is not None:
+            self._raw.append(chunk)
+        emitted: List[Dict] = []
+        if chunk and not self.finished:
+            self._parts.append((self._end, chunk))
+            self._end += len(chunk)
+            self._scan(emitted)
+            self._trim()
+        if emitted:
+            self._raw = None
+            self.tasks.extend(emitted)
+            if self.on_tasks:
+                self.on_tasks(emitted)
+        return emitted
+
+    def close(self) -> List[Dict]:
+        """
+        Fin du flux. Si rien n'a pu être émis au fil de l'eau (format non reconnu,
+        tableau racine...), tente un parse complet et tolérant du texte reçu.
+        """
+        text = ''.join(self._raw or ())
+        self._raw = None
+        if self.tasks or not text.strip():
+            return []
+        try:
+            tasks = self.parser.parse(text, self.context)
+        except ValueError:
+            return []
+        self.tasks.extend(tasks)
+        if tasks and self.on_tasks:
+            self.on_tasks(tasks)
+        return tasks
+
+    # === Texte conservé ===
+
+    def _text(self, start: int, end: int) -> str:
+        """Texte [start, end) en offsets absolus (doit être encore conservé)."""
+        pieces = []
+        for offset, part in self._parts:
+            if offset + len(part) <= start:
+                continue
+            if offset >= end:
+                break
+            pieces.append(part[max(0, start - offset):end - offset])
+        return ''.join(pieces)
+
+    def _trim(self):
+        """Abandonne les morceaux entièrement antérieurs au texte encore utile."""
+        keep = self._pos
+        if len(self._stack) <= 2:
+            if self._in_string:
+                keep = min(keep, self._string_start)
+            elif self._last_string:
+                keep = min(keep, self._last_string[0])
+        elif self._stack[1].key in ITEM_SECTIONS + PHASE_SECTIONS:
+            keep = min(keep, self._stack[2].start)
+
+        drop = 0
+        for offset, part in self._parts:
+            if offset + len(part) > keep:
+                break
+            drop += 1
+        del self._parts[:drop]
+
+    # === Machine à états ===
+
+    def _find_root(self) -> bool:
+        """Hors JSON (prose, ```json) : attendre un '{' suivi de '"' ou '}'."""
+        buffer = self._text(self._pos, self._end)
+        offset = self._pos
+        index = 0
+        while True:
+            start = buffer.find('{', index)
+            if start < 0:
+                self._pos = self._end
+                return False
+            after = _ROOT_START.match(buffer, start).end()
+            if after >= len(buffer):
+                self._pos = offset + start  # Décision au prochain morceau
+                return False
+            if buffer[after] in '"}':
+                break
+            index = start + 1
+        self._stack.append(_Frame('{', None, offset + start))
+        self._pos = offset + start + 1
+        return True
+
+    def _scan(self, emitted: List[Dict]):
+        if not self._stack and not self._find_root():
+            return
+
+        # Morceaux pas encore scannés (en général le dernier seulement)
+        first = len(self._parts) - 1
+        while first > 0 and self._parts[first - 1][0] + len(self._parts[first - 1][1]) > self._pos:
+            first -= 1
+
+        for offset, part in self._parts[first:]:
+            for match in _SPECIAL.finditer(part, max(0, self._pos - offset)):
+                pos = offset + match.start()
+                if pos < self._skip_until:
+                    continue
+                char = match.group()
+
+                if self._in_string:
+                    if char == '\\':
+                        self._skip_until = pos + 2
+                    elif char == '"':
+                        self._in_string = False
+                        self._last_string = (self._string_start, pos + 1)
+                    continue
+
+                if char == '"':
+                    self._in_string = True
+                    self._string_start = pos
+                elif char == ':':
+                    # Seules les clés des deux premiers niveaux servent (section, phase)
+                    if len(self._stack) <= 2 and self._stack[-1].kind == '{' and self._last_string:
+                        ok, key, _ = decode_fragment(self._text(*self._last_string))
+                        self._pending_key = key if ok else None
+                elif char in '{[':
+                    key = self._pending_key if self._stack[-1].kind == '{' else None
+                    self._stack.append(_Frame(char, key, pos))
+                    self._pending_key = None
+                else:
+                    frame = self._stack.pop()
+                    if not self._stack:
+                        self.finished = True
+                        self._pos = pos + 1
+                        return
+                    if char == '}' and len(self._stack) == 2:
+                        emitted.extend(self._complete_object(frame, self._text(frame.start, pos + 1)))
+
+        self._pos = self._end
+
+    def _complete_object(self, frame: _Frame, text: str) -> List[Dict]:
+        """Objet refermé : task si c'est un élément de section au niveau racine."""
+        if len(self._stack) != 2:
+            return []
+        section = self._stack[1]
+
+        if section.kind == '[' and section.key in ITEM_SECTIONS:
+            ok, item, _ = decode_fragment(text)
+            if not ok:
+                return []
+            self._counter += 1
+            probe = {section.key: [item]}
+        elif section.kind == '{' and section.key in PHASE_SECTIONS and frame.key:
+            ok, phase_data, _ = decode_fragment(text)
+            if not ok:
+                return []
+            item = (frame.key, phase_data)
+            probe = {section.key: {frame.key: phase_data}}
+        else:
+            return []
+
+        strategy = self.parser.find_strategy(probe)
+        if not strategy:
+            return []
+        counter = self._counter if section.kind == '[' else 0
+        return strategy.parse_item(section.key, item, counter, self.context)
+
+
+# === Transport HTTP chunked ===
+
+def iter_http_chunks(url: str, chunk_size: int = 4096, timeout: float = 30.0) -> Iterator[str]:
+    """Morceaux texte d'une réponse HTTP, au rythme de leur arrivée (UTF-8 incrémental)."""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        while True:
+            data = response.read1(chunk_size)
+            if not data:
+                break
+            text = decoder.decode(data)
+            if text:
+                yield text
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+def ingest_chunks(chunks: Iterable[str], parser: Optional[ResponseParser] = None,
+                  context: Optional[Dict] = None,
+                  on_tasks: Optional[Callable[[List[Dict]], None]] = None) -> List[Dict]:
+    """Consomme un flux de morceaux ; retourne toutes les tasks émises."""
+    incremental = IncrementalTaskParser(parser, context, on_tasks)
+    for chunk in chunks:
+        incremental.feed(chunk)
+    incremental.close()
+    return incremental.tasks
+
+
+class ChunkedResponseServer:
+    """
+    Serveur HTTP local de substitution : sert `text` en Transfer-Encoding chunked,
+    `chunk_size` octets toutes les `delay` secondes.
+
+        with ChunkedResponseServer(text) as server:
+            ingest_chunks(iter_http_chunks(server.url))
+    """
+
+    def __init__(self, text: str, chunk_size: int = 256, delay: float = 0.0):
+        payload = text.encode('utf-8')
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; charset=utf-8')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                for i in range(0, len(payload), chunk_size):
+                    part = payload[i:i + chunk_size]
+                    self.wfile.write(f"{len(part):X}\r\n".encode('ascii') + part + b"\r\n")
+                    self.wfile.flush()
+                    if delay:
+                        time.sleep(delay)
+                self.wfile.write(b"0\r\n\r\n")
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/response"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self) -> 'ChunkedResponseServer':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _self_test():
+    """Mêmes tasks que le parse complet ; ~2 Mo en morceaux de 64 o en temps linéaire."""
+    import json
+
+    items = [{'priority': 'P1', 'issue': f"Issue {i}", 'description': 'x' * 200 + ' "q" \\ {}[]:', 'effort': '1h'}
+             for i in range(8000)]
+    text = "Intro {exemple}\n```json\n" + json.dumps({
+        'critical_issues_prioritized': items,
+        'immediate_quick_wins': [{'action': "Rename helpers"}],
+        'targeted_refactoring_plan': {'phase_1': {'goal': "Extract panels", 'tasks': ["a"]}}
+    }) + "\n```\n"
+    assert len(text) > 2_000_000
+
+    start = time.perf_counter()
+    streamed = ingest_chunks(text[i:i + 64] for i in range(0, len(text), 64))
+    elapsed = time.perf_counter() - start
+
+    batch = ResponseParser().parse(text)
+    strip = lambda tasks: [{k: v for k, v in t.items() if k != 'created_at'} for t in tasks]
+    assert strip(streamed) == strip(batch), "streamed tasks differ from full parse"
+    assert elapsed < 3.0, f"{len(text)} bytes in 64-byte chunks took {elapsed:.2f} s"
+
+    truncated = text[:len(text) // 2]
+    assert [t['id'] for t in ingest_chunks([truncated])] == [t['id'] for t in ResponseParser().parse(truncated)]
+    print(f"✅ {len(streamed)} tasks streamed from {len(text) / 1e6:.1f} MB in {elapsed:.2f} s")
+
+
+if __name__ == '__main__':
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Stream tasks out of a chunked AI response")
+    parser.add_argument('source', nargs='?', help="URL, or a saved response file served locally")
+    parser.add_argument('--chunk-size', type=int, default=64)
+    parser.add_argument('--delay', type=float, default=0.01, help="Delay between chunks (local server)")
+    parser.add_argument('-f', '--analyzed-file', default='unknown.py')
+    parser.add_argument('--self-test', action='store_true', help="Check against a full parse and time 2 MB")
+    args = parser.parse_args()
+
+    if args.self_test:
+        _self_test()
+        raise SystemExit(0)
+
+    if args.source and args.source.startswith(('http://', 'https://')):
+        url, server = args.source, None
+    else:
+        if args.source:
+            with open(args.source, 'r', encoding='utf-8') as f:
+                text = f.read()
+        else:
+            text = "Voici l'analyse :\n```json\n" + json.dumps({
+                'critical_issues_prioritized': [
+                    {'priority': 'P0', 'issue': f"Issue {i}", 'description': "…", 'effort': '1h'}
+                    for i in range(1, 4)
+                ],
+                'immediate_quick_wins': [{'action': "Rename helpers", 'priority': 'P2'}],
+                'targeted_refactoring_plan': {'phase_1': {'goal': "Extract panels", 'tasks': ["a", "b"]}}
+            }, indent=2, ensure_ascii=False) + "\n```\n"
+        server = ChunkedResponseServer(text, args.chunk_size, args.delay).__enter__()
+        url = server.url
+
+    start = time.perf_counter()
+
+    def show(tasks):
+        for task in tasks:
+            print(f"[{(time.perf_counter() - start) * 1000:7.1f} ms] {task['id']}: {task['title']}")
+
+    try:
+        all_tasks = ingest_chunks(iter_http_chunks(url, args.chunk_size),
+                                  context={'analyzed_file': args.analyzed_file}, on_tasks=show)
+    finally:
+        if server:
+            server.__exit__(None, None, None)
+
+    batch = ResponseParser().parse(text) if server else None
+    print(f"✅ {len(all_tasks)} tasks streamed"
+          + (f" (full parse: {len(batch)}, same ids: {[t['id'] for t in batch] == [t['id'] for t in all_tasks]})"
+             if batch is not None else ""))
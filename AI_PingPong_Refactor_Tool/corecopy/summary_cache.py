@@ -0,0 +1,86 @@
+"""
+Summary Cache - Sommaires FileAnalyzer mis en cache par fichier.
+Clé = (chemin, hash du contenu, version du format) : mémoire (LRU) + disque (JSON).
+Un sommaire n'est reconstruit que si le fichier a changé.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from utils.cache import LRUCache
+
+
+# À incrémenter quand la structure retournée par FileAnalyzer.build_summary change
+SUMMARY_FORMAT_VERSION = 2
+
+
+def file_content_hash(source: str) -> str:
+    """SHA1 du contenu source (même valeur que files_data[...]['content_hash'])."""
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()
+
+
+class SummaryCache:
+    """Cache deux niveaux des sommaires de fichiers, partageable entre threads/process."""
+
+    CACHE_DIR = Path('data/summary_cache')
+
+    def __init__(self, cache_dir: Optional[Path] = None, maxsize: int = 16):
+        self.cache_dir = Path(cache_dir) if cache_dir else self.CACHE_DIR
+        self.memory = LRUCache(maxsize=maxsize)
+        self.disk_hits = 0
+
+    @staticmethod
+    def key(file_path: str, content_hash: str) -> tuple:
+        return (file_path, content_hash, SUMMARY_FORMAT_VERSION)
+
+    def _disk_path(self, file_path: str) -> Path:
+        """Un fichier JSON par chemin source (écrasé quand le contenu change)."""
+        name = hashlib.sha1(file_path.replace('\\', '/').encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{name}.json"
+
+    def get(self, file_path: str, content_hash: str) -> Optional[Dict]:
+        key = self.key(file_path, content_hash)
+        summary = self.memory.get(key)
+        if summary is not None:
+            return summary
+
+        try:
+            with open(self._disk_path(file_path), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if (entry.get('content_hash'), entry.get('version')) != (content_hash, SUMMARY_FORMAT_VERSION):
+            return None  # Fichier modifié ou format obsolète
+
+        self.disk_hits += 1
+        self.memory.put(key, entry['summary'])
+        return entry['summary']
+
+    def put(self, file_path: str, content_hash: str, summary: Dict):
+        self.memory.put(self.key(file_path, content_hash), summary)
+
+        entry = {
+            'file_path': file_path,
+            'content_hash': content_hash,
+            'version': SUMMARY_FORMAT_VERSION,
+            'summary': summary
+        }
+        path = self._disk_path(file_path)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)  # Écriture atomique (workers concurrents)
+        except OSError as e:
+            print(f"⚠️ Summary cache write failed for {file_path}: {e}")
+
+    def clear(self):
+        """Vide la mémoire et supprime les fichiers du cache disque."""
+        self.memory.clear()
+        for path in self.cache_dir.glob('*.json'):
+            path.unlink(missing_ok=True)
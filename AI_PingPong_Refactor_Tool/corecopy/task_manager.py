@@ -7,6 +7,8 @@ from typing import List, Dict, Optional
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
+from corecopy.selection_set import SelectionSet
+
 
 @dataclass
 class Task:
@@ -19,7 +21,7 @@ class Task:
     code: str
     docstring: str
     signature: str
-    is_selected: bool = False
+    is_selected: bool = False  # Obsolète : la sélection vit dans TaskManager.selection
     lines_count: int = 0
     
     def to_dict(self) -> Dict:
@@ -35,6 +37,12 @@ class TaskManager:
     
     def __init__(self):
         self.tasks: Dict[str, Task] = {}
+        
+        # Index dense task_id -> position (bitmap de sélection)
+        self._task_order: List[str] = []
+        self._task_index: Dict[str, int] = {}
+        self.selection = SelectionSet()
+        
         self.selections_dir = Path('data/selections')
         self.selections_dir.mkdir(parents=True, exist_ok=True)
     
@@ -61,6 +69,18 @@ class TaskManager:
                     lines_count=0
                 )
                 self.tasks[task_id] = task
+        
+        self._rebuild_index()
+    
+    def _rebuild_index(self):
+        """Reconstruit l'index dense et vide la sélection."""
+        self._task_order = list(self.tasks.keys())
+        self._task_index = {task_id: idx for idx, task_id in enumerate(self._task_order)}
+        self.selection = SelectionSet(len(self._task_order))
+    
+    def index_of(self, task_id: str) -> Optional[int]:
+        """Index dense d'une task (None si inconnue)."""
+        return self._task_index.get(task_id)
     
     def get_task(self, task_id: str) -> Optional[Task]:
         """Récupère une task par ID."""
@@ -68,22 +88,30 @@ class TaskManager:
     
     def select_task(self, task_id: str, selected: bool = True):
         """Sélectionne/désélectionne une task."""
-        if task_id in self.tasks:
-            self.tasks[task_id].is_selected = selected
+        idx = self._task_index.get(task_id)
+        if idx is not None:
+            self.selection.set(idx, selected)
+    
+    def is_selected(self, task_id: str) -> bool:
+        """Vérifie si une task est sélectionnée."""
+        idx = self._task_index.get(task_id)
+        return idx is not None and idx in self.selection
     
     def select_all(self):
         """Sélectionne toutes les tasks."""
-        for task in self.tasks.values():
-            task.is_selected = True
+        self.selection.fill()
     
     def clear_selection(self):
         """Désélectionne toutes les tasks."""
-        for task in self.tasks.values():
-            task.is_selected = False
+        self.selection.clear()
+    
+    def invert_selection(self):
+        """Inverse la sélection courante."""
+        self.selection = self.selection.invert()
     
     def get_selected_tasks(self) -> List[Task]:
-        """Retourne tasks sélectionnées."""
-        return [task for task in self.tasks.values() if task.is_selected]
+        """Retourne tasks sélectionnées (O(nb sélectionnées))."""
+        return [self.tasks[self._task_order[idx]] for idx in self.selection]
     
     def add_tasks(self, tasks: list, source_file: str = 'unknown.py') -> int:
         """Ajoute multiple tasks avec normalisation."""
@@ -174,13 +202,19 @@ class TaskManager:
         
         return filtered
     
-    def save_selection(self, name: str) -> str:
-        """Sauvegarde sélection courante."""
-        selected = self.get_selected_tasks()
+    def save_selection(self, name: str, selection: Optional[SelectionSet] = None) -> str:
+        """Sauvegarde sélection courante (bitmap compressé, sans le code)."""
+        from datetime import datetime
+        
+        selection = selection if selection is not None else self.selection
         selection_data = {
             'name': name,
-            'timestamp': str(Path.cwd()),
-            'tasks': [task.to_dict() for task in selected]
+            'timestamp': datetime.now().isoformat(),
+            'format': 'bitmap',
+            'size': selection.size,
+            'count': len(selection),
+            'universe': SelectionSet.universe_digest(self._task_order),
+            'bitmap': selection.to_compressed()
         }
         
         filepath = self.selections_dir / f"{name}.json"
@@ -189,25 +223,38 @@ class TaskManager:
         
         return str(filepath)
     
-    def load_selection(self, name: str):
-        """Charge une sélection sauvegardée."""
+    def get_saved_selection(self, name: str) -> Optional[SelectionSet]:
+        """Charge une sélection sauvegardée sans l'appliquer."""
         filepath = self.selections_dir / f"{name}.json"
         
         if not filepath.exists():
-            return False
+            return None
         
         with open(filepath, 'r', encoding='utf-8') as f:
             selection_data = json.load(f)
         
-        # Clear current selection
-        self.clear_selection()
+        # Ancien format : copies complètes Task.to_dict()
+        if selection_data.get('format') != 'bitmap':
+            return SelectionSet.from_indices(
+                len(self._task_order),
+                (self._task_index[t['task_id']] for t in selection_data.get('tasks', [])
+                 if t.get('task_id') in self._task_index)
+            )
+        
+        if selection_data.get('universe') != SelectionSet.universe_digest(self._task_order):
+            print(f"⚠️ Selection '{name}' was saved for another analysis, ignored")
+            return None
         
-        # Restore selection
-        for task_data in selection_data.get('tasks', []):
-            task_id = task_data['task_id']
-            if task_id in self.tasks:
-                self.tasks[task_id].is_selected = True
+        return SelectionSet.from_compressed(selection_data['size'], selection_data['bitmap'])
+    
+    def load_selection(self, name: str):
+        """Charge une sélection sauvegardée."""
+        selection = self.get_saved_selection(name)
+        
+        if selection is None:
+            return False
         
+        self.selection = selection
         return True
     
     def list_saved_selections(self) -> List[str]:
@@ -219,7 +266,7 @@ class TaskManager:
         selected = self.get_selected_tasks()
         return {
             'total_tasks': len(self.tasks),
-            'selected_tasks': len(selected),
+            'selected_tasks': len(self.selection),
             'total_files': len(set(t.file for t in self.tasks.values())),
             'selected_files': len(set(t.file for t in selected))
         }
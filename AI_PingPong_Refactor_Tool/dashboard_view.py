@@ -124,7 +124,9 @@ class DashboardView(QWidget):
             }
         """)
         
-        layout = QHBoxLayout(panel)
+        outer = QVBoxLayout(panel)
+        layout = QHBoxLayout()
+        outer.addLayout(layout)
         
         # Stats
         self.lbl_high = QLabel("🔴 High: 0")
@@ -144,8 +146,29 @@ class DashboardView(QWidget):
         layout.addWidget(self.lbl_progress)
         layout.addWidget(self.lbl_done)
         
+        # Métriques projet (ProjectMetrics, vide sans numpy)
+        self.lbl_project = QLabel("")
+        self.lbl_project.setWordWrap(True)
+        outer.addWidget(self.lbl_project)
+        
         return panel
     
+    def set_project_metrics(self, summary):
+        """Affiche ProjectMetrics.summary() (None = masqué)."""
+        if not summary:
+            self.lbl_project.setText("")
+            return
+        
+        pct = summary['percentiles']
+        dist = summary['complexity_distribution']
+        text = (f"📊 {summary['methods']} methods · length p50 {pct['p50']} / p90 {pct['p90']} / p99 {pct['p99']} · "
+                f"🔴 {dist['critical']} critical, 🟠 {dist['high']} high · "
+                f"📝 {summary['undocumented_percentage']}% undocumented")
+        if summary['top_outliers']:
+            worst = summary['top_outliers'][0]
+            text += f" · longest: {worst['method']} ({worst['code_lines']} lines)"
+        self.lbl_project.setText(text)
+    
     def set_tasks(self, tasks):
         """Met à jour dashboard avec tasks."""
         self.tasks = tasks
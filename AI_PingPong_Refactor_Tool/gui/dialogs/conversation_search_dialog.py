@@ -0,0 +1,81 @@
+"""
+Conversation Search Dialog - Recherche plein texte dans l'historique ping-pong.
+"""
+
+import time
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+    QLineEdit, QPushButton, QTreeWidget, QTreeWidgetItem
+)
+from PySide6.QtCore import Qt, Signal
+
+
+class ConversationSearchDialog(QDialog):
+    """Dialog de recherche BM25 sur les cycles de toutes les conversations."""
+
+    cycle_opened = Signal(str, int)  # (conversation_id, cycle_number)
+
+    def __init__(self, parent, conversation_manager):
+        super().__init__(parent)
+        self.conversation = conversation_manager
+        self.setWindowTitle("🔎 Search Conversation History")
+        self.setMinimumSize(900, 500)
+        self._setup_ui()
+
+    def _setup_ui(self):
+        """Setup UI."""
+        layout = QVBoxLayout(self)
+
+        # Query
+        query_layout = QHBoxLayout()
+        self.input_query = QLineEdit()
+        self.input_query.setPlaceholderText("Ex: _apply_filters refresh storm...")
+        self.input_query.returnPressed.connect(self._on_search)
+        query_layout.addWidget(self.input_query, 1)
+
+        btn_search = QPushButton("🔎 Search")
+        btn_search.clicked.connect(self._on_search)
+        query_layout.addWidget(btn_search)
+        layout.addLayout(query_layout)
+
+        # Results
+        self.results_tree = QTreeWidget()
+        self.results_tree.setHeaderLabels(["Conversation", "Cycle", "Score", "Snippet"])
+        self.results_tree.setColumnWidth(0, 220)
+        self.results_tree.setColumnWidth(1, 50)
+        self.results_tree.setColumnWidth(2, 60)
+        self.results_tree.itemDoubleClicked.connect(self._on_result_double_clicked)
+        layout.addWidget(self.results_tree, 1)
+
+        self.lbl_status = QLabel("")
+        self.lbl_status.setStyleSheet("color: #888;")
+        layout.addWidget(self.lbl_status)
+
+    def _on_search(self):
+        """Lance la recherche."""
+        query = self.input_query.text().strip()
+        self.results_tree.clear()
+        if not query:
+            return
+
+        start = time.perf_counter()
+        results = self.conversation.search_history(query, limit=50)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        for hit in results:
+            item = QTreeWidgetItem(self.results_tree, [
+                hit['conversation_id'],
+                str(hit['cycle_number']),
+                f"{hit['score']:.2f}",
+                hit['snippet']
+            ])
+            item.setToolTip(3, hit['snippet'])
+            item.setData(0, Qt.UserRole, (hit['conversation_id'], hit['cycle_number']))
+
+        self.lbl_status.setText(f"{len(results)} result(s) in {elapsed_ms:.1f} ms")
+
+    def _on_result_double_clicked(self, item, column):
+        """Émet le cycle choisi."""
+        conversation_id, cycle_number = item.data(0, Qt.UserRole)
+        self.cycle_opened.emit(conversation_id, cycle_number)
@@ -4,13 +4,14 @@ Extrait de main.py lignes 290-319, 1162-1239.
 """
 
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QTreeWidget, QTreeWidgetItem,
-    QTreeWidgetItemIterator
+    QWidget, QVBoxLayout, QLabel, QTreeWidget, QTreeWidgetItem
 )
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QColor
 from typing import List
 
+from corecopy.selection_set import SelectionSet
+
 
 class MethodTreePanel(QWidget):
     """
@@ -24,6 +25,7 @@ class MethodTreePanel(QWidget):
     def __init__(self):
         super().__init__()
         self._all_tasks = []
+        self.selection = SelectionSet()
         self._setup_ui()
     
     def _setup_ui(self):
@@ -53,6 +55,9 @@ class MethodTreePanel(QWidget):
         """Populate tree (COPIÉ de _populate_task_tree L1162-1239)."""
         self.task_tree.clear()
         self._all_tasks = list(all_tasks)
+        self.selection = SelectionSet(len(self._all_tasks))
+        for task in self._all_tasks:
+            task.selected = False
         
         files_dict = {}
         for idx, task in enumerate(self._all_tasks):
@@ -112,30 +117,23 @@ class MethodTreePanel(QWidget):
         self.task_tree.expandAll()
     
     def _on_item_changed(self, item, column):
-        """Handler when checkbox changed."""
-        iterator = QTreeWidgetItemIterator(self.task_tree, QTreeWidgetItemIterator.Checked)
-        count = 0
-        while iterator.value():
-            item = iterator.value()
-            if item.data(0, Qt.UserRole) is not None:
-                count += 1
-            iterator += 1
-        
-        self.lbl_selection.setText(f"{count} method(s) selected")
+        """Handler when checkbox changed (mise à jour incrémentale du bitmap)."""
+        task_id = item.data(0, Qt.UserRole)
+        if task_id is None or task_id >= len(self._all_tasks):
+            # File/Class : Qt propage l'état aux méthodes enfants (itemChanged par enfant)
+            return
         
-        for task in self._all_tasks:
-            task.selected = False
+        checked = item.checkState(0) == Qt.Checked
+        if checked == (task_id in self.selection):
+            return
         
-        iterator = QTreeWidgetItemIterator(self.task_tree, QTreeWidgetItemIterator.Checked)
-        while iterator.value():
-            item = iterator.value()
-            task_id = item.data(0, Qt.UserRole)
-            if task_id is not None and task_id < len(self._all_tasks):
-                self._all_tasks[task_id].selected = True
-            iterator += 1
+        self.selection.set(task_id, checked)
+        self._all_tasks[task_id].selected = checked
         
+        count = len(self.selection)
+        self.lbl_selection.setText(f"{count} method(s) selected")
         self.selection_changed.emit(count)
     
     def get_selected_tasks(self) -> List:
-        """Retourne les tasks sélectionnées."""
-        return [task for task in self._all_tasks if task.selected]
+        """Retourne les tasks sélectionnées (O(nb sélectionnées))."""
+        return [self._all_tasks[idx] for idx in self.selection]
@@ -10,6 +10,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Signal
 from PySide6.QtGui import QFont
 from PySide6.QtWidgets import QApplication
+from pathlib import Path
+from typing import Dict, Optional
 
 
 class PromptPanel(QWidget):
@@ -25,6 +27,7 @@ class PromptPanel(QWidget):
     
     def __init__(self):
         super().__init__()
+        self._prompt_file: Optional[Path] = None  # Prompt streamé (trop gros pour le QTextEdit)
         self._setup_ui()
     
     def _setup_ui(self):
@@ -52,6 +55,16 @@ class PromptPanel(QWidget):
         self.check_code_mode = QCheckBox("🔥 Code")
         controls.addWidget(self.check_code_mode)
         
+        self.check_minify = QCheckBox("✂️ Minify")
+        self.check_minify.setToolTip("Retire commentaires, lignes vides et print() de debug du code")
+        controls.addWidget(self.check_minify)
+        
+        self.check_delta = QCheckBox("♻️ Delta")
+        self.check_delta.setChecked(True)
+        self.check_delta.setToolTip("Cycle de suivi : méthodes déjà envoyées référencées par id ou en diff "
+                                    "(décocher pour renvoyer le contexte complet)")
+        controls.addWidget(self.check_delta)
+        
         prompt_layout.addLayout(controls)
         
         # Description
@@ -104,8 +117,39 @@ class PromptPanel(QWidget):
     
     def set_prompt(self, prompt_text: str):
         """Affiche prompt généré."""
+        self._prompt_file = None
         self.text_prompt.setPlainText(prompt_text)
     
+    def set_prompt_file(self, stats: Dict):
+        """
+        Affiche un prompt streamé sur disque (cf. PromptComposer.render_to_file).
+        Gros prompt : résumé taille/tokens + aperçu seulement, le QTextEdit
+        ne reçoit jamais le texte complet.
+        """
+        if not stats['truncated']:
+            self.set_prompt(stats['preview'])
+            return
+        
+        self._prompt_file = Path(stats['path'])
+        header = (
+            f"📄 Prompt streamed to: {stats['path']}\n"
+            f"📏 Size: {stats['size_bytes'] / 1024:.0f} KB | ~{stats['tokens']} tokens\n"
+            f"👁️ Preview (first {len(stats['preview']) // 1024} KB) - 📋 Copy copies the full prompt\n"
+            f"{'═' * 60}\n\n"
+        )
+        self.text_prompt.setPlainText(header + stats['preview'] + "\n\n[...]")
+    
+    def set_template_info(self, info: Dict):
+        """Affiche les variables attendues par le template courant (tooltip du combo)."""
+        if not info.get('exists'):
+            self.combo_template.setToolTip("⚠️ Template introuvable")
+            return
+        self.combo_template.setToolTip(
+            f"Requises : {', '.join(info['required']) or '-'}\n"
+            f"Optionnelles : {', '.join(info['optional']) or '-'}\n"
+            f"Includes : {', '.join(info['includes']) or '-'}"
+        )
+    
     def get_response(self) -> str:
         """Retourne response text."""
         return self.text_response.toPlainText()
@@ -124,7 +168,10 @@ class PromptPanel(QWidget):
     
     def _on_copy_clicked(self):
         """Handler bouton Copy (COPIÉ de copy_prompt L1694-1699)."""
-        prompt = self.text_prompt.toPlainText()
+        if self._prompt_file is not None and self._prompt_file.exists():
+            prompt = self._prompt_file.read_text(encoding='utf-8')
+        else:
+            prompt = self.text_prompt.toPlainText()
         if prompt:
             QApplication.clipboard().setText(prompt)
             self.prompt_copied.emit()
@@ -28,6 +28,7 @@ from corecopy.project_analyzer import ProjectAnalyzer
 from corecopy.task_manager import TaskManager
 from corecopy.prompt_composer import PromptComposer
 from corecopy.conversation_manager import ConversationManager
+from corecopy.project_metrics import ProjectMetrics
 
 
 from corecopy.parsing_strategies import ResponseParser
@@ -50,6 +51,7 @@ from gui.panels.backlog_panel import BacklogTab
 from gui.dialogs.task_edit_dialog import TaskEditDialog
 from gui.dialogs.task_selection_dialog import TaskSelectionDialog
 from gui.dialogs.refactoring_dialog import RefactoringDialog
+from gui.dialogs.conversation_search_dialog import ConversationSearchDialog
 
 class SimplePingPongGUI(QMainWindow):
     """GUI avec sélection manuelle des tasks."""
@@ -75,6 +77,10 @@ class SimplePingPongGUI(QMainWindow):
         
         # === NEW: Response Parser ===
         self.response_parser = ResponseParser()
+        
+        # Dernier prompt normal + méthodes envoyées : enregistrés en cycle au parse de la réponse
+        self._last_prompt: Optional[str] = None
+        self._last_sent_methods: Dict[str, str] = {}
 
         # === Liste de task === 
         self.tasks = []
@@ -132,8 +138,30 @@ class SimplePingPongGUI(QMainWindow):
         self.btn_analyze.clicked.connect(self.analyze_project)
         toolbar.addWidget(self.btn_analyze)
         
+        btn_search_history = QPushButton("🔎 Search History")
+        btn_search_history.clicked.connect(self._open_conversation_search)
+        toolbar.addWidget(btn_search_history)
+        
         toolbar.addStretch()
         return toolbar
+    
+    def _open_conversation_search(self):
+        """Ouvre la recherche plein texte dans l'historique."""
+        dialog = ConversationSearchDialog(self, self.conversation)
+        dialog.cycle_opened.connect(self._on_search_cycle_opened)
+        dialog.exec()
+    
+    def _on_search_cycle_opened(self, conversation_id, cycle_number):
+        """Affiche le cycle trouvé dans le panel prompt (sans changer la conversation courante)."""
+        history = ConversationManager()
+        if not history.load_conversation(conversation_id):
+            return
+        
+        cycle = history.get_cycle(cycle_number)
+        if cycle:
+            self.prompt_panel.set_prompt(cycle.prompt)
+            self.prompt_panel.text_response.setPlainText(json.dumps(cycle.response, indent=2, ensure_ascii=False))
+            self.statusBar().showMessage(f"📜 {conversation_id} - cycle {cycle_number}")
 
     def _create_task_selector_tab(self):
         """Crée tab sélection tasks."""
@@ -269,6 +297,10 @@ class SimplePingPongGUI(QMainWindow):
             lambda: self.statusBar().showMessage("✅ Prompt copied!")
         )
         
+        # Variables attendues par le template (introspection AST, cache par mtime)
+        self.prompt_panel.combo_template.currentTextChanged.connect(self._on_template_changed)
+        self._on_template_changed(self.prompt_panel.combo_template.currentText())
+        
         return self.prompt_panel
     
     ###### METHODE #PANEL RIGHT#
@@ -287,9 +319,33 @@ class SimplePingPongGUI(QMainWindow):
             
             if tasks:
                 self._add_selected_tasks(tasks)
-                self.statusBar().showMessage(f"✅ Parsed {len(tasks)} tasks!")
+                extraction = self.response_parser.last_extraction
+                note = " (truncated response: complete tasks only)" if extraction and extraction.truncated else ""
+                repairs = [r for r in extraction.repairs if r != 'truncated'] if extraction else []
+                if repairs:
+                    note += f" 🩹 JSON repaired: {', '.join(repairs)}"
+                self.statusBar().showMessage(f"✅ Parsed {len(tasks)} tasks!{note}")
+            
+            self._record_cycle(response_text)
         except Exception as e:
             QMessageBox.critical(self, "Parse Error", str(e))   
+    
+    def _on_template_changed(self, template: str):
+        """Met à jour les variables attendues affichées par le panel."""
+        self.prompt_panel.set_template_info(self.composer.get_template_info(f'prompts/{template}.jinja2'))
+    
+    def _record_cycle(self, response_text: str):
+        """Enregistre prompt + réponse comme cycle (base des prompts de suivi)."""
+        if self._last_prompt is None or not self.conversation.current_conversation_id:
+            return
+        # JSON déjà extrait (et réparé) par ResponseParser.parse
+        extraction = self.response_parser.last_extraction
+        response = extraction.value if extraction else {'raw_response': response_text}
+        if not isinstance(response, dict):
+            response = {'raw_response': response_text}
+        
+        self.conversation.add_cycle(self._last_prompt, response, context_methods=self._last_sent_methods)
+        self._last_prompt = None
 
     def _add_decorators_to_selected(self):
         """Ouvre dialog pour ajouter décorateurs aux méthodes cochées."""
@@ -298,7 +354,7 @@ class SimplePingPongGUI(QMainWindow):
             QMessageBox.warning(self, "No Analysis", "Please analyze project first!")
             return
         
-        selected_tasks = [task for task in self._all_tasks if task.selected]
+        selected_tasks = self.method_tree_panel.get_selected_tasks()
         
         if not selected_tasks:
             QMessageBox.warning(self, "No Selection", "Please check at least one method!")
@@ -634,11 +690,24 @@ class SimplePingPongGUI(QMainWindow):
                 self.btn_generate.setEnabled(True)  # Fallback
             
             self.conversation.start_conversation(self.analysis['project_name'])
-            self.statusBar().showMessage("✅ Analysis complete")
+            self.statusBar().showMessage("✅ Analysis complete" + self._project_metrics_status())
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Analysis failed: {e}")
 
+    def _project_metrics_status(self) -> str:
+        """Calcule ProjectMetrics (si numpy) → dashboard + résumé pour la status bar."""
+        if not ProjectMetrics.available():
+            return ""
+        
+        summary = ProjectMetrics(self.analysis).summary()
+        if hasattr(self, 'dashboard'):
+            self.dashboard.set_project_metrics(summary)
+        
+        pct = summary['percentiles']
+        return (f" | {summary['methods']} methods, length p50 {pct['p50']} / p90 {pct['p90']}, "
+                f"{summary['complexity_distribution']['critical']} critical")
+
     def _populate_task_tree(self):
         """Remplit TreeWidget (DÉLÉGUÉ AU PANEL)."""
         # Store all tasks for selection tracking
@@ -724,49 +793,6 @@ class SimplePingPongGUI(QMainWindow):
     
 
     
-    def on_task_selection_changed(self, item, column):
-        """Update inspector when method checked/clicked."""
-        # Count selected
-        if not hasattr(self, '_all_tasks'):
-            return
-        
-        # Get all checked items
-        iterator = QTreeWidgetItemIterator(self.task_tree, QTreeWidgetItemIterator.Checked)
-        count = 0
-        last_checked_item = None
-        
-        while iterator.value():
-            item = iterator.value()
-            if item.data(0, Qt.UserRole) is not None:
-                count += 1
-                last_checked_item = item
-            iterator += 1
-        
-        self.lbl_selection.setText(f"{count} method(s) selected")
-        
-        # Update selection state
-        for task in self._all_tasks:
-            task.selected = False
-        
-        iterator = QTreeWidgetItemIterator(self.task_tree, QTreeWidgetItemIterator.Checked)
-        while iterator.value():
-            item = iterator.value()
-            task_id = item.data(0, Qt.UserRole)
-            if task_id is not None and task_id < len(self._all_tasks):
-                self._all_tasks[task_id].selected = True
-            iterator += 1
-        
-        # === SHOW IN INSPECTOR if exactly 1 selected ===
-        if count == 1 and last_checked_item:
-            task_id = last_checked_item.data(0, Qt.UserRole)
-            if task_id is not None and task_id < len(self._all_tasks):
-                self._show_method_in_inspector(self._all_tasks[task_id])
-        elif count == 0:
-            self.inspector_widget.setVisible(False)
-        else:
-            # Multiple selected: show summary
-            self._show_multi_selection_summary(count)
-
     def _show_method_in_inspector(self, method):
         """Affiche méthode dans l'inspecteur (DÉLÉGUÉ AU PANEL)."""
         self.current_inspected_method = method
@@ -849,11 +875,12 @@ class SimplePingPongGUI(QMainWindow):
         
         # Init generator
         generator = PromptGenerator(self.composer, self.analysis)
+        self._last_prompt = None  # refactor_file (streamé) n'est pas enregistré en cycle
         
         try:
             # === MODE REFACTOR_FILE ===
             if template == 'refactor_file':
-                selected_tasks = [task for task in self._all_tasks if task.selected]
+                selected_tasks = self.method_tree_panel.get_selected_tasks()
                 
                 if not selected_tasks:
                     QMessageBox.warning(self, "No Selection",
@@ -872,10 +899,12 @@ class SimplePingPongGUI(QMainWindow):
                     return
                 
                 file_methods = [task for task in self._all_tasks if task.file == target_file]
-                prompt = generator.generate_refactor_file(target_file, file_methods)
+                stats = generator.stream_refactor_file(
+                    target_file, file_methods, self._prompt_output_path(target_file)
+                )
                 
-                # ✅ MODIFIÉ: Via panel
-                self.prompt_panel.set_prompt(prompt)
+                # ✅ MODIFIÉ: Via panel (aperçu seulement si prompt énorme)
+                self.prompt_panel.set_prompt_file(stats)
                 
                 self.statusBar().showMessage(
                     f"✅ File summary generated: {len(file_methods)} methods from {target_file}"
@@ -910,15 +939,42 @@ class SimplePingPongGUI(QMainWindow):
             # ✅ MODIFIÉ: Get via panel
             description = self.prompt_panel.input_description.text()
             code_mode = self.prompt_panel.check_code_mode.isChecked()
+            minify = self.config.prompt_minify_modes if self.prompt_panel.check_minify.isChecked() else None
             
-            # Generate
-            prompt = generator.generate_normal(template, selected_tasks_dicts, description, code_mode)
+            # Generate (cycle de suivi : code déjà envoyé référencé/diffé, sauf si Delta décoché)
+            seen_methods = self.conversation.seen_methods()
+            if seen_methods and self.prompt_panel.check_delta.isChecked():
+                prompt = generator.generate_followup(template, selected_tasks_dicts, description, code_mode,
+                                                     seen_methods,
+                                                     token_budget=self.config.prompt_token_budget,
+                                                     minify=minify)
+            else:
+                prompt = generator.generate_normal(template, selected_tasks_dicts, description, code_mode,
+                                                   token_budget=self.config.prompt_token_budget,
+                                                   minify=minify)
+            self._last_prompt = prompt
+            self._last_sent_methods = generator.last_sent_methods
             
             # ✅ MODIFIÉ: Via panel
             self.prompt_panel.set_prompt(prompt)
+            if prompt.startswith('ERROR'):
+                self._last_prompt = None
+                self.statusBar().showMessage(f"❌ {prompt}")
+                return
+            
+            packing_info = ""
+            report = generator.last_packing_report
+            if report and report['degraded']:
+                packing_info = (f" - ⚠️ Budget {report['token_budget']} tokens: "
+                                f"{report['num_signature']} signature(s), {report['num_name']} name(s) only")
+            
+            minify_report = generator.last_minify_report
+            if minify_report:
+                packing_info += (f" - ✂️ Minify: -{minify_report['tokens_saved']} tokens "
+                                 f"({minify_report['saved_percent']}%)")
             
             self.statusBar().showMessage(
-                f"✅ Prompt generated {source_info} - Mode: {'CODE' if code_mode else 'ANALYSE'}"
+                f"✅ Prompt generated {source_info} - Mode: {'CODE' if code_mode else 'ANALYSE'}{packing_info}"
             )
             
         except Exception as e:
@@ -926,9 +982,14 @@ class SimplePingPongGUI(QMainWindow):
             QMessageBox.critical(self, "Error", 
                 f"Failed to generate prompt:\n\n{e}\n\n{traceback.format_exc()}")
 
+    def _prompt_output_path(self, target_file: str) -> Path:
+        """Fichier de sortie d'un prompt streamé (data/prompts/)."""
+        safe_name = target_file.replace('\\', '_').replace('/', '_')
+        return Path(self.config.data_dir) / 'prompts' / f"{safe_name}.refactor_file.md"
+    
     def _get_selected_from_tree(self) -> List[Dict]:
         """Extrait tasks cochées depuis tree."""
-        selected_tasks = [task for task in self._all_tasks if task.selected]
+        selected_tasks = self.method_tree_panel.get_selected_tasks()
         
         selected_tasks_dicts = []
         for task in selected_tasks:
@@ -949,8 +1010,8 @@ class SimplePingPongGUI(QMainWindow):
                 'signature': task.signature,
                 'code': task.code,
                 'docstring': task.docstring,
-                'local_vars': method_data.get('local_vars', {}) if method_data else {},
-                'instance_variables_by_method': class_data.get('instance_variables_by_method', {})
+                'local_vars': method_data.get('local_vars', {}) if method_data else {}
+                # instance_variables_by_method : partagé par classe (PromptGenerator._group_tasks_by_class)
             })
         
         return selected_tasks_dicts
@@ -1015,7 +1076,7 @@ class SimplePingPongGUI(QMainWindow):
         """
         # Méthode 1 : Depuis les tasks cochées dans le tree
         if hasattr(self, '_all_tasks'):
-            selected_tasks = [task for task in self._all_tasks if task.selected]
+            selected_tasks = self.method_tree_panel.get_selected_tasks()
             if selected_tasks:
                 # Prendre le fichier de la première task cochée
                 return selected_tasks[0].file
@@ -1041,7 +1102,7 @@ class SimplePingPongGUI(QMainWindow):
         """Parse refactoring (DÉLÉGUÉ à ResponseParser Strategy)."""
         # Appel strategy existante
         context = {'analyzed_file': source_file}
-        return self.response_parser.parse(json.dumps(response), context)
+        return self.response_parser.parse(response, context)  # Objet déjà décodé : pas de re-sérialisation
 
     def _show_refactoring_tasks_dialog(self, tasks):
         """Affiche dialog avec tasks refactoring (DÉLÉGUÉ AU DIALOG)."""
@@ -1128,10 +1189,12 @@ class SimplePingPongGUI(QMainWindow):
         # ✅ DÉLÉGUER génération à PromptGenerator
         try:
             generator = PromptGenerator(self.composer, self.analysis)
-            prompt = generator.generate_refactor_file(file_path, file_methods)
+            stats = generator.stream_refactor_file(
+                file_path, file_methods, self._prompt_output_path(file_path)
+            )
             
-            # Afficher prompt
-            self.prompt_panel.set_prompt(prompt)
+            # Afficher prompt (aperçu seulement si prompt énorme)
+            self.prompt_panel.set_prompt_file(stats)
             self.statusBar().showMessage(
                 f"✅ File summary: {len(file_methods)} methods from {file_path}"
             )
@@ -1145,59 +1208,14 @@ class SimplePingPongGUI(QMainWindow):
         from corecopy.file_analyzer import FileAnalyzer
         return FileAnalyzer.build_summary(file_path, file_data)
 
-
-    def _extract_params_from_signature(self, signature: str) -> list[str]:
-        """Extract params (DÉLÉGUÉ)."""
-        from utils.code_helpers import CodeHelpers
-        return CodeHelpers.extract_params_from_signature(signature)
-
-    def _clean_param(self, param):
-        """Clean single parameter name."""
-        param = param.strip()
-        if not param:
-            return None
-        
-        # Keep *args and **kwargs as-is
-        if param.startswith('**') or param.startswith('*'):
-            if '=' in param:
-                param = param.split('=')[0].strip()
-            if ':' in param:
-                param = param.split(':')[0].strip()
-            return param
-        
-        # Remove default value
-        if '=' in param:
-            param = param.split('=')[0].strip()
-        
-        # Remove type hint
-        if ':' in param:
-            param = param.split(':')[0].strip()
-        
-        return param if param else None
-
-
-    def _detect_signals_in_code(self, code):
-        """Detect Qt signals emitted in method code."""
-        import re
-        
-        if not code:
-            return []
-        
-        pattern = r'self\.(\w+)\.emit\s*\('
-        matches = re.findall(pattern, code)
-        
-        return sorted(set(matches))
-
     def parse_ai_refactoring_response(self, json_data):
         """Parse AI refactoring (DÉLÉGUÉ à ResponseParser Strategy)."""
         # Appel strategy existante
         analyzed_file = getattr(self, 'current_analyzed_file', 'unknown.py')
         context = {'analyzed_file': analyzed_file}
         
-        if isinstance(json_data, str):
-            return self.response_parser.parse(json_data, context)
-        else:
-            return self.response_parser.parse(json.dumps(json_data), context)
+        # Texte ou objet déjà décodé : ResponseParser ne décode qu'une fois
+        return self.response_parser.parse(json_data, context)
 
 def main():
     app = QApplication(sys.argv)
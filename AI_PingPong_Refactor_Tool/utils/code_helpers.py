@@ -1,14 +1,49 @@
 """
-Code Helpers - Parsing signatures Python.
+Code Helpers - Paramètres et signaux Qt des méthodes.
+Lookups sur les données structurées de ProjectAnalyzer ('params', 'qt_signals') ;
+le parsing de chaînes ne sert plus qu'aux analyses antérieures (sans ces clés),
+et le signale une fois par processus.
 Extrait de main.py.
 """
 
 import re
+from typing import Dict, List
 
 
 class CodeHelpers:
     """Helpers pour parsing code Python."""
     
+    _VAR_PREFIX = {'var_positional': '*', 'var_keyword': '**'}
+    _fallbacks_logged: set = set()
+    
+    @staticmethod
+    def _log_fallback(key: str):
+        """Prévient (une fois) qu'une analyse antérieure passe par le parsing de chaînes."""
+        if key not in CodeHelpers._fallbacks_logged:
+            CodeHelpers._fallbacks_logged.add(key)
+            print(f"⚠️ Analysis without '{key}': falling back to string parsing (re-run the analysis)")
+    
+    @staticmethod
+    def param_names(params: List[Dict]) -> list[str]:
+        """Noms depuis les params structurés (*args / **kwargs préfixés)."""
+        return [CodeHelpers._VAR_PREFIX.get(p['kind'], '') + p['name'] for p in params]
+    
+    @staticmethod
+    def method_params(method: Dict) -> list[str]:
+        """Paramètres d'une méthode analysée (lookup, parse la signature en repli)."""
+        if 'params' in method:
+            return CodeHelpers.param_names(method['params'])
+        CodeHelpers._log_fallback('params')
+        return CodeHelpers.extract_params_from_signature(method.get('signature', ''))
+    
+    @staticmethod
+    def method_signals(method: Dict) -> list[str]:
+        """Signaux Qt émis par une méthode analysée (lookup, regex en repli)."""
+        if 'qt_signals' in method:
+            return sorted(method['qt_signals']['emitted'])
+        CodeHelpers._log_fallback('qt_signals')
+        return CodeHelpers.detect_signals_in_code(method.get('code', ''))
+    
     @staticmethod
     def extract_params_from_signature(signature: str) -> list[str]:
         """
@@ -47,7 +82,7 @@ class CodeHelpers:
             elif char == ',' and bracket_depth == 0 and paren_depth == 0:
                 param = current_param.strip()
                 if param:
-                    cleaned = CodeHelpers._clean_param(param)
+                    cleaned = CodeHelpers.clean_param(param)
                     if cleaned:
                         params.append(cleaned)
                 current_param = ''
@@ -57,7 +92,7 @@ class CodeHelpers:
         return params
     
     @staticmethod
-    def _clean_param(param: str) -> str:
+    def clean_param(param: str) -> str:
         """Clean parameter (remove type hints, defaults)."""
         param = param.strip()
         if not param:
@@ -80,3 +115,10 @@ class CodeHelpers:
             param = param.split('=')[0].strip()
         
         return param
+    
+    @staticmethod
+    def detect_signals_in_code(code: str) -> list[str]:
+        """Detect Qt signals emitted in method code (self.xxx.emit)."""
+        if not code:
+            return []
+        return sorted(set(re.findall(r'self\.(\w+)\.emit', code)))
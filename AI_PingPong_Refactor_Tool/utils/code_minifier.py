@@ -0,0 +1,216 @@
+"""
+Code Minifier - Réduit le code des méthodes embarqué dans les prompts.
+Passes tokenize/ast : commentaires, lignes vides, docstrings, print() de debug.
+Le résultat est toujours re-parsé : en cas de doute, le code d'origine est gardé.
+"""
+
+import ast
+import io
+import tokenize
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.tokens import estimate_tokens
+
+
+STRIP_COMMENTS = 'strip-comments'
+COLLAPSE_BLANK_LINES = 'collapse-blank-lines'
+STRIP_DOCSTRINGS = 'strip-docstrings'
+ELIDE_PRINT_DEBUG = 'elide-print-debug'
+
+ALL_MODES = (STRIP_COMMENTS, COLLAPSE_BLANK_LINES, STRIP_DOCSTRINGS, ELIDE_PRINT_DEBUG)
+DEFAULT_MODES = (STRIP_COMMENTS, COLLAPSE_BLANK_LINES, ELIDE_PRINT_DEBUG)  # Docstrings utiles au LLM
+
+_STMT_LIST_FIELDS = ('body', 'orelse', 'finalbody')
+
+
+def _docstring_nodes(tree: ast.AST) -> List[ast.stmt]:
+    """Expr docstring en tête de module/classe/fonction (sauf one-liner `def f(): "doc"`)."""
+    nodes = []
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        first = node.body[0] if node.body else None
+        if (isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant)
+                and isinstance(first.value.value, str)
+                and getattr(node, 'lineno', 0) != first.lineno):
+            nodes.append(first)
+    return nodes
+
+
+def _print_nodes(tree: ast.AST) -> List[ast.stmt]:
+    """Instructions `print(...)` seules sur leur ligne."""
+    return [
+        node for node in ast.walk(tree)
+        if isinstance(node, ast.Expr) and isinstance(node.value, ast.Call)
+        and isinstance(node.value.func, ast.Name) and node.value.func.id == 'print'
+    ]
+
+
+def _statement_edits(tree: ast.AST, removed: List[ast.stmt], lines: List[str]) -> Tuple[Set[int], Dict[int, str]]:
+    """
+    Lignes (0-based) à supprimer pour retirer ces instructions.
+    Un bloc qui deviendrait vide garde un `pass` à la place.
+    """
+    removed_ids = {id(node) for node in removed}
+    drop: Set[int] = set()
+    replace: Dict[int, str] = {}
+
+    def removable(node: ast.stmt) -> bool:
+        """Seule sur ses lignes (pas `if x: print(x)` ni `a = 1; print(a)`)."""
+        head = lines[node.lineno - 1].encode('utf-8')[:node.col_offset]
+        tail = lines[node.end_lineno - 1].encode('utf-8')[node.end_col_offset:].decode('utf-8').strip()
+        return not head.strip() and (not tail or tail.startswith('#'))
+
+    for node in ast.walk(tree):
+        for field in _STMT_LIST_FIELDS:
+            body = getattr(node, field, None)
+            if not isinstance(body, list) or not body:
+                continue
+            targets = [stmt for stmt in body if id(stmt) in removed_ids and removable(stmt)]
+            for stmt in targets:
+                drop.update(range(stmt.lineno - 1, stmt.end_lineno))
+            if targets and len(targets) == len(body) and not isinstance(node, ast.Module):
+                first = targets[0]
+                line = lines[first.lineno - 1]
+                replace[first.lineno - 1] = line[:len(line) - len(line.lstrip())] + 'pass'
+
+    return drop, replace
+
+
+def minify_code(code: str, modes: Iterable[str]) -> str:
+    """
+    Minifie un extrait de code Python (méthode indentée acceptée).
+    Retourne le code d'origine s'il ne parse pas ou si le résultat ne parse plus.
+    """
+    modes = set(modes)
+    if not code or not modes:
+        return code
+
+    prefix, lines, indented = _dedent(code)
+    source = ''.join(lines)
+    try:
+        tree = ast.parse(source)
+        tokens = list(tokenize.generate_tokens(io.StringIO(source).readline))
+    except (SyntaxError, tokenize.TokenError, IndentationError):
+        return code
+
+    drop: Set[int] = set()
+    replace: Dict[int, str] = {}
+    protected: Set[int] = set()  # Lignes internes d'une string multi-ligne
+
+    for tok in tokens:
+        if tok.end[0] > tok.start[0]:  # Seules les strings (et f-strings) couvrent plusieurs lignes
+            protected.update(range(tok.start[0], tok.end[0]))  # lignes 2..n (0-based)
+
+    if STRIP_COMMENTS in modes:
+        for tok in tokens:
+            if tok.type != tokenize.COMMENT:
+                continue
+            row, col = tok.start[0] - 1, tok.start[1]
+            before = lines[row][:col].rstrip()
+            ending = '\n' if lines[row].endswith('\n') else ''
+            if before:
+                replace[row] = before
+                lines[row] = before + ending
+            else:
+                drop.add(row)
+
+    removed_stmts: List[ast.stmt] = []
+    if STRIP_DOCSTRINGS in modes:
+        removed_stmts.extend(_docstring_nodes(tree))
+    if ELIDE_PRINT_DEBUG in modes:
+        removed_stmts.extend(_print_nodes(tree))
+    if removed_stmts:
+        stmt_drop, stmt_replace = _statement_edits(tree, removed_stmts, lines)
+        drop.update(stmt_drop)
+        for row, text in stmt_replace.items():
+            drop.discard(row)
+            replace[row] = text
+
+    out: List[str] = []
+    previous_blank = True  # Supprime aussi les lignes vides en tête
+    for row, line in enumerate(lines):
+        if row in drop:
+            continue
+        if row in replace:
+            line = replace[row] + ('\n' if line.endswith('\n') else '')
+        if COLLAPSE_BLANK_LINES in modes and row not in protected and not line.strip():
+            if previous_blank:
+                continue
+            previous_blank = True
+        else:
+            previous_blank = False
+        out.append((row, line))
+
+    while out and not out[-1][1].strip() and out[-1][0] not in protected:
+        out.pop()
+    result = ''.join(line for _, line in out)
+    try:
+        ast.parse(result)
+    except SyntaxError:
+        return code
+
+    # Ré-indente comme l'extrait d'origine
+    return ''.join(prefix + line if indented[row] else line for row, line in out)
+
+
+def _dedent(code: str) -> Tuple[str, List[str], List[bool]]:
+    """
+    Retire l'indentation commune (méthode extraite d'une classe).
+    Contrairement à textwrap.dedent, les lignes blanches restent intactes
+    (elles peuvent appartenir à une string multi-ligne).
+
+    Returns:
+        (préfixe, lignes, ligne[i] avait le préfixe)
+    """
+    lines = code.splitlines(keepends=True)
+    indents = [line[:len(line) - len(line.lstrip(' \t'))] for line in lines if line.strip()]
+    prefix = indents[0] if indents else ''
+    for indent in indents[1:]:
+        while not indent.startswith(prefix):
+            prefix = prefix[:-1]
+
+    indented = [bool(prefix) and line.startswith(prefix) for line in lines]
+    return prefix, [line[len(prefix):] if flag else line for line, flag in zip(lines, indented)], indented
+
+
+def minify_tasks(tasks: List[Dict], modes: Optional[Iterable[str]]) -> Tuple[List[Dict], Dict]:
+    """
+    Minifie le code de chaque task (copies, tasks d'origine intactes).
+
+    Returns:
+        (tasks, rapport {'modes', 'tokens_before', 'tokens_after', 'tokens_saved', 'saved_percent'})
+    """
+    modes = [m for m in (modes or ()) if m in ALL_MODES]
+
+    minified = []
+    before = after = 0
+    for task in tasks:
+        code = task.get('code') or ''
+        small = minify_code(code, modes)
+        before += estimate_tokens(code)
+        after += estimate_tokens(small)
+        minified.append({**task, 'code': small})
+
+    saved = before - after
+    return minified, {
+        'modes': modes,
+        'tokens_before': before,
+        'tokens_after': after,
+        'tokens_saved': saved,
+        'saved_percent': round(100 * saved / before, 1) if before else 0.0
+    }
+
+
+if __name__ == '__main__':
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m utils.code_minifier <file.py> [mode ...]")
+        sys.exit(1)
+
+    with open(sys.argv[1], encoding='utf-8') as f:
+        original = f.read()
+    result = minify_code(original, sys.argv[2:] or ALL_MODES)
+    print(result)
+    print(f"# {estimate_tokens(original)} → {estimate_tokens(result)} tokens", file=sys.stderr)
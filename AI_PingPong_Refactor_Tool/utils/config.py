@@ -46,6 +46,8 @@ class AppConfig:
         self.enable_debug_menu = True
         self.enable_backlog_autosave = True
         self.max_prompt_tasks = 10
+        self.prompt_token_budget = 24000  # Budget tokens du code des méthodes
+        self.prompt_minify_modes = ['strip-comments', 'collapse-blank-lines', 'elide-print-debug']
         
         # Load from file if exists
         self._load_from_file()
@@ -62,6 +64,8 @@ class AppConfig:
                 self.theme = data.get('theme', self.theme)
                 self.language = data.get('language', self.language)
                 self.window_size = tuple(data.get('window_size', self.window_size))
+                self.prompt_token_budget = data.get('prompt_token_budget', self.prompt_token_budget)
+                self.prompt_minify_modes = data.get('prompt_minify_modes', self.prompt_minify_modes)
                 
                 print(f"✓ Loaded config from {config_file}")
             except Exception as e:
@@ -75,7 +79,9 @@ class AppConfig:
         data = {
             'theme': self.theme,
             'language': self.language,
-            'window_size': list(self.window_size)
+            'window_size': list(self.window_size),
+            'prompt_token_budget': self.prompt_token_budget,
+            'prompt_minify_modes': self.prompt_minify_modes
         }
         
         with open(config_file, 'w') as f:
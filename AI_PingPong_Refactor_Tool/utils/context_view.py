@@ -0,0 +1,121 @@
+"""
+Context View - Expose des objets (dict, dataclass, __slots__, listes) à Jinja2
+en vues lecture seule, sans recopie. Les enfants sont enveloppés à l'accès.
+"""
+
+from collections.abc import Mapping, Sequence
+from dataclasses import fields, is_dataclass
+from typing import Any, Iterator
+
+
+_SCALARS = (str, bytes, int, float, bool, type(None))
+
+
+def wrap(obj: Any) -> Any:
+    """Enveloppe obj en vue lecture seule (scalaires et vues retournés tels quels)."""
+    if isinstance(obj, _SCALARS) or isinstance(obj, (MappingView, SequenceView)):
+        return obj
+    if isinstance(obj, Mapping):
+        return MappingView(obj)
+    if isinstance(obj, (list, tuple)):
+        return SequenceView(obj)
+    if is_dataclass(obj) or hasattr(obj, '__slots__') or hasattr(obj, '__dict__'):
+        return ObjectView(obj)
+    return obj
+
+
+class MappingView(Mapping):
+    """Vue lecture seule d'un dict : x['k'] et x.k (comme Jinja) sans copie."""
+
+    __slots__ = ('_data',)
+
+    def __init__(self, data: Mapping):
+        self._data = data
+
+    def __getitem__(self, key):
+        return wrap(self._data[key])
+
+    def __iter__(self) -> Iterator:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def __getattr__(self, name: str):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def unwrap(self) -> Mapping:
+        return self._data
+
+    def __repr__(self) -> str:
+        return f"MappingView({self._data!r})"
+
+
+class ObjectView(MappingView):
+    """Vue d'un objet (dataclass, __slots__, __dict__) comme mapping de ses champs."""
+
+    __slots__ = ('_keys',)
+
+    def __init__(self, obj: Any):
+        super().__init__(obj)
+        if is_dataclass(obj):
+            self._keys = tuple(f.name for f in fields(obj))
+        elif hasattr(obj, '__dict__'):
+            self._keys = None  # vars(obj) lu à la demande (attributs dynamiques)
+        else:
+            self._keys = tuple(
+                name for cls in type(obj).__mro__ for name in getattr(cls, '__slots__', ())
+                if hasattr(obj, name)
+            )
+
+    def _field_names(self):
+        return self._keys if self._keys is not None else vars(self._data).keys()
+
+    def __getitem__(self, key):
+        if key not in self._field_names():
+            raise KeyError(key)
+        return wrap(getattr(self._data, key))
+
+    def __iter__(self) -> Iterator:
+        return iter(self._field_names())
+
+    def __len__(self) -> int:
+        return len(self._field_names())
+
+    def __contains__(self, key) -> bool:
+        return key in self._field_names()
+
+    def __repr__(self) -> str:
+        return f"ObjectView({self._data!r})"
+
+
+class SequenceView(Sequence):
+    """Vue lecture seule d'une liste/tuple, éléments enveloppés à l'accès."""
+
+    __slots__ = ('_data',)
+
+    def __init__(self, data: Sequence):
+        self._data = data
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SequenceView(self._data[index])
+        return wrap(self._data[index])
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator:
+        return map(wrap, self._data)
+
+    def unwrap(self) -> Sequence:
+        return self._data
+
+    def __repr__(self) -> str:
+        return f"SequenceView({self._data!r})"
@@ -0,0 +1,203 @@
+"""
+JSON Extractor - Extraction tolérante du JSON d'une réponse IA.
+Un seul passage (profondeur d'accolades, état chaîne) : prose, blocs ``` multiples,
+virgules finales, commentaires, littéraux Python et réponses tronquées.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+
+
+# Caractères significatifs pour la machine à états (le reste est sauté par la regex)
+_SPECIAL = re.compile(r'["\\{}\[\]]')
+_OPENER = re.compile(r'[{\[]')
+# Début plausible après '{' / '[' (écarte "{exemple}" ou "[1]" dans la prose)
+_OBJECT_START = re.compile(r'\{\s*["}]')
+_ARRAY_START = re.compile(r'\[\s*[{\["\d\-\]tfn]')
+
+_DECODER = json.JSONDecoder()
+
+_STRING = re.compile(r'"(?:\\.|[^"\\])*"', re.DOTALL)
+_REPAIRS = (
+    ('comments', re.compile(r'//[^\n]*|/\*.*?\*/', re.DOTALL), ''),
+    ('trailing_commas', re.compile(r',(\s*[}\]])'), r'\1'),
+    ('python_literals', re.compile(r'\b(True|False|None)\b'),
+     lambda m: {'True': 'true', 'False': 'false', 'None': 'null'}[m.group(1)]),
+)
+
+
+@dataclass
+class JsonCandidate:
+    """Objet JSON trouvé dans le texte, avec sa position [start, end)."""
+    start: int
+    end: int
+    value: Any
+    repairs: List[str] = field(default_factory=list)
+    truncated: bool = False
+
+
+def _scan(text: str, start: int) -> Tuple[Optional[int], Optional[Tuple[int, str]]]:
+    """
+    Parcourt le conteneur ouvert à start.
+
+    Returns:
+        (fin, None) si refermé ; sinon (None, (position de coupe, fermetures))
+        pour une réponse tronquée : coupe après le dernier objet complet
+        d'un tableau (une task), à défaut après la dernière valeur refermée.
+    """
+    stack: List[str] = []
+    in_string = False
+    skip_until = -1
+    task_cut = any_cut = None
+
+    for match in _SPECIAL.finditer(text, start):
+        pos = match.start()
+        if pos < skip_until:
+            continue  # Caractère échappé
+        char = match.group()
+
+        if in_string:
+            if char == '\\':
+                skip_until = pos + 2
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char == '"':
+            in_string = True
+        elif char in '{[':
+            stack.append('}' if char == '{' else ']')
+        elif char in '}]':
+            if not stack or stack[-1] != char:
+                return pos + 1, None  # Mal imbriqué : le décodage échouera
+            stack.pop()
+            if not stack:
+                return pos + 1, None
+            cut = (pos + 1, ''.join(reversed(stack)))
+            if char == '}' and stack[-1] == ']':
+                task_cut = cut
+            any_cut = cut
+
+    return None, task_cut or any_cut
+
+
+def _repair(fragment: str) -> Tuple[str, List[str]]:
+    """Répare hors chaînes : commentaires, virgules finales, True/False/None."""
+    parts = _STRING.split(fragment)
+    strings = _STRING.findall(fragment)
+    applied = []
+
+    for name, pattern, replacement in _REPAIRS:
+        changed = False
+        for i, part in enumerate(parts):
+            fixed, count = pattern.subn(replacement, part)
+            if count:
+                parts[i] = fixed
+                changed = True
+        if changed:
+            applied.append(name)
+
+    out = [parts[0]]
+    for string, part in zip(strings, parts[1:]):
+        out.append(string)
+        out.append(part)
+    return ''.join(out), applied
+
+
+def decode_fragment(fragment: str) -> Tuple[bool, Any, List[str]]:
+    """json.loads, puis avec réparations : (ok, valeur, réparations appliquées)."""
+    try:
+        return True, json.loads(fragment), []
+    except ValueError:
+        pass
+    repaired, applied = _repair(fragment)
+    try:
+        return True, json.loads(repaired), applied
+    except ValueError:
+        return False, None, applied
+
+
+def extract_json_candidates(text: str) -> List[JsonCandidate]:
+    """
+    Tous les objets/tableaux JSON décodables du texte, dans l'ordre.
+    Un fragment refermé mais invalide est sauté en entier ; un fragment jamais refermé
+    et indécodable ('{"' dans la prose) ne l'est pas : le scan reprend juste après.
+    Chemin rapide : raw_decode (C) ; la machine à états ne sert qu'aux fragments défectueux.
+    """
+    candidates = []
+    position = 0
+
+    while True:
+        match = _OPENER.search(text, position)
+        if not match:
+            break
+        start = match.start()
+        starts = _OBJECT_START if match.group() == '{' else _ARRAY_START
+        if not starts.match(text, start):
+            position = start + 1
+            continue
+
+        try:
+            value, end = _DECODER.raw_decode(text, start)
+            candidates.append(JsonCandidate(start, end, value))
+            position = end
+            continue
+        except ValueError:
+            pass
+
+        end, cut = _scan(text, start)
+        truncated = end is None
+        if truncated:
+            if cut is None:
+                position = start + 1
+                continue
+            fragment = text[start:cut[0]] + cut[1]
+            end = len(text)
+        else:
+            fragment = text[start:end]
+
+        ok, value, repairs = decode_fragment(fragment)
+        if ok:
+            candidates.append(JsonCandidate(start, end, value, repairs + (['truncated'] if truncated else []),
+                                            truncated))
+        # Jamais refermé et indécodable : le vrai JSON peut suivre
+        position = start + 1 if truncated and not ok else end
+
+    return candidates
+
+
+def extract_json(text: str) -> Any:
+    """Plus grand candidat JSON du texte (ValueError si aucun)."""
+    candidates = extract_json_candidates(text)
+    if not candidates:
+        raise ValueError("No JSON found in response")
+    return max(candidates, key=lambda c: c.end - c.start).value
+
+
+if __name__ == '__main__':
+    sample = '''Voici l'analyse {comme demandé} :
+
+```json
+{"critical_issues_prioritized": [
+    {"issue": "God Class", "priority": "P0", "description": "Trop gros",},
+    // commentaire
+    {"issue": "Duplication", "priority": "P1", "description": "x", "ok": True},
+    {"issue": "Tronq'''
+
+    found = extract_json_candidates(sample)
+    assert len(found) == 1, found
+    issues = found[0].value['critical_issues_prioritized']
+    assert [i['issue'] for i in issues] == ['God Class', 'Duplication']
+    assert found[0].truncated and 'trailing_commas' in found[0].repairs
+    print(f"✅ {len(issues)} issues recovered, repairs: {found[0].repairs}")
+
+    two = 'A: ```json\n{"tasks": []}\n``` B: ```json\n{"tasks": [{"title": "x"}]}\n```'
+    assert [c.value for c in extract_json_candidates(two)] == [{'tasks': []}, {'tasks': [{'title': 'x'}]}]
+    assert extract_json('{"a": "}{\\" ["}') == {'a': '}{" ['}
+    print("✅ Multiple blocks and string escapes OK")
+
+    unclosed = 'Example: {"a" is a key. Result:\n{"tasks": [{"id": 1}]}'
+    assert [c.value for c in extract_json_candidates(unclosed)] == [{'tasks': [{'id': 1}]}]
+    print("✅ Unclosed '{\"' in prose does not hide the JSON that follows")
@@ -0,0 +1,16 @@
+"""
+Tokens - Estimation du nombre de tokens d'un texte.
+Heuristique ~4 caractères/token (pas de tokenizer externe requis).
+"""
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estime le nombre de tokens (O(1), pas de cache ici).
+    PromptPacker met les estimations en cache par (id méthode, empreinte du code, niveau).
+    """
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN